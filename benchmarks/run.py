@@ -0,0 +1,369 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Benchmarks for hot paths of the widget.
+
+Run with ``just bench``.
+Timings are compared against ``benchmarks/baseline.json`` and benchmarks that
+are slower than the baseline by more than the tolerance are reported as
+regressions.
+Use ``just bench --save`` to update the baseline after intentional changes.
+Baselines depend on the machine, so only compare timings from the same machine.
+
+All benchmarks run offline against synthetic data and a fake SciCat client.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from scitacean import Dataset, File, RemotePath
+from scitacean.testing.client import FakeClient
+from scitacean.testing.transfer import FakeFileTransfer, FakeUploadConnection
+
+from scicat_widget import DatasetUploadWidget, TransferConfig
+from scicat_widget._filesystem import get_file_metadata_cache, inspect_file
+from scicat_widget._serialization import (
+    _listify_owners,
+    load_and_serialize_techniques,
+    serialize_dataset,
+)
+from scicat_widget._upload import make_dataset_from_widget_data, upload_dataset
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_SIZES = (10, 1_000, 100_000)
+N_OWNERS = 200
+N_METADATA = 5_000
+N_TRANSFER_FILES = 256
+# Simulated time to transfer one file, e.g., the latency of the file server.
+TRANSFER_LATENCY = 0.001
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    name: str
+    # Returns the function to time. Setup is excluded from the timing.
+    setup: Callable[[Path, int], Callable[[], object]]
+    # Whether the benchmark depends on the number of files.
+    sized: bool = True
+
+    def label(self, n_files: int) -> str:
+        return f"{self.name}[{n_files}]" if self.sized else self.name
+
+
+def make_files(directory: Path, n_files: int) -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [directory / f"file{i:06d}.dat" for i in range(n_files)]
+    for path in paths:
+        if not path.exists():
+            path.write_bytes(b"x" * 64)
+    return paths
+
+
+def make_widget_data(paths: list[Path]) -> dict[str, Any]:
+    return {
+        "type": "raw",
+        "datasetName": "benchmark",
+        "description": "A synthetic dataset",
+        "creationLocation": "/benchmark",
+        "ownerGroup": "benchmark",
+        "principalInvestigator": "Mustrum Ridcully",
+        "contactEmails": [f"owner{i}@uu.am" for i in range(N_OWNERS)],
+        "owners": [
+            {"name": f"Owner {i}", "email": f"owner{i}@uu.am", "orcid": ""}
+            for i in range(N_OWNERS)
+        ],
+        "sourceFolder": "/remote/benchmark",
+        "scientificMetadata": [
+            {"name": f"param{i}", "value": str(i * 0.5), "unit": "m"}
+            for i in range(N_METADATA)
+        ],
+        "files": [{"localPath": str(path)} for path in paths],
+    }
+
+
+def make_dataset(paths: list[Path]) -> Dataset:
+    dataset = Dataset(
+        type="raw",
+        name="benchmark",
+        owner=";".join(f"Owner {i}" for i in range(N_OWNERS)),
+        owner_email=";".join(f"owner{i}@uu.am" for i in range(N_OWNERS)),
+        source_folder="/remote/benchmark",
+        meta={f"param{i}": {"value": i * 0.5, "unit": "m"} for i in range(N_METADATA)},
+    )
+    dataset.add_files(*(File.from_local(path) for path in paths))
+    return dataset
+
+
+def setup_make_dataset(tmp: Path, n_files: int) -> Callable[[], object]:
+    data = make_widget_data(make_files(tmp / "files", n_files))
+    return lambda: make_dataset_from_widget_data(data)
+
+
+def setup_serialize_dataset(tmp: Path, n_files: int) -> Callable[[], object]:
+    dataset = make_dataset(make_files(tmp / "files", n_files))
+    return lambda: serialize_dataset(dataset)
+
+
+def setup_listify_owners(_tmp: Path, _n_files: int) -> Callable[[], object]:
+    data = {
+        "owner": ";".join(f"Owner {i}" for i in range(N_OWNERS)),
+        "ownerEmail": ";".join(f"owner{i}@uu.am" for i in range(N_OWNERS)),
+        "orcidOfOwner": "",
+    }
+    return lambda: _listify_owners(data)
+
+
+def setup_inspect_file_cold(tmp: Path, n_files: int) -> Callable[[], object]:
+    paths = make_files(tmp / "files", n_files)
+
+    def run() -> None:
+        get_file_metadata_cache().clear()
+        for path in paths:
+            inspect_file(path)
+
+    return run
+
+
+def setup_inspect_file_warm(tmp: Path, n_files: int) -> Callable[[], object]:
+    paths = make_files(tmp / "files", n_files)
+    for path in paths:
+        inspect_file(path)
+
+    def run() -> None:
+        for path in paths:
+            inspect_file(path)
+
+    return run
+
+
+def setup_techniques(_tmp: Path, _n_files: int) -> Callable[[], object]:
+    return load_and_serialize_techniques
+
+
+def setup_widget(tmp: Path, n_files: int) -> Callable[[], object]:
+    dataset = make_dataset(make_files(tmp / "files", n_files))
+
+    def run() -> None:
+        client = FakeClient.without_login(url="https://fake.scicat/api/v3")
+        widget = DatasetUploadWidget(client, initial=dataset, cache=False)
+        asyncio.run(widget.ready())
+
+    return run
+
+
+class SlowFileTransfer(FakeFileTransfer):
+    """Fake transfer that takes ``TRANSFER_LATENCY`` for every file."""
+
+    @contextmanager
+    def connect_for_upload(
+        self, dataset: Dataset, representative_file_path: RemotePath
+    ) -> Iterator[FakeUploadConnection]:
+        with super().connect_for_upload(dataset, representative_file_path) as con:
+            upload_files = con.upload_files
+
+            def slow_upload_files(*files: File) -> list[File]:
+                time.sleep(TRANSFER_LATENCY * len(files))
+                return upload_files(*files)
+
+            con.upload_files = slow_upload_files  # type: ignore[method-assign]
+            yield con
+
+
+def setup_transfer(
+    config: TransferConfig | None,
+) -> Callable[[Path, int], Callable[[], object]]:
+    # Uses a fixed number of files because of the simulated latency.
+    def setup(tmp: Path, _n_files: int) -> Callable[[], object]:
+        data = make_widget_data(make_files(tmp / "transfer", N_TRANSFER_FILES))
+
+        def run() -> None:
+            client = FakeClient.without_login(
+                url="https://fake.scicat/api/v3",
+                file_transfer=SlowFileTransfer(source_folder="/remote/{name}"),
+            )
+            if not isinstance(upload_dataset(client, data, transfer=config), Dataset):
+                raise RuntimeError("Upload failed")
+
+        return run
+
+    return setup
+
+
+def setup_import(statement: str) -> Callable[[Path, int], Callable[[], object]]:
+    # Includes the startup time of the interpreter.
+    def setup(_tmp: Path, _n_files: int) -> Callable[[], object]:
+        src = os.fspath(Path(__file__).parent.parent / "src")
+        env = {**os.environ, "PYTHONPATH": src}
+        return lambda: subprocess.run(
+            [sys.executable, "-c", statement], check=True, env=env
+        )
+
+    return setup
+
+
+BENCHMARKS = (
+    Benchmark("make_dataset_from_widget_data", setup_make_dataset),
+    Benchmark("serialize_dataset", setup_serialize_dataset),
+    Benchmark("_listify_owners", setup_listify_owners, sized=False),
+    Benchmark("inspect_file_cold", setup_inspect_file_cold),
+    Benchmark("inspect_file_warm", setup_inspect_file_warm),
+    Benchmark("load_and_serialize_techniques", setup_techniques, sized=False),
+    Benchmark("widget_construction", setup_widget),
+    Benchmark("transfer_sequential", setup_transfer(None), sized=False),
+    Benchmark(
+        "transfer_parallel",
+        setup_transfer(TransferConfig(workers=8, max_batch_files=8)),
+        sized=False,
+    ),
+    Benchmark("import_package", setup_import("import scicat_widget"), sized=False),
+    Benchmark(
+        "import_widget",
+        setup_import("from scicat_widget import DatasetUploadWidget"),
+        sized=False,
+    ),
+)
+
+
+def time_function(func: Callable[[], object], *, repeat: int) -> float:
+    """Return the best of ``repeat`` runs in seconds.
+
+    Fast functions are called in a loop to get measurable timings.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    number = max(1, int(0.05 / elapsed)) if elapsed > 0 else 1000
+    best = elapsed
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_benchmarks(
+    sizes: tuple[int, ...], *, repeat: int, select: str | None
+) -> dict[str, float]:
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp, warnings.catch_warnings():
+        # Serializing the synthetic datasets warns about dropped fields.
+        warnings.simplefilter("ignore")
+        for benchmark in BENCHMARKS:
+            if select is not None and select not in benchmark.name:
+                continue
+            for n_files in sizes if benchmark.sized else (0,):
+                name = benchmark.label(n_files)
+                func = benchmark.setup(Path(tmp), n_files)
+                results[name] = time_function(func, repeat=repeat)
+                print(f"{name:45} {format_seconds(results[name]):>10}", flush=True)
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], *, tolerance: float
+) -> list[str]:
+    """Print a comparison with the baseline and return the names of regressions."""
+    regressions = []
+    print(f"\n{'benchmark':45} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, seconds in results.items():
+        if (base := baseline.get(name)) is None:
+            print(f"{name:45} {'-':>10} {format_seconds(seconds):>10}")
+            continue
+        ratio = seconds / base
+        marker = ""
+        if ratio > tolerance:
+            regressions.append(name)
+            marker = "  REGRESSION"
+        print(
+            f"{name:45} {format_seconds(base):>10} "
+            f"{format_seconds(seconds):>10} {ratio:>6.2f}x{marker}"
+        )
+    return regressions
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]  # type: ignore[no-any-return]
+
+
+def save_baseline(path: Path, results: dict[str, float]) -> None:
+    baseline = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "results": results,
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: tuple(int(n) for n in s.split(",")),
+        default=DEFAULT_SIZES,
+        help="Comma-separated numbers of files, default: %(default)s",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-k", dest="select", help="Only run benchmarks matching this")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="Report benchmarks slower than this factor times the baseline",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as the new baseline"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    # The fake client does not support all requests that the widget makes.
+    logging.getLogger("scicat-widget").setLevel(logging.ERROR)
+    results = run_benchmarks(args.sizes, repeat=args.repeat, select=args.select)
+    if args.save:
+        save_baseline(args.baseline, {**load_baseline(args.baseline), **results})
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+    regressions = compare(
+        results, load_baseline(args.baseline), tolerance=args.tolerance
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
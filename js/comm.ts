@@ -1,5 +1,7 @@
 import { AnyModel } from "@anywidget/types";
 import { FileType } from "./components/icon.ts";
+import { File, Technique } from "./models.ts";
+import { PatchOp } from "./patch.ts";
 
 export type ReqInspectFile = {
     filename: string;
@@ -15,6 +17,51 @@ export type ResInspectFile = {
     error?: string;
 };
 
+export type ReqInspectFiles = {
+    filenames: string[];
+    chunkSize?: number;
+};
+
+export type ResInspectFiles = {
+    files: ResInspectFile[];
+    done: boolean; // true for the last chunk
+};
+
+export type ReqInitialFiles = {
+    chunkSize?: number;
+};
+
+export type ResInitialFiles = {
+    files: File[];
+    done: boolean; // true for the last chunk
+};
+
+export type ResPatch = {
+    trait: "initial" | "staticData";
+    ops: PatchOp[];
+    updateInputs: boolean; // whether to show changed initial values in the form
+};
+
+export type ReqInspectFolder = {
+    path: string;
+    reportEvery?: number;
+    maxEntries?: number;
+};
+
+export type ResInspectFolder = {
+    path: string;
+    nFiles: number;
+    nFolders: number;
+    totalBytes: number;
+    nErrors: number;
+    types: Record<string, number>;
+    done: boolean;
+    truncated: boolean;
+    cancelled: boolean;
+};
+
+export type ReqCancelInspectFolder = {};
+
 export type ReqBrowseFiles = {};
 
 export type ResBrowseFiles = {
@@ -48,15 +95,53 @@ export type ReqLoadImage = {
 export type ResLoadImage = {
     path: string;
     caption?: string;
-    image?: string;
+    image?: Uint8Array;
+    mime?: string | null;
     error?: string;
 };
 
+export type ReqSearchTechniques = {
+    query: string;
+    limit?: number;
+};
+
+export type ResSearchTechniques = {
+    query: string;
+    techniques: Technique[];
+};
+
 export type ResUploadDataset = {
     datasetName: string;
     pid?: string;
     datasetUrl?: string;
     errors?: FieldError[];
+    cancelled?: boolean;
+    filesReused?: number;
+    bytesReused?: number;
+};
+
+export type ResUploadProgress = {
+    bytesDone: number;
+    bytesTotal: number;
+    filesDone: number;
+    filesTotal: number;
+    currentFile: string | null;
+};
+
+export type ReqCancelUpload = {};
+
+export type ReqValidate = {
+    // Changed fields, `null` removes a field.
+    fields: Record<string, any>;
+    // Remove all fields that are not in `fields`.
+    replace?: boolean;
+    version: number;
+};
+
+export type ResValidate = {
+    // Version of the last request that is included in the validation.
+    version: number;
+    errors: FieldError[];
 };
 
 export class BackendComm {
@@ -66,12 +151,17 @@ export class BackendComm {
     constructor(model: AnyModel<any>) {
         this.model = model;
 
-        this.model.on("msg:custom", (message: any) => {
+        this.model.on("msg:custom", (message: any, buffers: DataView[]) => {
             if (message.hasOwnProperty("type")) {
                 const key = message["key"] as string;
                 const callback = this.callbacks.get(message["type"])?.get(key);
                 if (callback) {
-                    callback(message["payload"]);
+                    const payload = message["payload"];
+                    callback(
+                        buffers && buffers.length > 0
+                            ? resolveBuffers(payload, buffers)
+                            : payload,
+                    );
                 }
                 return;
             }
@@ -80,7 +170,7 @@ export class BackendComm {
     }
 
     sendReqInspectFile(key: string, payload: ReqInspectFile) {
-        this.model.send({ type: "req:inspect-file", key, payload });
+        this.send("req:inspect-file", key, payload);
     }
 
     onResInspectFile(key: string, callback: (payload: ResInspectFile) => void) {
@@ -91,8 +181,56 @@ export class BackendComm {
         this.getForMethod("res:inspect-file").delete(key);
     }
 
+    sendReqInspectFiles(key: string, payload: ReqInspectFiles) {
+        this.send("req:inspect-files", key, payload);
+    }
+
+    onResInspectFiles(key: string, callback: (payload: ResInspectFiles) => void) {
+        this.getForMethod("res:inspect-files").set(key, callback);
+    }
+
+    offResInspectFiles(key: string) {
+        this.getForMethod("res:inspect-files").delete(key);
+    }
+
+    sendReqInitialFiles(key: string, payload: ReqInitialFiles) {
+        this.send("req:initial-files", key, payload);
+    }
+
+    onResInitialFiles(key: string, callback: (payload: ResInitialFiles) => void) {
+        this.getForMethod("res:initial-files").set(key, callback);
+    }
+
+    offResInitialFiles(key: string) {
+        this.getForMethod("res:initial-files").delete(key);
+    }
+
+    onResPatch(key: string, callback: (payload: ResPatch) => void) {
+        this.getForMethod("res:patch").set(key, callback);
+    }
+
+    offResPatch(key: string) {
+        this.getForMethod("res:patch").delete(key);
+    }
+
+    sendReqInspectFolder(key: string, payload: ReqInspectFolder) {
+        this.send("req:inspect-folder", key, payload);
+    }
+
+    onResInspectFolder(key: string, callback: (payload: ResInspectFolder) => void) {
+        this.getForMethod("res:inspect-folder").set(key, callback);
+    }
+
+    offResInspectFolder(key: string) {
+        this.getForMethod("res:inspect-folder").delete(key);
+    }
+
+    sendReqCancelInspectFolder(key: string, payload: ReqCancelInspectFolder) {
+        this.send("req:cancel-inspect-folder", key, payload);
+    }
+
     sendReqBrowseFiles(key: string, payload: ReqBrowseFiles) {
-        this.model.send({ type: "req:browse-files", key, payload });
+        this.send("req:browse-files", key, payload);
     }
 
     onResBrowseFiles(key: string, callback: (payload: ResBrowseFiles) => void) {
@@ -104,7 +242,7 @@ export class BackendComm {
     }
 
     sendReqBuildField(key: string, payload: ReqBuildField) {
-        this.model.send({ type: "req:build-field", key, payload });
+        this.send("req:build-field", key, payload);
     }
 
     onResBuildField(key: string, callback: (payload: ResBuildField) => void) {
@@ -116,15 +254,35 @@ export class BackendComm {
     }
 
     sendReqUploadDataset(key: string, payload: ReqUploadDataset) {
-        this.model.send({ type: "req:upload-dataset", key, payload });
+        this.send("req:upload-dataset", key, payload);
     }
 
     onResUploadDataset(key: string, callback: (payload: ResUploadDataset) => void) {
         this.getForMethod("res:upload-dataset").set(key, callback);
     }
 
+    onResUploadProgress(key: string, callback: (payload: ResUploadProgress) => void) {
+        this.getForMethod("res:upload-progress").set(key, callback);
+    }
+
+    sendReqCancelUpload(key: string, payload: ReqCancelUpload) {
+        this.send("req:cancel-upload", key, payload);
+    }
+
+    sendReqValidate(key: string, payload: ReqValidate) {
+        this.send("req:validate", key, payload);
+    }
+
+    onResValidate(key: string, callback: (payload: ResValidate) => void) {
+        this.getForMethod("res:validate").set(key, callback);
+    }
+
+    offResValidate(key: string) {
+        this.getForMethod("res:validate").delete(key);
+    }
+
     sendReqLoadImage(key: string, payload: ReqLoadImage) {
-        this.model.send({ type: "req:load-image", key, payload });
+        this.send("req:load-image", key, payload);
     }
 
     onResLoadImage(key: string, callback: (payload: ResLoadImage) => void) {
@@ -135,6 +293,27 @@ export class BackendComm {
         this.getForMethod("res:load-image").delete(key);
     }
 
+    sendReqSearchTechniques(key: string, payload: ReqSearchTechniques) {
+        this.send("req:search-techniques", key, payload);
+    }
+
+    onResSearchTechniques(
+        key: string,
+        callback: (payload: ResSearchTechniques) => void,
+    ) {
+        this.getForMethod("res:search-techniques").set(key, callback);
+    }
+
+    offResSearchTechniques(key: string) {
+        this.getForMethod("res:search-techniques").delete(key);
+    }
+
+    private send(type: string, key: string, payload: any) {
+        const buffers: Uint8Array[] = [];
+        const content = { type, key, payload: extractBuffers(payload, buffers) };
+        this.model.send(content, undefined, buffers);
+    }
+
     private getForMethod(method: string) {
         const map = this.callbacks.get(method);
         if (map !== undefined) {
@@ -145,3 +324,52 @@ export class BackendComm {
         return newMap;
     }
 }
+
+/**
+ * Replace binary data in a payload by references to separate buffers.
+ *
+ * Binary data is sent alongside the JSON content of messages,
+ * this avoids encoding it as base64.
+ * In the JSON, it is referenced as `{"$buffer": index}`.
+ */
+function extractBuffers(value: any, buffers: Uint8Array[]): any {
+    if (value instanceof Uint8Array) {
+        buffers.push(value);
+        return { $buffer: buffers.length - 1 };
+    }
+    if (Array.isArray(value)) {
+        return value.map((item) => extractBuffers(item, buffers));
+    }
+    if (isPlainObject(value)) {
+        return Object.fromEntries(
+            Object.entries(value).map(([k, v]) => [k, extractBuffers(v, buffers)]),
+        );
+    }
+    return value;
+}
+
+/** Inverse of `extractBuffers`. */
+function resolveBuffers(value: any, buffers: DataView[]): any {
+    if (Array.isArray(value)) {
+        return value.map((item) => resolveBuffers(item, buffers));
+    }
+    if (isPlainObject(value)) {
+        const entries = Object.entries(value);
+        if (entries.length === 1 && typeof value.$buffer === "number") {
+            const view = buffers[value.$buffer];
+            return new Uint8Array(view.buffer, view.byteOffset, view.byteLength);
+        }
+        return Object.fromEntries(
+            entries.map(([k, v]) => [k, resolveBuffers(v, buffers)]),
+        );
+    }
+    return value;
+}
+
+function isPlainObject(value: any): value is Record<string, any> {
+    return (
+        value !== null &&
+        typeof value === "object" &&
+        Object.getPrototypeOf(value) === Object.prototype
+    );
+}
@@ -16,6 +16,11 @@ export type Choice = {
 
 export interface Options extends InputOptions<string> {
     renderChoice?: (choice: Choice) => HTMLElement;
+    /**
+     * Called when the user types into the search bar.
+     * Use this to look up choices elsewhere and pass them to `setChoices`.
+     */
+    search?: (query: string) => void;
 }
 
 type ComboboxListElement = HTMLDivElement;
@@ -27,6 +32,7 @@ type ComboboxOptionElement = HTMLDivElement;
 export class ComboboxInput extends InputComponent<string> {
     private readonly listbox: ComboboxListElement;
     private readonly searchBar: HTMLInputElement;
+    private readonly renderChoice?: (choice: Choice) => HTMLElement;
 
     private error: string = "";
     private currentFocus: number | null = null;
@@ -47,12 +53,14 @@ export class ComboboxInput extends InputComponent<string> {
 
         this.listbox = listbox;
         this.searchBar = searchBar;
+        this.renderChoice = options.renderChoice;
 
         this.searchBar.addEventListener("focus", this.open.bind(this));
         this.searchBar.addEventListener("input", () => {
             this.open();
             filterOptions(this.searchBar.value, this.listbox);
             this.setActive(firstVisibleOption(this.listbox));
+            options.search?.(this.searchBar.value);
         });
         this.searchBar.addEventListener("keydown", (e: KeyboardEvent) => {
             if (e.code === "Tab") {
@@ -138,6 +146,23 @@ export class ComboboxInput extends InputComponent<string> {
         this.searchBar.disabled = true;
     }
 
+    /**
+     * Replace the available choices.
+     *
+     * The new choices are all shown regardless of the current search
+     * because they are assumed to be the result of a search.
+     * The current selection is kept if it is among the new choices.
+     */
+    setChoices(choices: Choice[]) {
+        const selected = this.getSelected()?.dataset.value ?? null;
+        fillListbox(this.listbox, choices, this.renderChoice);
+        if (selected !== null) {
+            const match = findOptionByValue(this.listbox, selected);
+            if (match !== null) selectOption(match);
+        }
+        this.setActive(firstVisibleOption(this.listbox));
+    }
+
     get options(): HTMLCollectionOf<HTMLElement> {
         return this.listbox.children as HTMLCollectionOf<HTMLElement>;
     }
@@ -351,8 +376,6 @@ function createListbox(
     choices: Choice[],
     renderChoice?: (choice: Choice) => HTMLElement,
 ): ComboboxListElement {
-    if (renderChoice === undefined) renderChoice = defaultRenderChoice;
-
     const listbox = document.createElement("div");
     listbox.id = crypto.randomUUID();
     listbox.role = "listbox";
@@ -360,6 +383,18 @@ function createListbox(
     listbox.className = "cean-combobox-list";
     listbox.style.display = "none";
 
+    fillListbox(listbox, choices, renderChoice);
+    return listbox;
+}
+
+function fillListbox(
+    listbox: ComboboxListElement,
+    choices: Choice[],
+    renderChoice?: (choice: Choice) => HTMLElement,
+) {
+    if (renderChoice === undefined) renderChoice = defaultRenderChoice;
+
+    listbox.replaceChildren();
     for (const choice of choices) {
         const option = document.createElement("div");
         option.id = crypto.randomUUID();
@@ -379,8 +414,6 @@ function createListbox(
             );
         });
     }
-
-    return listbox;
 }
 
 function deselectAll(listbox: ComboboxListElement) {
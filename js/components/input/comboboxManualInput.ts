@@ -38,7 +38,7 @@ export class ComboboxManualInput extends InputComponent<string> {
         this.comboboxInput = comboboxInput;
         this.textInput = textInput;
 
-        if (choices.length > 0) {
+        if (choices.length > 0 || options.search !== undefined) {
             this.setDropdown();
         } else {
             this.setManual();
@@ -86,6 +86,11 @@ export class ComboboxManualInput extends InputComponent<string> {
         this.comboboxInput.lock();
     }
 
+    /** Replace the choices of the dropdown. */
+    setChoices(choices: Choice[]) {
+        this.comboboxInput.setChoices(choices);
+    }
+
     private setManual() {
         this.deactivate(this.comboboxInput);
         this.activate(this.textInput, this.comboboxInput.value);
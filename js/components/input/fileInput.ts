@@ -1,5 +1,10 @@
 import { InputComponent, InputOptions, UpdateEvent } from "./inputComponent.ts";
-import { BackendComm, ResBrowseFiles, ResInspectFile } from "../../comm.ts";
+import {
+    BackendComm,
+    ResBrowseFiles,
+    ResInspectFile,
+    ResInspectFolder,
+} from "../../comm.ts";
 import { TextInput } from "./textInput.ts";
 import { iconTextButton } from "../button.ts";
 import { humanSize } from "../output.ts";
@@ -17,6 +22,7 @@ export class FileInput extends InputComponent<string> {
     private validationResult: string | null = null;
 
     private inspectionResult_: ResInspectFile | null = null;
+    private scannedFolder: string | null = null;
 
     constructor(key: string, comm: BackendComm, options: InputOptions<string>) {
         const textInput = new TextInput(key, options);
@@ -57,6 +63,9 @@ export class FileInput extends InputComponent<string> {
         comm.onResBrowseFiles(this.commId, (payload) => {
             this.applySelectedFile(payload);
         });
+        comm.onResInspectFolder(this.commId, (payload) => {
+            this.applyFolderSummary(payload);
+        });
 
         textInput.customValidator = () => {
             return this.validationResult;
@@ -64,8 +73,10 @@ export class FileInput extends InputComponent<string> {
     }
 
     destroy() {
+        this.cancelFolderScan();
         this.comm.offResInspectFile(this.commId);
         this.comm.offResBrowseFiles(this.commId);
+        this.comm.offResInspectFolder(this.commId);
     }
 
     get id(): string {
@@ -107,6 +118,7 @@ export class FileInput extends InputComponent<string> {
 
     private inspectFile() {
         const value = this.value;
+        if (value !== this.previousValue) this.cancelFolderScan();
         if (!value) {
             this.previousValue = null;
             this.validationResult = null;
@@ -128,11 +140,15 @@ export class FileInput extends InputComponent<string> {
         if (result.success) {
             this.inspectionResult_ = result;
             this.validationResult = null;
-            renderFileStats(
-                this.statusElement,
-                result.size ?? 0,
-                new Date(result.creationTime ?? ""),
-            );
+            if (result.type === "folder") {
+                this.scanFolder(result.filename);
+            } else {
+                renderFileStats(
+                    this.statusElement,
+                    result.size ?? 0,
+                    new Date(result.creationTime ?? ""),
+                );
+            }
         } else {
             this.inspectionResult_ = null;
             this.validationResult = result.error ?? "unknown error";
@@ -148,6 +164,26 @@ export class FileInput extends InputComponent<string> {
         );
     }
 
+    private scanFolder(path: string) {
+        this.scannedFolder = path;
+        this.statusElement.textContent = "Scanning folder...";
+        this.comm.sendReqInspectFolder(this.commId, { path });
+    }
+
+    private cancelFolderScan() {
+        if (this.scannedFolder !== null) {
+            this.comm.sendReqCancelInspectFolder(this.commId, {});
+            this.scannedFolder = null;
+        }
+    }
+
+    private applyFolderSummary(summary: ResInspectFolder) {
+        // Ignore results of outdated scans.
+        if (summary.path !== this.scannedFolder) return;
+        if (summary.done) this.scannedFolder = null;
+        renderFolderStats(this.statusElement, summary);
+    }
+
     private applySelectedFile(result: ResBrowseFiles) {
         this.setSilent(result.selected);
     }
@@ -173,3 +209,26 @@ function renderFileStats(
     const dateStr = creationTime !== null ? creationTime.toLocaleString() : "ERROR";
     parent.innerHTML = `<span>Size:</span>${sizeSpan.outerHTML}<span>Creation time:</span><span>${dateStr}</span>`;
 }
+
+function renderFolderStats(parent: HTMLElement, summary: ResInspectFolder) {
+    const sizeSpan = humanSize(summary.totalBytes);
+    let count = `${summary.nFiles} files in ${summary.nFolders + 1} folders`;
+    if (!summary.done) {
+        count += " (scanning...)";
+    } else if (summary.truncated) {
+        count += " (stopped early, folder too large)";
+    } else if (summary.cancelled) {
+        count += " (cancelled)";
+    }
+    const types = Object.entries(summary.types)
+        .sort(([, a], [, b]) => b - a)
+        .map(([type, n]) => `${n} ${type}`)
+        .join(", ");
+
+    const countSpan = document.createElement("span");
+    countSpan.textContent = count;
+    const typesSpan = document.createElement("span");
+    typesSpan.textContent = types;
+    parent.innerHTML = `<span>Size:</span>${sizeSpan.outerHTML}<span>Contents:</span>`;
+    parent.append(countSpan, document.createElement("span"), typesSpan);
+}
@@ -15,6 +15,7 @@ export abstract class InputComponent<T> {
     private readonly inputContainer: HTMLElement;
     protected readonly statusElement: HTMLOutputElement;
     protected readonly wrapElement: HTMLDivElement;
+    private preflightElement: HTMLOutputElement | null = null;
     protected locked: boolean = false;
 
     readonly required: boolean;
@@ -171,6 +172,21 @@ export abstract class InputComponent<T> {
         element.addEventListener("blur", listener);
     }
 
+    /**
+     * Show an error from the backend's validation of the whole dataset.
+     *
+     * @param message The error or `null` to clear the error.
+     */
+    setPreflightError(message: string | null) {
+        if (this.preflightElement === null) {
+            if (message === null) return;
+            this.preflightElement = document.createElement("output");
+            this.preflightElement.className = "cean-preflight-error";
+            this.wrapElement.appendChild(this.preflightElement);
+        }
+        this.preflightElement.textContent = message ?? "";
+    }
+
     /** Stop propagation and default behavior of Enter keys. */
     protected static suppressEnter(element: HTMLElement) {
         element.addEventListener("keydown", (event: KeyboardEvent) => {
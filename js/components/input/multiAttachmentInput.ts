@@ -49,16 +49,13 @@ export class MultiAttachmentInput extends InputComponent<Attachment[]> {
     setSilent(value: Attachment[] | null) {
         this.clear();
         for (const attachment of value || []) {
-            this.addAttachment(null, attachment.data, attachment.caption, false);
+            this.addAttachment(null, attachment, false);
         }
     }
 
     get value(): Attachment[] | null {
         return (
-            this.attachments.map((view) => {
-                const [data, caption] = view.value;
-                return { data, caption };
-            }) || null
+            this.attachments.map((view) => view.value) || null
         );
     }
 
@@ -97,22 +94,24 @@ export class MultiAttachmentInput extends InputComponent<Attachment[]> {
         } else if (!response.image) {
             this.errorOutput.value = `Failed to load file '${response.path}': Received no image`;
         } else {
-            this.addAttachment(response.path, response.image, response.caption ?? "");
+            this.addAttachment(response.path, {
+                data: response.image,
+                mime: response.mime,
+                caption: response.caption ?? "",
+            });
         }
         this.updated();
     }
 
     private addAttachment(
         path: string | null,
-        data: string,
-        caption: string | undefined,
+        attachment: Attachment,
         captionIsPlaceholder: boolean = true,
     ) {
         this.newAttachmentInput.setSilent(null);
         const view = new AttachmentView(
             path,
-            data,
-            caption ?? "",
+            attachment,
             this.removeAttachment.bind(this),
             captionIsPlaceholder,
         );
@@ -131,17 +130,20 @@ export class MultiAttachmentInput extends InputComponent<Attachment[]> {
 
 class AttachmentView {
     readonly container: HTMLFieldSetElement;
-    private readonly data: string;
+    private readonly data: Uint8Array | string;
+    private readonly mime: string | null;
     private readonly captionInput: TextInput;
+    private readonly objectUrl: string | null;
 
     constructor(
         path: string | null,
-        data: string,
-        caption: string,
+        attachment: Attachment,
         onRemove: (view: AttachmentView) => void,
         captionIsPlaceholder: boolean = true,
     ) {
-        this.data = data;
+        this.data = attachment.data;
+        this.mime = attachment.mime ?? null;
+        const caption = attachment.caption;
 
         const pathField = pathOutput(path ?? "<unknown>");
 
@@ -166,11 +168,13 @@ class AttachmentView {
 
         const imageContainer = document.createElement("div");
         imageContainer.classList = "cean-image-container";
-        imageContainer.append(makeImg(data));
+        this.objectUrl = makeImageUrl(this.data, this.mime);
+        imageContainer.append(makeImg(this.objectUrl ?? this.data));
 
         const button = removeButton(() => {
             onRemove(this);
             this.container.remove();
+            if (this.objectUrl !== null) URL.revokeObjectURL(this.objectUrl);
         });
 
         this.container = document.createElement("fieldset");
@@ -185,8 +189,12 @@ class AttachmentView {
         );
     }
 
-    get value(): [string, string] {
-        return [this.data, this.captionInput.value || this.captionInput.placeholder];
+    get value(): Attachment {
+        return {
+            data: this.data,
+            mime: this.mime,
+            caption: this.captionInput.value || this.captionInput.placeholder,
+        };
     }
 
     lock() {
@@ -194,8 +202,19 @@ class AttachmentView {
     }
 }
 
-function makeImg(src: string): HTMLImageElement | HTMLDivElement {
-    if (src.startsWith("data:image/")) {
+/** Create an object URL for raw image bytes to display them without encoding. */
+function makeImageUrl(data: Uint8Array | string, mime: string | null): string | null {
+    if (typeof data === "string" || mime === null || !mime.startsWith("image/")) {
+        return null;
+    }
+    return URL.createObjectURL(new Blob([data], { type: mime }));
+}
+
+function makeImg(src: Uint8Array | string): HTMLImageElement | HTMLDivElement {
+    if (
+        typeof src === "string" &&
+        (src.startsWith("data:image/") || src.startsWith("blob:"))
+    ) {
         const img = document.createElement("img");
         img.src = src;
         img.alt = "Image";
@@ -1,5 +1,5 @@
 import { File } from "../../models.ts";
-import { BackendComm } from "../../comm.ts";
+import { BackendComm, ResInitialFiles, ResInspectFiles } from "../../comm.ts";
 import { removeButton } from "../index.ts";
 import { FileInput, InputComponent, TextInput } from "./index.ts";
 import { InputOptions } from "./inputComponent.ts";
@@ -7,8 +7,11 @@ import { createLabel, createLabelFor, pathOutput } from "../../forms";
 import { iconForFileType } from "../icon.ts";
 
 export class MultiFileInput extends InputComponent<File[]> {
+    private readonly comm: BackendComm;
+    private readonly commId: string = crypto.randomUUID();
     private readonly newFileInput: FileInput;
     private readonly selectedContainer: HTMLDivElement;
+    private loadingInitialFiles_: boolean = false;
     private readonly selectedFiles: {
         localPath: HTMLOutputElement;
         remotePathInput: TextInput;
@@ -22,9 +25,30 @@ export class MultiFileInput extends InputComponent<File[]> {
         );
 
         super(key, container, options);
+        this.comm = comm;
         this.newFileInput = newFileInput;
         this.selectedContainer = selectedContainer;
 
+        comm.onResInspectFiles(this.commId, (payload) => {
+            this.applyInspectedFiles(payload);
+        });
+        comm.onResInitialFiles(this.commId, (payload) => {
+            this.applyInitialFiles(payload);
+        });
+
+        // Pasting a list of paths, one per line, adds all of them at once.
+        this.newFileInput.container.addEventListener("paste", (event) => {
+            const text = event.clipboardData?.getData("text") ?? "";
+            const paths = text
+                .split(/\r?\n/)
+                .map((line) => line.trim())
+                .filter((line) => line.length > 0);
+            if (paths.length > 1) {
+                event.preventDefault();
+                this.addFiles(paths);
+            }
+        });
+
         this.newFileInput.container.addEventListener("input-updated", (() => {
             const localPath = this.newFileInput.value;
             const data = this.newFileInput.inspectionResult;
@@ -40,9 +64,45 @@ export class MultiFileInput extends InputComponent<File[]> {
     }
 
     destroy() {
+        this.comm.offResInspectFiles(this.commId);
+        this.comm.offResInitialFiles(this.commId);
         this.newFileInput.destroy();
     }
 
+    /**
+     * Add multiple files at once.
+     *
+     * The files are inspected by the backend with a single request
+     * and added as the results arrive.
+     * Files that cannot be inspected are skipped.
+     */
+    addFiles(paths: string[]) {
+        if (paths.length === 0) return;
+        this.comm.sendReqInspectFiles(this.commId, { filenames: paths });
+    }
+
+    /**
+     * Request the files of the initial dataset from the backend.
+     *
+     * They are sent in chunks and appended to the current files as they arrive.
+     */
+    loadInitialFiles() {
+        this.loadingInitialFiles_ = true;
+        this.comm.sendReqInitialFiles(this.commId, {});
+    }
+
+    /** Add files that have already been inspected by the backend. */
+    appendFiles(files: File[]) {
+        for (const file of files) {
+            this.addFileItem(file);
+        }
+        this.updated();
+    }
+
+    get loadingInitialFiles(): boolean {
+        return this.loadingInitialFiles_;
+    }
+
     get value(): File[] {
         return this.selectedFiles
             .map((item) => {
@@ -92,11 +152,34 @@ export class MultiFileInput extends InputComponent<File[]> {
         const [container, localPath, remotePathInput] = createFileItem((p) => {
             this.onInputRemoved(p);
         }, file);
+        // Initial files can arrive after the input was locked.
+        if (this.locked) remotePathInput.lock();
 
         this.selectedFiles.push({ localPath, remotePathInput, size: file.size ?? 0 });
         this.selectedContainer.append(container);
     }
 
+    private applyInspectedFiles(payload: ResInspectFiles) {
+        for (const result of payload.files) {
+            if (!result.success) {
+                console.warn(`Cannot add file ${result.filename}: ${result.error}`);
+                continue;
+            }
+            this.addFileItem({
+                localPath: result.filename,
+                remotePath: result.remotePath,
+                type: result.type,
+                size: result.size,
+            });
+        }
+        this.updated();
+    }
+
+    private applyInitialFiles(payload: ResInitialFiles) {
+        if (payload.done) this.loadingInitialFiles_ = false;
+        this.appendFiles(payload.files);
+    }
+
     private onInputRemoved(localPath: HTMLOutputElement) {
         const index = this.selectedFiles.findIndex(
             (item) => item.localPath === localPath,
@@ -1,28 +1,45 @@
-import { BackendComm, FieldError, ResUploadDataset } from "../comm";
-import { simpleLink, textElement } from "./output.ts";
+import {
+    BackendComm,
+    FieldError,
+    ResUploadDataset,
+    ResUploadProgress,
+} from "../comm";
+import { humanSize, simpleLink, textElement } from "./output.ts";
 import { textButton } from "./button.ts";
 import { Dialog } from "./dialog.ts";
 import { Config } from "../models.ts";
+import { Preflight } from "../preflight.ts";
 
 export class UploadComponent {
     private readonly comm: BackendComm;
     private readonly frontendUrl: string | null;
     private readonly skipConfirmation: boolean;
+    private readonly preflight: Preflight;
     private readonly gatherData: () => GatherResult;
 
     private readonly key = crypto.randomUUID();
     private dialog: Dialog;
+    private progressElement: HTMLElement | null = null;
 
-    constructor(comm: BackendComm, config: Config, gatherData: () => GatherResult) {
+    constructor(
+        comm: BackendComm,
+        config: Config,
+        preflight: Preflight,
+        gatherData: () => GatherResult,
+    ) {
         this.comm = comm;
         this.frontendUrl = config.frontendUrl;
         this.skipConfirmation = config.skipConfirmation;
+        this.preflight = preflight;
         this.gatherData = gatherData;
 
         this.dialog = new Dialog();
         this.comm.onResUploadDataset(this.key, (payload) => {
             this.onUploadResult(payload);
         });
+        this.comm.onResUploadProgress(this.key, (payload) => {
+            this.onUploadProgress(payload);
+        });
     }
 
     createButton() {
@@ -30,15 +47,25 @@ export class UploadComponent {
         button.type = "submit";
         button.textContent = "Upload dataset";
         button.classList.add("cean-button", "jupyter-button");
-        button.addEventListener("click", () => {
-            this.askDoUpload();
+        button.addEventListener("click", async () => {
+            button.disabled = true;
+            try {
+                await this.askDoUpload();
+            } finally {
+                button.disabled = false;
+            }
         });
         return button;
     }
 
-    private askDoUpload() {
+    private async askDoUpload() {
         const gathered = this.gatherData();
-        if (gathered.validationErrors || !this.skipConfirmation) {
+        // The backend refuses to upload a dataset that fails validation,
+        // so report errors before asking for confirmation.
+        const errors = await this.preflight.validateAll(gathered.data);
+        if (errors.length > 0) {
+            this.showErrorDialog(errors, "The dataset cannot be uploaded yet:");
+        } else if (gathered.validationErrors || !this.skipConfirmation) {
             this.showConfirmationDialog(gathered.data, gathered.validationErrors);
         } else {
             this.showProcessingDialog(gathered.data);
@@ -49,8 +76,16 @@ export class UploadComponent {
         this.comm.sendReqUploadDataset(this.key, data);
     }
 
+    private onUploadProgress(payload: ResUploadProgress) {
+        if (this.progressElement === null) return;
+        this.progressElement.replaceChildren(renderProgress(payload));
+    }
+
     private onUploadResult(payload: ResUploadDataset) {
-        if (payload.errors !== undefined) {
+        this.progressElement = null;
+        if (payload.cancelled) {
+            this.dialog.close();
+        } else if (payload.errors !== undefined) {
             this.showErrorDialog(payload.errors);
         } else {
             this.showSuccessDialog(
@@ -58,6 +93,11 @@ export class UploadComponent {
                 payload.pid ?? "UNKNOWN",
                 payload.datasetUrl ?? "UNKNOWN",
             );
+            if (payload.filesReused) {
+                this.dialog.body.append(
+                    renderReused(payload.filesReused, payload.bytesReused ?? 0),
+                );
+            }
         }
     }
 
@@ -113,12 +153,18 @@ ${link}?</p>
             '<div style="display: flex; justify-content: center;">' +
             '<span class="cean-spinner"></span>' +
             "</div>";
+        this.progressElement = document.createElement("div");
+        this.progressElement.classList.add("cean-upload-progress");
+        this.dialog.body.appendChild(this.progressElement);
 
         const abortButton = textButton(
             "Abort",
             () => {
-                // TODO actually abort upload, possible?
-                this.dialog.close();
+                // Files that were already uploaded are removed by the backend.
+                // The dialog is closed when the backend confirms the cancellation.
+                this.comm.sendReqCancelUpload(this.key, {});
+                abortButton.disabled = true;
+                abortButton.textContent = "Aborting...";
             },
             "Abort upload",
         );
@@ -126,12 +172,15 @@ ${link}?</p>
         this.dialog.footer.replaceChildren(abortButton);
     }
 
-    private showErrorDialog(errors: FieldError[]) {
+    private showErrorDialog(
+        errors: FieldError[],
+        introText: string = "There were errors during the upload:",
+    ) {
         this.dialog.closeOnClickOutside = true;
         this.dialog.header.textContent = "Error";
 
         const intro = document.createElement("p");
-        intro.textContent = "There were errors during the upload:";
+        intro.textContent = introText;
 
         const list = document.createElement("ul");
         list.classList.add("cean-validation-error-list");
@@ -197,6 +246,42 @@ ${link}?</p>
     }
 }
 
+function renderReused(files: number, bytes: number): HTMLParagraphElement {
+    const p = document.createElement("p");
+    p.classList.add("cean-upload-reused");
+    const noun = files === 1 ? "file was" : "files were";
+    p.append(
+        `${files} ${noun} already in SciCat and reused without transferring, saving `,
+        humanSize(bytes),
+        ".",
+    );
+    return p;
+}
+
+function renderProgress(progress: ResUploadProgress): DocumentFragment {
+    const fragment = document.createDocumentFragment();
+
+    const bar = document.createElement("progress");
+    bar.max = Math.max(progress.bytesTotal, 1);
+    bar.value = progress.bytesDone;
+
+    const summary = document.createElement("p");
+    summary.append(
+        `${progress.filesDone} / ${progress.filesTotal} files, `,
+        humanSize(progress.bytesDone),
+        " / ",
+        humanSize(progress.bytesTotal),
+    );
+
+    fragment.append(bar, summary);
+    if (progress.currentFile !== null) {
+        const current = textElement("p", progress.currentFile);
+        current.classList.add("cean-upload-current-file");
+        fragment.append(current);
+    }
+    return fragment;
+}
+
 export type GatherResult = {
     validationErrors: boolean;
     data: Record<string, any>;
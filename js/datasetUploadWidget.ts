@@ -1,25 +1,108 @@
-import type { AnyModel, RenderProps } from "@anywidget/types";
+import type { AnyModel, InitializeProps, RenderProps } from "@anywidget/types";
 import "./datasetUploadWidget.css";
-import { Config, StaticData } from "./models.ts";
+import { Config, File, StaticData } from "./models.ts";
 import { BackendComm } from "./comm.ts";
-import { InputComponent } from "./components/input";
+import { InputComponent, MultiFileInput } from "./components/input";
 import { DatasetOverview } from "./forms";
 import { GatherResult, UploadComponent } from "./components";
 import { connectInputs } from "./fieldAutomation.ts";
 import { createInputs } from "./inputConstruction.ts";
+import { applyPatch, PatchOp, topLevelKey } from "./patch.ts";
+import { Preflight } from "./preflight.ts";
 
 interface WidgetModel {
     config: Config;
     initial: object;
     staticData: StaticData;
+    loading: boolean;
+}
+
+function initialize({ model }: InitializeProps<WidgetModel>) {
+    // The backend sends changes of `initial` and `staticData` as patches.
+    // Apply them to the model here, once per model, not once per view.
+    const onMessage = (message: any) => {
+        if (message?.type === "res:patch") {
+            const { trait, ops } = message.payload;
+            applyPatch(model.get(trait), ops);
+        }
+    };
+    model.on("msg:custom", onMessage);
+    return () => model.off("msg:custom", onMessage);
 }
 
 async function render({ model, el }: RenderProps<WidgetModel>) {
+    const comm = new BackendComm(model);
+
+    el.addEventListener(
+        "keydown",
+        (e) => {
+            if (e.key === "Enter" && e.shiftKey) {
+                // Make sure that shift+enter does not re-run the notebook cell.
+                e.stopPropagation();
+                e.preventDefault();
+            }
+        },
+        true,
+    );
+
+    // The backend loads data from SciCat in the background.
+    // Show a placeholder until that data is available.
+    let form: Form | null = null;
+    const build = () => {
+        form?.destroy();
+        form = null;
+        if (model.get("loading")) {
+            el.replaceChildren(createLoadingIndicator());
+        } else {
+            el.replaceChildren();
+            form = renderForm(model, el, comm, model.get("initial"));
+        }
+    };
+    // The static data can be updated after the form was built,
+    // e.g., when cached data was replaced by fresh data from SciCat.
+    // Rebuild the form but keep the values that are currently in it.
+    const rebuild = () => {
+        if (form === null) return;
+        const values = form.values();
+        form.destroy();
+        el.replaceChildren();
+        form = renderForm(model, el, comm, values);
+    };
+    model.on("change:loading", build);
+    model.on("change:staticData", rebuild);
+    // The model has already been patched in `initialize`.
+    comm.onResPatch("widget", (patch) => {
+        if (patch.trait === "staticData") {
+            rebuild();
+        } else if (patch.updateInputs) {
+            form?.applyInitialPatch(patch.ops, model.get("initial"));
+        }
+    });
+    build();
+
+    return () => {
+        model.off("change:loading", build);
+        model.off("change:staticData", rebuild);
+        comm.offResPatch("widget");
+        form?.destroy();
+    };
+}
+
+type Form = {
+    destroy: () => void;
+    values: () => Record<string, any>;
+    applyInitialPatch: (ops: PatchOp[], initial: Record<string, any>) => void;
+};
+
+function renderForm(
+    model: AnyModel<WidgetModel>,
+    el: HTMLElement,
+    comm: BackendComm,
+    initialData: Record<string, any>,
+): Form {
     const config = model.get("config");
     const staticData = parseStaticData(model);
 
-    const comm = new BackendComm(model);
-
     const inputs = createInputs(config, staticData, comm);
     const inputConnectionCleanup = connectInputs(
         inputs,
@@ -28,38 +111,89 @@ async function render({ model, el }: RenderProps<WidgetModel>) {
         comm,
     );
 
-    const uploader = new UploadComponent(comm, config, () => {
+    const preflight = new Preflight(comm, inputs);
+    const uploader = new UploadComponent(comm, config, preflight, () => {
         return gatherData(inputs);
     });
 
     const datasetOverview = new DatasetOverview(inputs, uploader, config);
     el.appendChild(datasetOverview.element);
 
-    el.addEventListener(
-        "keydown",
-        (e) => {
-            if (e.key === "Enter" && e.shiftKey) {
-                // Make sure that shift+enter does not re-run the notebook cell.
-                e.stopPropagation();
-                e.preventDefault();
-            }
-        },
-        true,
-    );
-
     // lockFields must be after setInitialData to set the data before locks take effect.
-    setInitialData(inputs, model.get("initial"));
+    setInitialData(inputs, initialData);
     lockFields(inputs, config.lockedFields);
+    // Validate everything once, afterwards only changed fields.
+    preflight.validateAll(gatherData(inputs).data);
+    preflight.listenTo(datasetOverview.element);
+    // Files of large initial datasets are not part of the initial data.
+    if (initialData.pendingFiles) {
+        const files = inputs.get("files");
+        if (files instanceof MultiFileInput) files.loadInitialFiles();
+    }
 
-    return () => {
-        datasetOverview.destroy();
-        for (const input of inputs.values()) {
-            input.destroy();
-        }
-        inputConnectionCleanup();
+    return {
+        destroy: () => {
+            preflight.destroy();
+            datasetOverview.destroy();
+            for (const input of inputs.values()) {
+                input.destroy();
+            }
+            inputConnectionCleanup();
+        },
+        values: () => {
+            const data = gatherData(inputs).data;
+            const files = inputs.get("files");
+            if (files instanceof MultiFileInput && files.loadingInitialFiles) {
+                // Request all initial files again in the rebuilt form.
+                delete data.files;
+                data.pendingFiles = initialData.pendingFiles;
+            }
+            return data;
+        },
+        applyInitialPatch: (ops, initial) => {
+            applyInitialPatch(inputs, ops, initial);
+        },
     };
 }
 
+function applyInitialPatch(
+    inputs: Map<string, InputComponent<any>>,
+    ops: PatchOp[],
+    initial: Record<string, any>,
+) {
+    const changed = new Set<string>();
+    const newFiles: File[] = [];
+    for (const op of ops) {
+        if (op.op === "add" && op.path === "/files/-") {
+            // Append files instead of replacing the files in the form.
+            newFiles.push(op.value);
+        } else if (!(op.path === "/files" && op.value?.length === 0)) {
+            // Creating an empty file list does not change the form.
+            changed.add(topLevelKey(op.path));
+        }
+    }
+    for (const key of changed) {
+        inputs.get(key)?.setSignaling(initial[key] ?? null, true);
+    }
+    const files = inputs.get("files");
+    if (newFiles.length > 0 && files instanceof MultiFileInput) {
+        files.appendFiles(newFiles);
+    }
+}
+
+function createLoadingIndicator(): HTMLDivElement {
+    const text = document.createElement("p");
+    text.textContent = "Loading data from SciCat...";
+
+    const spinner = document.createElement("span");
+    spinner.className = "cean-spinner";
+
+    const container = document.createElement("div");
+    container.className = "cean-loading";
+    container.append(text, spinner);
+    return container;
+}
+
 function parseStaticData(model: AnyModel<any>): StaticData {
     const staticData = model.get("staticData");
     for (const proposal of staticData.proposals) {
@@ -99,4 +233,4 @@ function gatherData(inputs: Map<string, InputComponent<any>>): GatherResult {
     return { data, validationErrors };
 }
 
-export default { render };
+export default { initialize, render };
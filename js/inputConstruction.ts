@@ -48,7 +48,7 @@ export function createInputs(
         makeOwnerGroupInput(staticData.accessGroups),
         makeMultiTextInput("accessGroups"),
         new TextInput("license", {}),
-        makeTechniquesInput(staticData.techniques),
+        makeTechniquesInput(staticData.techniques, comm),
         makeMultiTextInput("usedSoftware"),
         makeMultiTextInput("sampleIds"),
         makeDatasetTypeInput(),
@@ -306,21 +306,46 @@ function makeOwnerGroupInput(accessGroups: string[]): ComboboxInput | TextInput
     }
 }
 
-function makeTechniquesInput(techniques: Techniques): MultiInput {
-    const choices = techniques.techniques
-        .map((technique) => {
-            return { key: technique.id, text: technique.name };
-        })
+function makeTechniquesInput(techniques: Techniques, comm: BackendComm): MultiInput {
+    // The backend only sends techniques that are in use.
+    // Others are searched for when the user types into the combobox.
+    const known = new Map(
+        techniques.techniques.map((technique) => [technique.id, technique]),
+    );
+    const toChoice = (technique: Technique): Choice => {
+        return { key: technique.id, text: technique.name };
+    };
+
+    const key = crypto.randomUUID();
+    let debounceTimer: number | null = null;
+    const search = (query: string) => {
+        if (debounceTimer !== null) clearTimeout(debounceTimer);
+        debounceTimer = window.setTimeout(() => {
+            debounceTimer = null;
+            comm.sendReqSearchTechniques(key, { query, limit: 50 });
+        }, 150);
+    };
+
+    const initialChoices = techniques.techniques
+        .map(toChoice)
         .sort((a, b) => a.key.localeCompare(b.key));
-    const combobox = new ComboboxManualInput("techniques-choices", choices, {
+    const combobox = new ComboboxManualInput("techniques-choices", initialChoices, {
         fieldName: "technique",
+        search,
+    });
+    comm.onResSearchTechniques(key, (payload) => {
+        for (const technique of payload.techniques) {
+            known.set(technique.id, technique);
+        }
+        combobox.setChoices(payload.techniques.map(toChoice));
     });
+    // Populate the dropdown before the user starts typing.
+    comm.sendReqSearchTechniques(key, { query: "", limit: 50 });
 
     const renderItem = (value: string): HTMLElement => {
-        for (const technique of techniques.techniques) {
-            if (technique.id == value) {
-                return renderKnownTechniqueItem(technique, techniques.prefix);
-            }
+        const technique = known.get(value);
+        if (technique !== undefined) {
+            return renderKnownTechniqueItem(technique, techniques.prefix);
         }
         return renderUnknownItem(value);
     };
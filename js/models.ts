@@ -1,7 +1,10 @@
 import { FileType } from "./components/icon.ts";
 
 export type Attachment = {
-    data: string;
+    // Raw image bytes or, for attachments of the initial dataset,
+    // a base64-encoded data URL.
+    data: Uint8Array | string;
+    mime?: string | null;
     caption: string;
 };
 
@@ -0,0 +1,52 @@
+/**
+ * Incremental updates of JSON-like data.
+ *
+ * Supports a subset of JSON patch (RFC 6902): `add`, `replace`, and `remove`
+ * with JSON pointer paths, the same as `_patch.py` in the backend.
+ */
+
+export type PatchOp = {
+    op: "add" | "replace" | "remove";
+    path: string;
+    value?: any;
+};
+
+/** Apply patch operations to `document` in place. */
+export function applyPatch(document: Record<string, any>, ops: PatchOp[]) {
+    for (const op of ops) {
+        const [parent, key] = resolveParent(document, op.path);
+        if (Array.isArray(parent)) {
+            const index = key === "-" ? parent.length : Number(key);
+            if (op.op === "add") {
+                parent.splice(index, 0, op.value);
+            } else if (op.op === "replace") {
+                parent[index] = op.value;
+            } else {
+                parent.splice(index, 1);
+            }
+        } else if (op.op === "remove") {
+            delete parent[key];
+        } else {
+            parent[key] = op.value;
+        }
+    }
+}
+
+/** Return the top-level key that a JSON pointer refers to. */
+export function topLevelKey(pointer: string): string {
+    return unescape(pointer.slice(1).split("/", 1)[0]);
+}
+
+function resolveParent(document: any, pointer: string): [any, string] {
+    const tokens = pointer.slice(1).split("/").map(unescape);
+    const key = tokens.pop() as string;
+    let target = document;
+    for (const token of tokens) {
+        target = target[Array.isArray(target) ? Number(token) : token];
+    }
+    return [target, key];
+}
+
+function unescape(token: string): string {
+    return token.replace(/~1/g, "/").replace(/~0/g, "~");
+}
@@ -0,0 +1,124 @@
+import { BackendComm, FieldError, ResValidate } from "./comm.ts";
+import { InputComponent, UpdateEvent } from "./components/input";
+
+/**
+ * Validate the dataset in the backend while the user fills in the form.
+ *
+ * Only changed fields are sent to the backend, which caches the validation
+ * of all other fields.
+ * Errors are shown next to the corresponding inputs.
+ */
+export class Preflight {
+    private readonly comm: BackendComm;
+    private readonly inputs: Map<string, InputComponent<any>>;
+    private readonly key = crypto.randomUUID();
+    private readonly delay: number;
+
+    private pending: Record<string, any> = {};
+    private timer: ReturnType<typeof setTimeout> | null = null;
+    private version = 0;
+    private waiting: Waiting[] = [];
+    private _errors: FieldError[] = [];
+
+    /**
+     * @param comm Communication interface for backend interactions.
+     * @param inputs Inputs keyed by SciCat key.
+     * @param delay Time in ms to wait for more changes before validating.
+     */
+    constructor(
+        comm: BackendComm,
+        inputs: Map<string, InputComponent<any>>,
+        delay: number = 300,
+    ) {
+        this.comm = comm;
+        this.inputs = inputs;
+        this.delay = delay;
+        this.comm.onResValidate(this.key, (payload) => {
+            this.onResult(payload);
+        });
+    }
+
+    get errors(): FieldError[] {
+        return this._errors;
+    }
+
+    /** Validate changes of the inputs in `element` or its descendants. */
+    listenTo(element: HTMLElement) {
+        element.addEventListener("input-updated", ((event: UpdateEvent) => {
+            this.pending[event.key] = event.value ?? null;
+            this.schedule();
+        }) as EventListener);
+    }
+
+    /**
+     * Validate all data now.
+     *
+     * @param data The complete data of the form.
+     * @returns The errors, once the backend has validated `data`.
+     */
+    validateAll(data: Record<string, any>): Promise<FieldError[]> {
+        this.pending = {};
+        this.clearTimer();
+        const version = this.send(data, true);
+        return new Promise((resolve) => {
+            this.waiting.push({ version, resolve });
+        });
+    }
+
+    destroy() {
+        this.clearTimer();
+        this.comm.offResValidate(this.key);
+    }
+
+    private schedule() {
+        this.clearTimer();
+        this.timer = setTimeout(() => {
+            this.timer = null;
+            const fields = this.pending;
+            this.pending = {};
+            this.send(fields, false);
+        }, this.delay);
+    }
+
+    private clearTimer() {
+        if (this.timer !== null) {
+            clearTimeout(this.timer);
+            this.timer = null;
+        }
+    }
+
+    private send(fields: Record<string, any>, replace: boolean): number {
+        this.version += 1;
+        this.comm.sendReqValidate(this.key, {
+            fields,
+            replace,
+            version: this.version,
+        });
+        return this.version;
+    }
+
+    private onResult(payload: ResValidate) {
+        // Results of older requests may arrive after newer requests were sent.
+        if (payload.version < this.version) return;
+        this._errors = payload.errors;
+        this.showErrors();
+        const done = this.waiting.filter((w) => w.version <= payload.version);
+        this.waiting = this.waiting.filter((w) => w.version > payload.version);
+        for (const { resolve } of done) resolve(payload.errors);
+    }
+
+    private showErrors() {
+        const byField = new Map<string, string>();
+        for (const { field, error } of this._errors) {
+            if (!byField.has(field)) byField.set(field, error);
+        }
+        for (const [key, input] of this.inputs.entries()) {
+            input.setPreflightError(byField.get(key) ?? null);
+        }
+    }
+}
+
+type Waiting = {
+    version: number;
+    resolve: (errors: FieldError[]) => void;
+};
@@ -1,12 +1,67 @@
 """Jupyter widget for uploading datasets to SciCat."""
 
+import importlib
 import importlib.metadata
+from typing import TYPE_CHECKING, Any
 
-from ._widgets import DatasetUploadWidget
+if TYPE_CHECKING:
+    from ._bulk import BulkUploadResult, read_payloads, upload_datasets
+    from ._cache import ScicatCache
+    from ._dispatch import DispatchConfig
+    from ._journal import UploadJournal
+    from ._session import ScicatSession
+    from ._thumbnails import ThumbnailConfig
+    from ._transfer import TransferConfig
+    from ._upload import FieldError, UploadError, resume_upload
+    from ._widgets import DatasetUploadWidget
 
 try:
     __version__ = importlib.metadata.version("scicat_widget")
 except importlib.metadata.PackageNotFoundError:
     __version__ = "0.0.0"
 
-__all__ = ["DatasetUploadWidget"]
+__all__ = [
+    "BulkUploadResult",
+    "DatasetUploadWidget",
+    "DispatchConfig",
+    "FieldError",
+    "ScicatCache",
+    "ScicatSession",
+    "ThumbnailConfig",
+    "TransferConfig",
+    "UploadError",
+    "UploadJournal",
+    "read_payloads",
+    "resume_upload",
+    "upload_datasets",
+]
+
+# Public names are imported on first access because the widget and SciCat
+# dependencies take a long time to import.
+_LAZY_IMPORTS = {
+    "BulkUploadResult": "._bulk",
+    "DatasetUploadWidget": "._widgets",
+    "DispatchConfig": "._dispatch",
+    "FieldError": "._upload",
+    "ScicatCache": "._cache",
+    "ScicatSession": "._session",
+    "ThumbnailConfig": "._thumbnails",
+    "TransferConfig": "._transfer",
+    "UploadError": "._upload",
+    "UploadJournal": "._journal",
+    "read_payloads": "._bulk",
+    "resume_upload": "._upload",
+    "upload_datasets": "._bulk",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if (module_name := _LAZY_IMPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,166 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Upload many datasets without a widget."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from scitacean import Client, Dataset
+
+from ._logging import get_logger
+from ._transfer import TransferConfig
+from ._upload import FieldError, UploadError, upload_dataset
+
+
+@dataclass(frozen=True, slots=True)
+class BulkUploadResult:
+    """Result of uploading one dataset with :func:`upload_datasets`."""
+
+    index: int
+    """Position of the payload in the input."""
+    payload: dict[str, Any]
+    """The widget-format payload that the dataset was made from."""
+    result: Dataset | UploadError
+    """The uploaded dataset or the reason why the upload failed."""
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the dataset was uploaded."""
+        return isinstance(self.result, Dataset)
+
+
+def upload_datasets(
+    client: Client,
+    payloads: Iterable[dict[str, Any]] | str | os.PathLike[str],
+    *,
+    max_concurrent: int = 4,
+    transfer: TransferConfig | None = None,
+) -> Iterator[BulkUploadResult]:
+    """Upload multiple datasets concurrently.
+
+    Each payload has the same format as the data that the widget sends when
+    the user clicks "Upload", e.g.,
+    ``{"datasetName": "...", "files": [{"localPath": "..."}], ...}``.
+    Datasets are constructed and validated in the same way as in the widget.
+
+    Parameters
+    ----------
+    client:
+        Client for SciCat and the file server.
+    payloads:
+        Widget-format payloads or the path of a CSV or JSONL file,
+        see :func:`read_payloads`.
+        Payloads are consumed lazily, so this can be a generator.
+    max_concurrent:
+        Maximum number of datasets that are uploaded at the same time.
+    transfer:
+        Configuration of file uploads for each dataset.
+
+    Yields
+    ------
+    :
+        One result per payload in the order in which the uploads complete.
+        Failures are reported as :class:`UploadError` results and do not
+        stop the remaining uploads.
+    """
+    if max_concurrent < 1:
+        raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+    if isinstance(payloads, str | os.PathLike):
+        payloads = read_payloads(payloads)
+
+    indexed = enumerate(payloads)
+    with ThreadPoolExecutor(
+        max_workers=max_concurrent, thread_name_prefix="scicat-widget-bulk"
+    ) as executor:
+        pending: set[Future[BulkUploadResult]] = set()
+
+        def submit(items: Iterable[tuple[int, dict[str, Any]]]) -> None:
+            for index, payload in items:
+                pending.add(
+                    executor.submit(_upload_one, client, index, payload, transfer)
+                )
+
+        # Only read as many payloads as can be uploaded right away.
+        submit(islice(indexed, max_concurrent))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            submit(islice(indexed, max_concurrent - len(pending)))
+
+
+def read_payloads(path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    """Read widget-format payloads from a file.
+
+    The format is determined from the file extension:
+
+    - ``.jsonl``: One JSON object per line. Empty lines are skipped.
+    - ``.csv``: One dataset per row with a header of field names,
+      e.g., ``datasetName,ownerGroup,files``.
+      Cells that contain JSON arrays or objects are decoded, e.g.,
+      ``[{"localPath": "data.h5"}]`` for ``files``,
+      all other cells are used as strings.
+      Empty cells are skipped.
+    """
+    path = Path(path)
+    match path.suffix.lower():
+        case ".jsonl":
+            return _read_jsonl(path)
+        case ".csv":
+            return _read_csv(path)
+        case _:
+            raise ValueError(
+                f"Unsupported file type for payloads: '{path.suffix}', "
+                "use .csv or .jsonl"
+            )
+
+
+def _read_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_csv(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open(encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {
+                key: _decode_cell(value)
+                for key, value in row.items()
+                if key is not None and value
+            }
+
+
+def _decode_cell(value: str) -> Any:
+    if value.lstrip().startswith(("[", "{")):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            # Plain text that happens to start with a bracket, e.g., "[draft]".
+            pass
+    return value
+
+
+def _upload_one(
+    client: Client,
+    index: int,
+    payload: dict[str, Any],
+    transfer: TransferConfig | None,
+) -> BulkUploadResult:
+    try:
+        result = upload_dataset(client, payload, transfer=transfer)
+    except Exception as error:
+        get_logger().exception("Failed to upload dataset %d", index)
+        result = UploadError(errors=[FieldError(field="upload", error=str(error))])
+    return BulkUploadResult(index=index, payload=payload, result=result)
@@ -0,0 +1,166 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""On-disk cache for data downloaded from SciCat."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from ._logging import get_logger
+
+
+class ScicatCache:
+    """On-disk cache for data downloaded from SciCat.
+
+    Entries are keyed by a kind (e.g., ``"instruments"``), the SciCat URL,
+    and a user.
+    They are considered fresh for ``ttl`` after they were stored.
+    Stale entries remain on disk until they are overwritten or evicted
+    so that they can be used to show something while new data is downloaded.
+
+    When the total size of the cache exceeds ``max_size`` bytes,
+    the oldest entries are removed.
+
+    Parameters
+    ----------
+    directory:
+        Directory to store the cache in.
+        Defaults to ``$XDG_CACHE_HOME/scicat_widget`` or ``~/.cache/scicat_widget``.
+    ttl:
+        Time after which entries are considered stale.
+    max_size:
+        Maximum size of the cache in bytes.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str] | None = None,
+        *,
+        ttl: timedelta = timedelta(hours=12),
+        max_size: int = 32 * 1024 * 1024,
+    ) -> None:
+        self.directory = (
+            Path(directory) if directory is not None else _default_cache_directory()
+        )
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> ScicatCache:
+        """Return the cache that is shared by all widgets by default."""
+        global _DEFAULT_CACHE
+        with _DEFAULT_CACHE_LOCK:
+            if _DEFAULT_CACHE is None:
+                _DEFAULT_CACHE = cls()
+            return _DEFAULT_CACHE
+
+    def get(
+        self, kind: str, *, url: str, user: str = "", allow_stale: bool = False
+    ) -> Any:
+        """Return a cached value or ``None`` if there is no usable entry."""
+        path = self._path_for(kind, url=url, user=user)
+        with self._lock:
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as error:
+                get_logger().warning("Ignoring bad cache entry %s: %s", path, error)
+                return None
+        if not allow_stale and self._is_stale(entry):
+            return None
+        return entry["value"]
+
+    def put(self, kind: str, value: Any, *, url: str, user: str = "") -> None:
+        """Store a value in the cache.
+
+        The value must be serializable to JSON.
+        """
+        entry = {
+            "kind": kind,
+            "url": url,
+            "user": user,
+            "stored": time.time(),
+            "value": value,
+        }
+        path = self._path_for(kind, url=url, user=user)
+        with self._lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(entry), encoding="utf-8")
+                tmp.replace(path)
+                self._evict()
+            except OSError as error:
+                get_logger().warning("Failed to write cache entry %s: %s", path, error)
+
+    def invalidate(self, *, url: str | None = None, user: str | None = None) -> None:
+        """Remove entries from the cache.
+
+        Parameters
+        ----------
+        url:
+            If given, only remove entries for this SciCat URL.
+        user:
+            If given, only remove entries for this user.
+        """
+        with self._lock:
+            for path, _, _ in self._entries():
+                if url is None and user is None:
+                    path.unlink(missing_ok=True)
+                    continue
+                try:
+                    entry = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    path.unlink(missing_ok=True)
+                    continue
+                if (url is None or entry["url"] == url) and (
+                    user is None or entry["user"] == user
+                ):
+                    path.unlink(missing_ok=True)
+
+    def _is_stale(self, entry: dict[str, Any]) -> bool:
+        return bool(time.time() - entry["stored"] > self.ttl.total_seconds())
+
+    def _path_for(self, kind: str, *, url: str, user: str) -> Path:
+        key = hashlib.sha256(f"{kind}\0{url}\0{user}".encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        try:
+            with os.scandir(self.directory) as it:
+                return [
+                    (Path(entry.path), stat.st_size, stat.st_mtime)
+                    for entry in it
+                    if entry.name.endswith(".json")
+                    and (stat := entry.stat(follow_symlinks=False))
+                ]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def _default_cache_directory() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "scicat_widget"
+
+
+_DEFAULT_CACHE: ScicatCache | None = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Compute checksums of local files in the background."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+
+# Scitacean uses this algorithm unless a dataset specifies a different one.
+DEFAULT_ALGORITHM = "blake2b"
+
+_BLOCK_SIZE = 4 * 1024 * 1024
+
+_Key = tuple[str, int, int, str]
+
+
+class ChecksumPipeline:
+    """Compute checksums of files in a thread pool and cache the results.
+
+    Hash functions in :mod:`hashlib` release the GIL for large inputs,
+    so files are hashed in parallel by threads.
+    Results are keyed by path, modification time, size, and algorithm,
+    so modified files are hashed again.
+
+    Parameters
+    ----------
+    max_workers:
+        Number of files to hash concurrently.
+    max_entries:
+        Maximum number of checksums to keep.
+    """
+
+    def __init__(self, *, max_workers: int = 4, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: OrderedDict[_Key, Future[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._checksum_cache = PipelineChecksum(self)
+
+    def submit(self, path: Path, *, algorithm: str = DEFAULT_ALGORITHM) -> Future[str]:
+        """Start computing the checksum of a file unless it is already known.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be accessed.
+        """
+        return self._submit(_make_key(path, algorithm), path)
+
+    def _submit(self, key: _Key, path: Path) -> Future[str]:
+        algorithm = key[-1]
+        with self._lock:
+            if (future := self._futures.get(key)) is not None:
+                self._futures.move_to_end(key)
+                return future
+            future = self._get_executor().submit(
+                checksum_of_file, path, algorithm=algorithm
+            )
+            self._futures[key] = future
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+        return future
+
+    def prefetch(self, path: Path, *, algorithm: str = DEFAULT_ALGORITHM) -> None:
+        """Start computing the checksum of a file, ignoring errors.
+
+        Errors are reported when the checksum is requested with :meth:`checksum`.
+        """
+        try:
+            self.submit(path, algorithm=algorithm)
+        except OSError:
+            pass
+
+    def checksum(self, path: Path, *, algorithm: str) -> str:
+        """Return the checksum of a file, waiting for it if needed."""
+        key = _make_key(path, algorithm)
+        try:
+            return self._submit(key, path).result()
+        except Exception:
+            # Do not keep failures around, the file may become readable later.
+            with self._lock:
+                self._futures.pop(key, None)
+            raise
+
+    def checksum_cache(self) -> PipelineChecksum:
+        """Return an object that can be used as a ``File``'s checksum cache."""
+        return self._checksum_cache
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="scicat-widget-chk"
+            )
+        return self._executor
+
+
+class PipelineChecksum:
+    """Drop-in replacement for Scitacean's per-file checksum cache.
+
+    Scitacean's ``File`` calls ``get`` when it needs a checksum.
+    This implementation looks up the checksum in a :class:`ChecksumPipeline`.
+    """
+
+    def __init__(self, pipeline: ChecksumPipeline) -> None:
+        self._pipeline = pipeline
+
+    def get(self, *, path: Path, algorithm: str) -> str:
+        return self._pipeline.checksum(path, algorithm=algorithm)
+
+
+def checksum_of_file(path: Path, *, algorithm: str) -> str:
+    """Compute the hex digest of a file using large reads."""
+    chk = hashlib.new(algorithm, usedforsecurity=False)
+    buffer = memoryview(bytearray(_BLOCK_SIZE))
+    with open(path, "rb", buffering=0) as file:
+        while n := file.readinto(buffer):
+            chk.update(buffer[:n])
+    return chk.hexdigest()
+
+
+@cache
+def get_checksum_pipeline() -> ChecksumPipeline:
+    """Return the process-wide checksum pipeline."""
+    return ChecksumPipeline()
+
+
+def _make_key(path: Path, algorithm: str) -> _Key:
+    st = path.stat()
+    return os.fspath(path), st.st_mtime_ns, st.st_size, algorithm
@@ -3,20 +3,28 @@
 
 from __future__ import annotations
 
-import inspect
+import functools
 import os
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Hashable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from urllib.parse import quote_plus, urljoin
 
-import IPython.display
-from jupyter_host_file_picker import HostFilePicker
-from scitacean import Dataset, Thumbnail
+from scitacean import Dataset
 
-from ._filesystem import inspect_file
+from ._checksum import get_checksum_pipeline
+from ._dedup import ReusedFiles
+from ._executor import get_executor
+from ._filesystem import inspect_file, inspect_files, walk_folder
+from ._journal import UploadJournal
 from ._logging import get_logger
-from ._upload import UploadError, upload_dataset
+from ._serialization import iter_serialized_files
+from ._stats import get_stats, payload_size, timed
+from ._techniques import get_technique_index
+from ._thumbnails import load_image
+from ._transfer import UploadProgress
+from ._upload import FieldError, UploadError, upload_dataset
 
 if TYPE_CHECKING:
     from ._widgets import DatasetUploadWidget
@@ -25,11 +33,15 @@ if TYPE_CHECKING:
 def _inspect_file(
     widget: DatasetUploadWidget, key: str, input_payload: dict[str, str]
 ) -> None:
-    payload = inspect_file(Path(input_payload["filename"])) or {
+    path = Path(input_payload["filename"])
+    payload = inspect_file(path) or {
         "success": False,
         "error": "File not found",
         **input_payload,
     }
+    if payload["success"] and payload["type"] != "folder":
+        # Start hashing now so the checksum is ready when the dataset is uploaded.
+        get_checksum_pipeline().prefetch(path)
     widget.send(
         {
             "type": "res:inspect-file",
@@ -43,9 +55,137 @@ def _inspect_file(
     )
 
 
+def _inspect_files(
+    widget: DatasetUploadWidget, key: str, input_payload: dict[str, Any]
+) -> None:
+    # Stat calls can be slow on network filesystems, so do not block the kernel.
+    get_executor().submit(
+        _send_inspected_files,
+        widget,
+        key,
+        input_payload["filenames"],
+        input_payload.get("chunkSize", _INSPECT_FILES_CHUNK_SIZE),
+    )
+
+
+_INSPECT_FILES_CHUNK_SIZE = 200
+
+
+@timed("task:inspect-files")
+def _send_inspected_files(
+    widget: DatasetUploadWidget, key: str, filenames: list[str], chunk_size: int
+) -> None:
+    def send(files: list[dict[str, Any]], *, done: bool) -> None:
+        widget.send(
+            {
+                "type": "res:inspect-files",
+                "key": key,
+                "payload": {"files": files, "done": done},
+            }
+        )
+
+    pipeline = get_checksum_pipeline()
+    chunk: list[dict[str, Any]] = []
+    results = inspect_files(Path(filename) for filename in filenames)
+    for filename, result in zip(filenames, results, strict=True):
+        if result["success"] and result["type"] != "folder":
+            pipeline.prefetch(Path(filename))
+        chunk.append({"filename": filename, **result})
+        if len(chunk) >= chunk_size:
+            send(chunk, done=False)
+            chunk = []
+    send(chunk, done=True)
+
+
+def _initial_files(
+    widget: DatasetUploadWidget, key: str, input_payload: dict[str, Any]
+) -> None:
+    get_executor().submit(
+        _send_initial_files,
+        widget,
+        key,
+        input_payload.get("chunkSize", _INSPECT_FILES_CHUNK_SIZE),
+    )
+
+
+@timed("task:initial-files")
+def _send_initial_files(widget: DatasetUploadWidget, key: str, chunk_size: int) -> None:
+    def send(files: list[dict[str, Any]], *, done: bool) -> None:
+        widget.send(
+            {
+                "type": "res:initial-files",
+                "key": key,
+                "payload": {"files": files, "done": done},
+            }
+        )
+
+    chunk: list[dict[str, Any]] = []
+    for file in iter_serialized_files(widget._initial_files):
+        chunk.append(file)
+        if len(chunk) >= chunk_size:
+            send(chunk, done=False)
+            chunk = []
+    send(chunk, done=True)
+
+
+def _inspect_folder(
+    widget: DatasetUploadWidget, key: str, input_payload: dict[str, Any]
+) -> None:
+    # A previous scan for the same element is outdated.
+    if (previous := widget._active_folder_scans.pop(key, None)) is not None:
+        previous.set()
+    cancel = threading.Event()
+    widget._active_folder_scans[key] = cancel
+    get_executor().submit(_send_folder_summaries, widget, key, input_payload, cancel)
+
+
+@timed("task:inspect-folder")
+def _send_folder_summaries(
+    widget: DatasetUploadWidget,
+    key: str,
+    input_payload: dict[str, Any],
+    cancel: threading.Event,
+) -> None:
+    try:
+        for summary in walk_folder(
+            Path(input_payload["path"]),
+            # walk_folder requires a positive interval.
+            report_every=max(1, int(input_payload.get("reportEvery", 1000))),
+            max_entries=input_payload.get("maxEntries", _MAX_FOLDER_ENTRIES),
+            cancel=cancel,
+        ):
+            widget.send(
+                {
+                    "type": "res:inspect-folder",
+                    "key": key,
+                    # Echo the input to identify the folder.
+                    "payload": {**input_payload, **summary.serialize()},
+                }
+            )
+    finally:
+        if widget._active_folder_scans.get(key) is cancel:
+            del widget._active_folder_scans[key]
+
+
+# Stop scanning after this many entries to limit the time spent on
+# huge directories, e.g., detector output.
+_MAX_FOLDER_ENTRIES = 100_000
+
+
+def _cancel_inspect_folder(
+    widget: DatasetUploadWidget, key: str, _input_payload: dict[str, Any]
+) -> None:
+    if (cancel := widget._active_folder_scans.get(key)) is not None:
+        cancel.set()
+
+
 def _browse_files(
     widget: DatasetUploadWidget, key: str, _input_payload: dict[str, str]
 ) -> None:
+    # Only needed when the user opens the file picker.
+    import IPython.display
+    from jupyter_host_file_picker import HostFilePicker
+
     def send_selected_files(change: dict[str, Any]) -> None:
         selected: list[Path] = change["new"]
         # TODO handle multi select once supported by file picker
@@ -68,22 +208,39 @@ def _browse_files(
         IPython.display.display(picker)  # type: ignore[no-untyped-call]
 
 
-def _call_field_factory(factory: Callable[..., Any], args: dict[str, Any]) -> Any:
-    spec = inspect.getfullargspec(factory)
-    pos_args = [args[name] for name in spec.args]
-    kw_args = {name: args[name] for name in spec.kwonlyargs}
-    return factory(*pos_args, **kw_args)
-
-
 def _build_field(
     widget: DatasetUploadWidget, key: str, input_payload: dict[str, Any]
 ) -> None:
-    try:
-        factory = widget.client.profile.field_factories[input_payload["name"]]
-    except KeyError:
-        payload = {"error": f"No factory for field {input_payload['name']}"}
+    # Factories may be slow, e.g., when they query external services.
+    # Only the latest request for each field is computed and answered,
+    # older ones are dropped when they are still queued or running.
+    name = input_payload["name"]
+    generation = widget._field_requests.start(key, name)
+    get_executor().submit(_run_build_field, widget, key, input_payload, generation)
+
+
+@timed("task:build-field")
+def _run_build_field(
+    widget: DatasetUploadWidget,
+    key: str,
+    input_payload: dict[str, Any],
+    generation: int,
+) -> None:
+    factories = widget._field_factories
+    requests = widget._field_requests
+    name = input_payload["name"]
+    if not requests.is_current(key, name, generation):
+        return
+    if name not in factories:
+        payload = {"error": f"No factory for field {name}"}
     else:
-        payload = {"value": _call_field_factory(factory, input_payload["values"])}
+        try:
+            payload = {"value": factories.build(name, input_payload["values"])}
+        except Exception as error:
+            get_logger().exception("Failed to build field %s", name)
+            payload = {"error": f"Failed to build field {name}: {error}"}
+    if not requests.is_current(key, name, generation):
+        return
 
     widget.send(
         {
@@ -98,13 +255,17 @@ def _load_image(
     widget: DatasetUploadWidget, key: str, input_payload: dict[str, str]
 ) -> None:
     path = Path(input_payload.get("path", ""))
+    buffers: list[bytes] = []
     try:
-        thumbnail = Thumbnail.load_file(path)
+        mime, data = load_image(path, widget._thumbnail_config)
     except FileNotFoundError:
-        payload = {"error": "File not found"}
+        payload: dict[str, Any] = {"error": "File not found"}
     else:
+        # Send the raw bytes as a binary buffer instead of base64 in JSON.
+        buffers.append(data)
         payload = {
-            "image": thumbnail.serialize(),
+            "image": {"$buffer": 0},
+            "mime": mime,
             "caption": input_payload.get("caption", path.stem),
         }
 
@@ -114,6 +275,23 @@ def _load_image(
             "key": key,
             # Echo the input to identify the element that the request came from.
             "payload": {**payload, **input_payload},
+        },
+        buffers=buffers,
+    )
+
+
+def _search_techniques(
+    widget: DatasetUploadWidget, key: str, input_payload: dict[str, Any]
+) -> None:
+    query = input_payload.get("query", "")
+    techniques = get_technique_index().search(
+        query, limit=input_payload.get("limit", 20)
+    )
+    widget.send(
+        {
+            "type": "res:search-techniques",
+            "key": key,
+            "payload": {"query": query, "techniques": techniques},
         }
     )
 
@@ -121,7 +299,60 @@ def _load_image(
 def _upload_dataset(
     widget: DatasetUploadWidget, key: str, payload: dict[str, object]
 ) -> None:
-    match upload_dataset(widget.client, payload):
+    # File transfers can take minutes, so do not block the kernel.
+    cancel = threading.Event()
+    widget._active_uploads[key] = cancel
+    get_executor().submit(_run_upload, widget, key, payload, cancel)
+
+
+@timed("task:upload-dataset")
+def _run_upload(
+    widget: DatasetUploadWidget,
+    key: str,
+    payload: dict[str, object],
+    cancel: threading.Event,
+) -> None:
+    def send_progress(progress: UploadProgress) -> None:
+        widget.send(
+            {
+                "type": "res:upload-progress",
+                "key": key,
+                "payload": progress.serialize(),
+            }
+        )
+
+    reused = ReusedFiles()
+
+    def record_reused(files: ReusedFiles) -> None:
+        nonlocal reused
+        reused = files
+
+    try:
+        # Record the progress to resume the upload if it is interrupted.
+        journal = widget._journal or _create_journal(widget, payload)
+        widget._journal = journal
+        result = upload_dataset(
+            widget._session.client,
+            payload,
+            on_progress=send_progress,
+            cancel=cancel,
+            transfer=widget._transfer_config,
+            validator=widget._validator,
+            journal=journal,
+            on_reuse=record_reused,
+        )
+    except Exception as error:
+        get_logger().exception("Failed to upload dataset")
+        message = str(error)
+        if widget._journal is not None:
+            message += "\nUpload again to resume the upload."
+        result = UploadError(errors=[FieldError(field="upload", error=message)])
+    finally:
+        widget._active_uploads.pop(key, None)
+    if isinstance(result, Dataset) or result.cancelled:
+        widget._journal = None
+
+    match result:
         case Dataset() as ds:
             widget.send(
                 {
@@ -134,34 +365,157 @@ def _upload_dataset(
                             widget.config["frontendUrl"],
                             "datasets/" + quote_plus(str(ds.pid)),
                         ),
+                        **reused.serialize(),
                     },
                 }
             )
-        case UploadError() as error:
+        case UploadError() as upload_error:
             widget.send(
                 {
                     "type": "res:upload-dataset",
                     "key": key,
-                    "payload": error.model_dump(),
+                    "payload": upload_error.model_dump(),
                 }
             )
 
 
-_EVENT_HANDLERS = {
+def _create_journal(
+    widget: DatasetUploadWidget, payload: dict[str, object]
+) -> UploadJournal | None:
+    try:
+        return UploadJournal.create(widget._session.client, payload)
+    except Exception as error:
+        # Uploads work without a journal, they just cannot be resumed.
+        get_logger().warning(
+            "Cannot resume the upload, failed to create a journal: %s", error
+        )
+        return None
+
+
+def _cancel_upload(
+    widget: DatasetUploadWidget, key: str, _input_payload: dict[str, object]
+) -> None:
+    if (cancel := widget._active_uploads.get(key)) is not None:
+        cancel.set()
+
+
+def _validate(
+    widget: DatasetUploadWidget, key: str, input_payload: dict[str, Any]
+) -> None:
+    # Record the changes in order and validate in the background.
+    # A queued validation is replaced by a newer one as it would validate
+    # the same data.
+    widget._validator.update(
+        input_payload["fields"],
+        replace=input_payload.get("replace", False),
+        version=input_payload["version"],
+    )
+    widget._dispatcher.dispatch(
+        "req:validate",
+        ("req:validate", key),
+        functools.partial(_run_validate, widget, key),
+    )
+
+
+@timed("task:validate")
+def _run_validate(widget: DatasetUploadWidget, key: str) -> None:
+    version, errors = widget._validator.check()
+    widget.send(
+        {
+            "type": "res:validate",
+            "key": key,
+            "payload": {
+                "version": version,
+                "errors": [error.model_dump() for error in errors],
+            },
+        }
+    )
+
+
+_Handler = Callable[["DatasetUploadWidget", str, Any], None]
+
+_EVENT_HANDLERS: dict[str, _Handler] = {
     "req:browse-files": _browse_files,
     "req:build-field": _build_field,
+    "req:cancel-inspect-folder": _cancel_inspect_folder,
+    "req:cancel-upload": _cancel_upload,
+    "req:initial-files": _initial_files,
     "req:inspect-file": _inspect_file,
+    "req:inspect-files": _inspect_files,
+    "req:inspect-folder": _inspect_folder,
     "req:load-image": _load_image,
+    "req:search-techniques": _search_techniques,
     "req:upload-dataset": _upload_dataset,
+    "req:validate": _validate,
 }
 
 
+# Handlers that only start background work or update state that later
+# messages rely on, e.g., cancellation events. They are cheap and must run
+# in the order the messages arrive, so they run on the kernel thread.
+# Browsing displays a widget, which only works on the kernel thread.
+_INLINE_EVENTS = frozenset(
+    {
+        "req:browse-files",
+        "req:build-field",
+        "req:cancel-inspect-folder",
+        "req:cancel-upload",
+        "req:initial-files",
+        "req:inspect-files",
+        "req:inspect-folder",
+        "req:upload-dataset",
+        "req:validate",
+    }
+)
+
+
 def handle_event(
-    widget: DatasetUploadWidget, content: dict[str, Any], buffer: object
+    widget: DatasetUploadWidget, content: dict[str, Any], buffers: list[memoryview]
 ) -> None:
+    type_: str = content.get("type", "")
     try:
-        handler = _EVENT_HANDLERS[content["type"]]
+        handler = _EVENT_HANDLERS[type_]
     except KeyError:
         get_logger().warning("Received unknown event from widget: %s", content)
         return
-    handler(widget, content["key"], content["payload"])  # type: ignore[operator]
+    if (stats := get_stats()).measure_bytes:
+        stats.record_bytes(type_, bytes_in=payload_size(content, buffers))
+    key = content["key"]
+    payload = content["payload"]
+    if buffers:
+        payload = _resolve_buffers(payload, buffers)
+
+    job = functools.partial(_run_handler, type_, handler, widget, key, payload)
+    if type_ in _INLINE_EVENTS:
+        job()
+    else:
+        widget._dispatcher.dispatch(type_, _job_id(type_, key, payload), job)
+
+
+def _run_handler(
+    type_: str, handler: _Handler, widget: DatasetUploadWidget, key: str, payload: Any
+) -> None:
+    with get_stats().timed(type_):
+        handler(widget, key, payload)
+
+
+def _job_id(type_: str, key: str, payload: dict[str, Any]) -> Hashable:
+    # A newer request from the same element replaces a queued one,
+    # except for images: an attachment input loads every image it is given.
+    if type_ == "req:load-image":
+        return type_, key, payload.get("path")
+    return type_, key
+
+
+def _resolve_buffers(value: Any, buffers: list[memoryview]) -> Any:
+    # Binary data is sent separately from the JSON content of messages.
+    # In the JSON, it is referenced as `{"$buffer": index}`.
+    match value:
+        case {"$buffer": int(index)} if len(value) == 1:
+            return buffers[index]
+        case dict():
+            return {key: _resolve_buffers(val, buffers) for key, val in value.items()}
+        case list():
+            return [_resolve_buffers(val, buffers) for val in value]
+        case _:
+            return value
@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Reuse files that SciCat already knows instead of transferring them again."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from scitacean import PID, Client, Dataset, File, RemotePath, ScicatCommError
+
+from ._checksum import get_checksum_pipeline
+from ._logging import get_logger
+from ._scicat_api import get_source_folder, iter_orig_datablocks
+
+# (checksum, algorithm, size)
+_FileKey = tuple[str, str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class ReusedFiles:
+    """Files that were not transferred because SciCat already has them."""
+
+    n_files: int = 0
+    n_bytes: int = 0
+
+    def serialize(self) -> dict[str, int]:
+        return {"filesReused": self.n_files, "bytesReused": self.n_bytes}
+
+
+def reuse_existing_files(
+    client: Client, dataset: Dataset
+) -> tuple[Dataset, ReusedFiles]:
+    """Replace local files by files of other datasets with the same content.
+
+    Files are matched by checksum, checksum algorithm, and size against the
+    orig datablocks in SciCat that the user has access to.
+    Matching files are replaced by references to the existing copies on the
+    file server, i.e., remote files with absolute paths in the source folder of
+    the other dataset.
+    Those files are not transferred but linked with the new dataset.
+
+    Failures to query SciCat are only logged, all files are uploaded then.
+    Files with incomplete records in SciCat are not reused.
+
+    Returns
+    -------
+    :
+        The dataset with reused files and how many files and bytes are reused.
+    """
+    local = [file for file in dataset.files if file.is_on_local]
+    keys = _file_keys(local)
+    if not (wanted := {key for key in keys if key is not None}):
+        return dataset, ReusedFiles()
+    try:
+        existing = _find_existing_files(client, wanted)
+    except ScicatCommError as error:
+        get_logger().warning("Failed to look up existing files in SciCat: %s", error)
+        return dataset, ReusedFiles()
+    if not existing:
+        return dataset, ReusedFiles()
+
+    replacements: dict[RemotePath, File] = {}
+    n_bytes = 0
+    for file, key in zip(local, keys, strict=True):
+        if key is not None and (reused := existing.get(key)) is not None:
+            replacements[file.remote_path] = reused
+            n_bytes += key[2]
+    get_logger().info(
+        "Reusing %d files (%d bytes) that are already in SciCat",
+        len(replacements),
+        n_bytes,
+    )
+    files = [replacements.get(file.remote_path, file) for file in dataset.files]
+    deduplicated = dataset.replace(_orig_datablocks=[])
+    deduplicated.add_files(*files)
+    return deduplicated, ReusedFiles(n_files=len(replacements), n_bytes=n_bytes)
+
+
+def _file_keys(files: Sequence[File]) -> list[_FileKey | None]:
+    # Compute checksums in parallel, most are usually done while the
+    # user fills in the form.
+    pipeline = get_checksum_pipeline()
+    for file in files:
+        if file.local_path is not None and file.checksum_algorithm is not None:
+            pipeline.prefetch(Path(file.local_path), algorithm=file.checksum_algorithm)
+    keys: list[_FileKey | None] = []
+    for file in files:
+        try:
+            checksum = file.checksum()
+            size = file.size
+        except OSError:
+            checksum = None
+        if checksum is None or file.checksum_algorithm is None:
+            keys.append(None)
+        else:
+            keys.append((checksum, file.checksum_algorithm, size))
+    return keys
+
+
+def _find_existing_files(client: Client, keys: set[_FileKey]) -> dict[_FileKey, File]:
+    checksums = sorted({checksum for checksum, _, _ in keys})
+    found: dict[_FileKey, tuple[PID, str, datetime]] = {}
+    for datablock in iter_orig_datablocks(client, checksums):
+        # Records can be incomplete, only use files with everything we need.
+        if not isinstance(dataset_id := datablock.get("datasetId"), str):
+            continue
+        algorithm = datablock.get("chkAlg")
+        for data_file in datablock.get("dataFileList") or ():
+            key = (data_file.get("chk"), algorithm, data_file.get("size"))
+            if key in keys and key not in found:
+                if (location := _parse_location(data_file)) is not None:
+                    found[key] = (PID.parse(dataset_id), *location)
+
+    source_folders = {
+        pid: _source_folder_of(client, pid) for pid, _, _ in found.values()
+    }
+    return {
+        key: File.from_remote(
+            remote_path=source_folder / path,
+            size=key[2],
+            creation_time=creation_time,
+            checksum=key[0],
+            checksum_algorithm=key[1],
+        )
+        for key, (pid, path, creation_time) in found.items()
+        if (source_folder := source_folders[pid]) is not None
+    }
+
+
+def _parse_location(data_file: dict[str, Any]) -> tuple[str, datetime] | None:
+    path = data_file.get("path")
+    time = data_file.get("time")
+    if not isinstance(path, str) or not path or not isinstance(time, str):
+        return None
+    try:
+        return path, datetime.fromisoformat(time)
+    except ValueError:
+        return None
+
+
+def _source_folder_of(client: Client, pid: PID) -> RemotePath | None:
+    try:
+        return get_source_folder(client, pid)
+    except ScicatCommError as error:
+        get_logger().warning("Cannot reuse files of dataset %s: %s", pid, error)
+        return None
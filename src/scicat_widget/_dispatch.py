@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Run handlers of widget messages on a worker pool."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass, field
+
+from ._executor import get_executor
+from ._logging import get_logger
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchConfig:
+    """Configuration of how messages from the frontend are handled.
+
+    Parameters
+    ----------
+    workers:
+        Maximum number of messages that are handled at the same time.
+        Messages run on a thread pool that is shared by all widgets.
+    max_concurrent:
+        Maximum number of messages of a given type that are handled at the
+        same time, by message type, e.g., ``{"req:load-image": 2}``.
+        Types that are not listed use ``default_max_concurrent``.
+    default_max_concurrent:
+        Maximum number of concurrent messages for unlisted types.
+    synchronous:
+        If true, handle all messages on the kernel thread as they arrive.
+        This blocks the kernel while a message is handled.
+    """
+
+    workers: int = 8
+    max_concurrent: Mapping[str, int] = field(
+        default_factory=lambda: {
+            "req:inspect-file": 4,
+            "req:load-image": 2,
+            "req:search-techniques": 1,
+            "req:validate": 1,
+        }
+    )
+    default_max_concurrent: int = 2
+    synchronous: bool = False
+
+    def __post_init__(self) -> None:
+        if self.workers < 1:
+            raise ValueError(f"workers must be at least 1, got {self.workers}")
+        for type_, limit in self.max_concurrent.items():
+            if limit < 1:
+                raise ValueError(
+                    f"max_concurrent must be at least 1, got {limit} for {type_}"
+                )
+        if self.default_max_concurrent < 1:
+            raise ValueError(
+                "default_max_concurrent must be at least 1, "
+                f"got {self.default_max_concurrent}"
+            )
+
+    def limit_for(self, type_: str) -> int:
+        return self.max_concurrent.get(type_, self.default_max_concurrent)
+
+
+class Dispatcher:
+    """Run jobs on the shared thread pool with concurrency limits.
+
+    At most ``config.workers`` jobs run at the same time, and at most
+    ``config.limit_for(type_)`` of them have the same type.
+
+    Jobs that wait for a free slot are deduplicated:
+    when a job with the same ID is already queued, it is replaced by the new one
+    but keeps its place in the queue.
+    Jobs that have already started are not affected.
+    """
+
+    def __init__(self, config: DispatchConfig | None = None) -> None:
+        self.config = config if config is not None else DispatchConfig()
+        self._lock = threading.Lock()
+        self._queued: dict[str, OrderedDict[Hashable, Callable[[], None]]] = {}
+        self._running: dict[str, int] = {}
+        self._n_running = 0
+
+    def dispatch(self, type_: str, job_id: Hashable, job: Callable[[], None]) -> None:
+        """Schedule a job or run it right away in synchronous mode."""
+        if self.config.synchronous:
+            job()
+            return
+        with self._lock:
+            queue = self._queued.setdefault(type_, OrderedDict())
+            if job_id in queue:
+                get_logger().debug("Replacing queued message %s", job_id)
+            queue[job_id] = job
+            self._start_ready(type_)
+
+    def _start_ready(self, type_: str) -> None:
+        # Requires self._lock
+        queue = self._queued[type_]
+        limit = self.config.limit_for(type_)
+        while (
+            queue
+            and self._running.get(type_, 0) < limit
+            and self._n_running < self.config.workers
+        ):
+            _, job = queue.popitem(last=False)
+            self._running[type_] = self._running.get(type_, 0) + 1
+            self._n_running += 1
+            get_executor().submit(self._run, type_, job)
+
+    def _run(self, type_: str, job: Callable[[], None]) -> None:
+        try:
+            job()
+        except Exception:
+            get_logger().exception("Failed to handle message of type %s", type_)
+        finally:
+            with self._lock:
+                self._running[type_] -= 1
+                self._n_running -= 1
+                # Start jobs of the same type first, then jobs of other types
+                # that waited for a free worker.
+                self._start_ready(type_)
+                for other in self._queued:
+                    self._start_ready(other)
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Call the field factories of a Scitacean profile."""
+
+from __future__ import annotations
+
+import inspect
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class _Factory:
+    function: Callable[..., Any]
+    args: tuple[str, ...]
+    kwonlyargs: tuple[str, ...]
+
+    @classmethod
+    def from_function(cls, function: Callable[..., Any]) -> _Factory:
+        spec = inspect.getfullargspec(function)
+        if spec.varargs is not None or spec.varkw is not None:
+            raise TypeError("Variable arguments are not supported")
+        return cls(
+            function=function,
+            args=tuple(spec.args),
+            kwonlyargs=tuple(spec.kwonlyargs),
+        )
+
+    @property
+    def dependencies(self) -> list[str]:
+        return [*self.args, *self.kwonlyargs]
+
+    def __call__(self, values: Mapping[str, Any]) -> Any:
+        return self.function(
+            *(values[name] for name in self.args),
+            **{name: values[name] for name in self.kwonlyargs},
+        )
+
+
+class FieldFactories:
+    """Field factories of a profile with memoized results.
+
+    The signatures of the factories are inspected once on construction.
+    Results are cached by field name and the values of the dependencies,
+    so factories should be pure functions of their arguments.
+
+    Parameters
+    ----------
+    factories:
+        Mapping of field names to factories, usually
+        ``client.profile.field_factories``.
+    max_entries:
+        Maximum number of results to keep.
+    """
+
+    def __init__(
+        self, factories: Mapping[str, Callable[..., Any]], *, max_entries: int = 256
+    ) -> None:
+        self._factories = {
+            name: _Factory.from_function(function)
+            for name, function in factories.items()
+        }
+        self.max_entries = max_entries
+        self._results: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def dependencies(self) -> dict[str, list[str]]:
+        """Return the names of the arguments of each factory."""
+        return {name: factory.dependencies for name, factory in self._factories.items()}
+
+    def build(self, name: str, values: Mapping[str, Any]) -> Any:
+        """Compute the value of a field from its dependencies.
+
+        Raises
+        ------
+        KeyError
+            If there is no factory for the field.
+        """
+        factory = self._factories[name]
+        memo_key = (name, _freeze(values))
+        with self._lock:
+            if memo_key in self._results:
+                self._results.move_to_end(memo_key)
+                return self._results[memo_key]
+
+        value = factory(values)
+        with self._lock:
+            self._results[memo_key] = value
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return value
+
+
+class FieldRequests:
+    """Track the latest request to build each field of one widget.
+
+    Factories may be slow, so results of requests that have been superseded
+    by newer ones are dropped.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Latest request number by request key and field name.
+        self._generations: dict[tuple[str, str], int] = {}
+
+    def start(self, key: str, name: str) -> int:
+        """Register a new request and return its generation.
+
+        This makes all earlier requests for the same key and field stale.
+        """
+        with self._lock:
+            generation = self._generations.get((key, name), 0) + 1
+            self._generations[key, name] = generation
+            return generation
+
+    def is_current(self, key: str, name: str, generation: int) -> bool:
+        """Return whether no newer request has been started."""
+        with self._lock:
+            return self._generations.get((key, name)) == generation
+
+
+def _freeze(values: Mapping[str, Any]) -> str:
+    # Values come from JSON messages, so they can be serialized back to JSON.
+    return json.dumps(values, sort_keys=True, default=str)
@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Cache for metadata of local files."""
+
+from __future__ import annotations
+
+import os
+import stat
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from scitacean import File
+
+
+@dataclass(frozen=True, slots=True)
+class FileMetadata:
+    """Metadata of a local file."""
+
+    path: Path
+    size: int
+    creation_time: datetime
+    is_dir: bool
+    type: str
+    file: File
+    """Scitacean file for ``path``.
+
+    This object is shared between all users of the cache so that
+    its cached checksum can be reused.
+    """
+    # Used to detect changes to the file:
+    mtime_ns: int
+    ino: int
+
+
+class FileMetadataCache:
+    """LRU cache for metadata of local files.
+
+    Each lookup stats the file once and only recomputes the metadata
+    if the file's modification time, size, or inode have changed.
+
+    Parameters
+    ----------
+    deduce_type:
+        Function that returns the type of a (non-folder) file from its path.
+    max_entries:
+        Maximum number of files to keep in the cache.
+    """
+
+    def __init__(
+        self, deduce_type: Callable[[Path], str], *, max_entries: int = 4096
+    ) -> None:
+        self._deduce_type = deduce_type
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, FileMetadata] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> FileMetadata:
+        """Return the metadata of a file.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be accessed, e.g., :class:`FileNotFoundError`.
+        """
+        key = os.fspath(path)
+        st = path.stat()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and _matches(entry, st):
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._make_entry(path, st)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _make_entry(self, path: Path, st: os.stat_result) -> FileMetadata:
+        is_dir = stat.S_ISDIR(st.st_mode)
+        return FileMetadata(
+            path=path,
+            size=st.st_size,
+            # Same as File.creation_time for local files.
+            creation_time=datetime.fromtimestamp(st.st_mtime, tz=UTC),
+            is_dir=is_dir,
+            type="folder" if is_dir else self._deduce_type(path),
+            file=File.from_local(path),
+            mtime_ns=st.st_mtime_ns,
+            ino=st.st_ino,
+        )
+
+
+def _matches(entry: FileMetadata, st: os.stat_result) -> bool:
+    return (entry.mtime_ns, entry.size, entry.ino) == (
+        st.st_mtime_ns,
+        st.st_size,
+        st.st_ino,
+    )
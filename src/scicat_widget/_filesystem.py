@@ -1,26 +1,176 @@
+import dataclasses
 import mimetypes
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cache
+from itertools import islice
 from pathlib import Path
+from typing import Any
 
-from scitacean import File
+from ._file_cache import FileMetadataCache
 
 
 def inspect_file(path: Path) -> dict[str, str | int | bool | datetime] | None:
     """Return a dict describing a file, or None if the file does not exist."""
     try:
-        # TODO do not allow folders (probably in scitacean)
-        file = File.from_local(path)
+        metadata = get_file_metadata_cache().get(path)
     except FileNotFoundError:
         return None
+    # TODO do not allow folders (probably in scitacean)
     return {
         "success": True,
-        "size": file.size,
-        "creationTime": file.creation_time,
-        "remotePath": file.remote_path.posix,
-        "type": _deduce_file_type(path),
+        "size": metadata.size,
+        "creationTime": metadata.creation_time,
+        "remotePath": metadata.file.remote_path.posix,
+        "type": metadata.type,
     }
 
 
+@cache
+def get_file_metadata_cache() -> FileMetadataCache:
+    """Return the process-wide cache for metadata of local files."""
+    return FileMetadataCache(_deduce_file_type)
+
+
+def inspect_files(
+    paths: Iterable[Path], *, max_workers: int = 16, chunk_size: int = 256
+) -> Iterator[dict[str, str | int | bool | datetime]]:
+    """Inspect many files concurrently.
+
+    Stat calls release the GIL, so using threads helps
+    especially on network filesystems.
+    Files are inspected in chunks of ``chunk_size`` per task to keep
+    the overhead of the thread pool low for long lists of files.
+
+    Yields
+    ------
+    :
+        One dict per path in the order of ``paths``.
+        Unlike :func:`inspect_file`, files that cannot be inspected produce
+        a dict with ``success=False`` and an error message.
+    """
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="scicat-widget-stat"
+    ) as executor:
+        for results in executor.map(_inspect_chunk, _chunked(paths, chunk_size)):
+            yield from results
+
+
+def _chunked(items: Iterable[Path], size: int) -> Iterator[tuple[Path, ...]]:
+    it = iter(items)
+    while chunk := tuple(islice(it, size)):
+        yield chunk
+
+
+def _inspect_chunk(
+    paths: tuple[Path, ...],
+) -> list[dict[str, str | int | bool | datetime]]:
+    return [_inspect_file_or_error(path) for path in paths]
+
+
+def _inspect_file_or_error(path: Path) -> dict[str, str | int | bool | datetime]:
+    try:
+        result = inspect_file(path)
+    except OSError as error:
+        return {"success": False, "error": error.strerror or str(error)}
+    if result is None:
+        return {"success": False, "error": "File not found"}
+    return result
+
+
+@dataclass(slots=True)
+class FolderSummary:
+    """Aggregated contents of a folder."""
+
+    n_files: int = 0
+    n_folders: int = 0
+    total_bytes: int = 0
+    n_errors: int = 0
+    types: dict[str, int] = dataclasses.field(default_factory=dict)
+    done: bool = False
+    truncated: bool = False
+    cancelled: bool = False
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            "nFiles": self.n_files,
+            "nFolders": self.n_folders,
+            "totalBytes": self.total_bytes,
+            "nErrors": self.n_errors,
+            "types": dict(self.types),
+            "done": self.done,
+            "truncated": self.truncated,
+            "cancelled": self.cancelled,
+        }
+
+
+def walk_folder(
+    path: Path,
+    *,
+    report_every: int = 1000,
+    max_entries: int | None = None,
+    cancel: threading.Event | None = None,
+) -> Iterator[FolderSummary]:
+    """Recursively summarize the contents of a folder.
+
+    Symlinks are counted but not followed.
+
+    Yields
+    ------
+    :
+        A snapshot of the summary after every ``report_every`` entries
+        and a final summary with ``done=True``.
+        The walk stops early if ``max_entries`` entries have been seen
+        (``truncated=True``) or if ``cancel`` is set (``cancelled=True``).
+    """
+    summary = FolderSummary()
+    n_entries = 0
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if cancel is not None and cancel.is_set():
+                        summary.cancelled = True
+                        break
+                    if max_entries is not None and n_entries >= max_entries:
+                        summary.truncated = True
+                        break
+                    n_entries += 1
+                    _add_entry(summary, entry, stack)
+                    if n_entries % report_every == 0:
+                        yield dataclasses.replace(summary, types=dict(summary.types))
+        except OSError:
+            summary.n_errors += 1
+        if summary.cancelled or summary.truncated:
+            break
+
+    summary.done = True
+    yield summary
+
+
+def _add_entry(
+    summary: FolderSummary, entry: os.DirEntry[str], stack: list[str]
+) -> None:
+    try:
+        if entry.is_dir(follow_symlinks=False):
+            summary.n_folders += 1
+            stack.append(entry.path)
+            return
+        size = entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        summary.n_errors += 1
+        return
+    summary.n_files += 1
+    summary.total_bytes += size
+    file_type = _deduce_file_type(Path(entry.name))
+    summary.types[file_type] = summary.types.get(file_type, 0) + 1
+
+
 _KNOWN_MIMETYPES = {
     "application/json": "json",
     "application/pdf": "pdf",
@@ -36,10 +186,8 @@ def _deduce_file_type(path: Path) -> str:
     """Deduce the file type from the mimetype and extension.
 
     The returned type string matches the types recognized by the TypeScript code.
+    This does not detect folders as that requires a stat call.
     """
-    if path.is_dir():
-        return "folder"
-
     mimetype = mimetypes.guess_type(path)[0]
     try:
         return _KNOWN_MIMETYPES[mimetype]  # type: ignore[index]
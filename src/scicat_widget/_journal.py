@@ -0,0 +1,278 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""On-disk journal of dataset uploads for resuming interrupted uploads."""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import time
+import uuid
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+from scitacean import PID, Client, File, RemotePath
+
+from ._checksum import get_checksum_pipeline
+from ._logging import get_logger
+
+_FORMAT_VERSION = 1
+
+
+class UploadJournal:
+    """Record of the progress of a dataset upload on disk.
+
+    The journal stores the widget-format payload of the dataset,
+    the source folder, the size and checksum of every file that has been
+    transferred, the PID of the dataset once it has been created,
+    and which of the remaining steps have finished.
+    Each step is appended to a JSON lines file as soon as it completes,
+    so the journal survives crashes of the kernel or lost connections.
+
+    An interrupted upload can be continued with :func:`resume_upload` or by
+    passing the journal to :class:`DatasetUploadWidget` as ``resume``.
+    Files that were transferred and have not changed since are not
+    transferred again.
+    The journal is deleted when the upload finishes or is cancelled.
+
+    Use :meth:`create` to start a new journal and :meth:`load` or
+    :meth:`unfinished` to open existing ones.
+    """
+
+    def __init__(self, path: Path, records: Iterable[dict[str, Any]]) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.url = ""
+        self.created = 0.0
+        self.payload: dict[str, Any] = {}
+        self.source_folder: RemotePath | None = None
+        self.pid: PID | None = None
+        self._uploaded: dict[str, tuple[int, str | None]] = {}
+        self._done: set[str] = set()
+        self._broken = False
+        for record in records:
+            self._apply(record)
+
+    @classmethod
+    def create(
+        cls,
+        client: Client,
+        payload: dict[str, Any],
+        *,
+        directory: str | os.PathLike[str] | None = None,
+    ) -> UploadJournal:
+        """Start a new journal for uploading ``payload`` with ``client``."""
+        directory = (
+            Path(directory) if directory is not None else _default_journal_directory()
+        )
+        created = time.time()
+        path = directory / f"{int(created)}-{uuid.uuid4().hex[:12]}.jsonl"
+        header = {
+            "version": _FORMAT_VERSION,
+            "url": client.profile.url,
+            "created": created,
+            "payload": payload,
+        }
+        directory.mkdir(parents=True, exist_ok=True)
+        # Write the header atomically so that there are no journals without one.
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(_dumps(header) + "\n", encoding="utf-8")
+        tmp.replace(path)
+        return cls(path, [header])
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> UploadJournal:
+        """Open an existing journal.
+
+        Raises
+        ------
+        ValueError
+            If the file is not an upload journal.
+        """
+        path = Path(path)
+        records = []
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(_loads(line))
+                except ValueError:
+                    # The last record is incomplete if writing it was interrupted.
+                    get_logger().warning("Ignoring bad record in %s", path)
+                    break
+        if not records or records[0].get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Not an upload journal: {path}")
+        return cls(path, records)
+
+    @classmethod
+    def unfinished(
+        cls, directory: str | os.PathLike[str] | None = None
+    ) -> list[UploadJournal]:
+        """Return all journals of uploads that have not finished, oldest first."""
+        directory = (
+            Path(directory) if directory is not None else _default_journal_directory()
+        )
+        journals = []
+        for path in sorted(directory.glob("*.jsonl")):
+            try:
+                journals.append(cls.load(path))
+            except (OSError, ValueError) as error:
+                get_logger().warning("Ignoring bad upload journal %s: %s", path, error)
+        return sorted(journals, key=lambda journal: journal.created)
+
+    def __repr__(self) -> str:
+        name = self.payload.get("datasetName")
+        return (
+            f"UploadJournal(path={self.path}, datasetName={name!r}, "
+            f"uploaded_files={len(self._uploaded)}, pid={self.pid})"
+        )
+
+    @property
+    def n_uploaded_files(self) -> int:
+        """Number of files that have been transferred."""
+        with self._lock:
+            return len(self._uploaded)
+
+    def is_done(self, step: str) -> bool:
+        """Return whether a step of the upload has finished."""
+        with self._lock:
+            return step in self._done
+
+    def record_payload(self, payload: dict[str, Any]) -> None:
+        """Record the payload if it has changed, e.g., when resuming in a widget."""
+        if payload != self.payload:
+            self._append({"payload": payload})
+
+    def record_source_folder(self, source_folder: RemotePath) -> None:
+        self._append({"sourceFolder": source_folder.posix})
+
+    def record_uploaded(self, files: Sequence[File]) -> None:
+        """Record that files have been transferred."""
+        self._append({"uploaded": [_uploaded_entry(file) for file in files]})
+
+    def record_reverted(self, files: Sequence[File]) -> None:
+        """Record that transferred files have been removed from the file server."""
+        self._append({"reverted": [file.remote_path.posix for file in files]})
+
+    def record_pid(self, pid: PID) -> None:
+        """Record that the dataset has been created."""
+        self._append({"pid": str(pid)})
+
+    def record_done(self, step: str) -> None:
+        """Record that a step of the upload has finished."""
+        self._append({"done": step})
+
+    def split_uploaded(self, files: Sequence[File]) -> tuple[list[File], list[File]]:
+        """Find files that have already been transferred.
+
+        Returns
+        -------
+        :
+            Files that have been transferred and are unchanged, and files that
+            have been transferred but have changed locally since.
+        """
+        with self._lock:
+            recorded = [
+                (file, entry)
+                for file in files
+                if (entry := self._uploaded.get(file.remote_path.posix)) is not None
+            ]
+        # Checking all files requires their checksums, compute them in parallel.
+        pipeline = get_checksum_pipeline()
+        for file, _ in recorded:
+            if file.local_path is not None and file.checksum_algorithm is not None:
+                pipeline.prefetch(
+                    Path(file.local_path), algorithm=file.checksum_algorithm
+                )
+        unchanged: list[File] = []
+        changed: list[File] = []
+        for file, (size, checksum) in recorded:
+            try:
+                same = file.size == size and file.checksum() == checksum
+            except OSError:
+                same = False
+            (unchanged if same else changed).append(file)
+        return unchanged, changed
+
+    def remove(self) -> None:
+        """Delete the journal from disk."""
+        self.path.unlink(missing_ok=True)
+
+    def _append(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self._apply(record)
+            if self._broken:
+                return
+            try:
+                line = _dumps(record) + "\n"
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(line)
+            except (OSError, TypeError, ValueError) as error:
+                # The upload continues, but it cannot be resumed from an
+                # incomplete journal.
+                get_logger().warning(
+                    "Failed to write upload journal %s, the upload cannot be "
+                    "resumed: %s",
+                    self.path,
+                    error,
+                )
+                self._broken = True
+                try:
+                    self.path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        if "url" in record:
+            self.url = record["url"]
+            self.created = record["created"]
+        if "payload" in record:
+            self.payload = record["payload"]
+        if "sourceFolder" in record:
+            self.source_folder = RemotePath(record["sourceFolder"])
+        for entry in record.get("uploaded", ()):
+            self._uploaded[entry["remotePath"]] = (entry["size"], entry["checksum"])
+        for remote_path in record.get("reverted", ()):
+            self._uploaded.pop(remote_path, None)
+        if "pid" in record:
+            self.pid = PID.parse(record["pid"])
+        if "done" in record:
+            self._done.add(record["done"])
+
+
+def _uploaded_entry(file: File) -> dict[str, Any]:
+    try:
+        size, checksum = file.size, file.checksum()
+    except OSError:
+        # Does not match any file, so the file is uploaded again when resuming.
+        size, checksum = -1, None
+    return {"remotePath": file.remote_path.posix, "size": size, "checksum": checksum}
+
+
+def _dumps(record: dict[str, Any]) -> str:
+    return json.dumps(record, default=_encode_binary)
+
+
+def _loads(line: str) -> dict[str, Any]:
+    return json.loads(line, object_hook=_decode_binary)  # type: ignore[no-any-return]
+
+
+def _encode_binary(value: Any) -> dict[str, str]:
+    # Attachments arrive from the widget as binary comm buffers.
+    if isinstance(value, bytes | bytearray | memoryview):
+        return {"$base64": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_binary(value: dict[str, Any]) -> Any:
+    if len(value) == 1 and isinstance(encoded := value.get("$base64"), str):
+        return base64.b64decode(encoded)
+    return value
+
+
+def _default_journal_directory() -> Path:
+    base = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(base) / "scicat_widget" / "uploads"
@@ -7,3 +7,18 @@ import logging
 # TODO does not show up in Jupyter (need to configure handler)
 def get_logger() -> logging.Logger:
     return logging.getLogger("scicat-widget")
+
+
+def get_stats_logger() -> logging.Logger:
+    """Return a logger for statistics that the user asked for.
+
+    The logger writes to stderr if logging is not configured
+    so that its messages show up in Jupyter.
+    """
+    logger = logging.getLogger("scicat-widget.stats")
+    logger.setLevel(logging.INFO)
+    if not logger.hasHandlers():
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(name)s: %(message)s"))
+        logger.addHandler(handler)
+    return logger
@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Incremental updates of JSON-like data.
+
+Updates are expressed as a subset of JSON patch (RFC 6902):
+operations ``add``, ``replace``, and ``remove`` with JSON pointer paths.
+The same operations are applied by the JavaScript widget, see ``js/patch.ts``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+PatchOp = dict[str, Any]
+
+
+def to_pointer(path: str) -> str:
+    """Convert a slash-separated path to a JSON pointer.
+
+    ``"scientificMetadata/0/value"`` becomes ``"/scientificMetadata/0/value"``.
+    Paths that start with a slash are returned unchanged.
+    """
+    return path if path.startswith("/") else "/" + path
+
+
+def apply_patch(document: dict[str, Any], ops: list[PatchOp]) -> None:
+    """Apply patch operations to ``document`` in place.
+
+    Raises
+    ------
+    KeyError, IndexError
+        If a path does not exist.
+    ValueError
+        If an operation is not supported.
+    """
+    for op in ops:
+        parent, key = _resolve_parent(document, op["path"])
+        match op["op"], parent:
+            case "add", list():
+                if key == "-":
+                    parent.append(op["value"])
+                else:
+                    parent.insert(int(key), op["value"])
+            case "add", dict():
+                parent[key] = op["value"]
+            case "replace", list():
+                parent[int(key)] = op["value"]
+            case "replace", dict():
+                if key not in parent:
+                    raise KeyError(op["path"])
+                parent[key] = op["value"]
+            case "remove", list():
+                del parent[int(key)]
+            case "remove", dict():
+                del parent[key]
+            case _:
+                raise ValueError(f"Unsupported patch operation: {op}")
+
+
+def make_set_op(document: Mapping[str, Any], pointer: str, value: Any) -> PatchOp:
+    """Return an operation that sets the value at ``pointer``.
+
+    This uses ``replace`` for existing list elements and ``add`` otherwise
+    so that the operation does not insert into lists.
+    """
+    parent, key = _resolve_parent(document, pointer)
+    if isinstance(parent, list) and key != "-":
+        return {"op": "replace", "path": pointer, "value": value}
+    return {"op": "add", "path": pointer, "value": value}
+
+
+def diff_top_level(old: Mapping[str, Any], new: Mapping[str, Any]) -> list[PatchOp]:
+    """Return operations that turn ``old`` into ``new``.
+
+    Only top-level keys are compared, changed values are replaced as a whole.
+    """
+    ops: list[PatchOp] = [
+        {"op": "remove", "path": _escape_key(key)} for key in old if key not in new
+    ]
+    ops.extend(
+        {"op": "add", "path": _escape_key(key), "value": value}
+        for key, value in new.items()
+        if key not in old or old[key] != value
+    )
+    return ops
+
+
+def _resolve_parent(document: Any, pointer: str) -> tuple[Any, str]:
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: '{pointer}'")
+    *parents, key = (_unescape(token) for token in pointer[1:].split("/"))
+    target = document
+    for token in parents:
+        target = target[int(token)] if isinstance(target, list) else target[token]
+    return target, key
+
+
+def _escape_key(key: str) -> str:
+    return "/" + key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
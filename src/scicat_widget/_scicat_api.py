@@ -1,30 +1,138 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
 
-from scitacean import Client
+import hashlib
+import json
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, ParamSpec, TypeVar
+
+from scitacean import PID, Client, RemotePath, ScicatCommError, model
 
 # Not great but there is no need to reimplement this here,
 # and handling of ORCID iDs is not part of the core functionality of Scitacean.
 from scitacean._internal.orcid import parse_orcid_id
 
+from ._cache import ScicatCache
+from ._logging import get_logger
 from ._model import Instrument, ProposalOverview, UserInfo
+from ._stats import get_stats
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+def get_user_and_scicat_info(
+    client: Client, *, concurrent: bool = True, cache: ScicatCache | None = None
+) -> tuple[UserInfo, list[Instrument]]:
+    """Download information about the user and instruments from SciCat.
 
+    If ``concurrent`` is true, the instruments are downloaded in a separate thread
+    while the user info and proposals are downloaded in the calling thread.
+    Exceptions are propagated to the caller in both cases.
 
-def get_user_and_scicat_info(client: Client) -> tuple[UserInfo, list[Instrument]]:
-    user_info = get_user_info(client)
-    instruments = get_instruments(client)
+    If a ``cache`` is given, fresh entries are used instead of downloading data,
+    and downloaded data is stored in the cache.
+    """
+    if not concurrent:
+        user_info = _timed("get_user_info", get_user_info, client, cache=cache)
+        instruments = _timed("get_instruments", get_instruments, client, cache=cache)
+        return user_info, instruments
+
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="scicat-widget-api"
+    ) as executor:
+        instruments_future = executor.submit(
+            _timed, "get_instruments", get_instruments, client, cache=cache
+        )
+        user_info = _timed("get_user_info", get_user_info, client, cache=cache)
+        instruments = instruments_future.result()
     return user_info, instruments
 
 
-def get_user_info(client: Client) -> UserInfo:
-    identity = client.scicat.call_endpoint(
-        cmd="GET", url="users/my/identity", operation="get_user_info"
+def get_cached_user_and_scicat_info(
+    client: Client, cache: ScicatCache
+) -> tuple[UserInfo, list[Instrument]] | None:
+    """Return user info and instruments from the cache, regardless of their age.
+
+    Returns ``None`` if any of the data is not in the cache.
+    """
+    url = client.profile.url
+    identity = cache.get(
+        "identity", url=url, user=_cache_user(client), allow_stale=True
     )
-    profile = identity["profile"]
+    instruments = cache.get("instruments", url=url, allow_stale=True)
+    if identity is None or instruments is None:
+        return None
+
+    access_groups = _access_groups(identity)
+    proposals: list[ProposalOverview] = []
+    if access_groups:
+        cached_proposals = _get_cached_proposals(
+            cache, url, _cache_user(client), access_groups, allow_stale=True
+        )
+        if cached_proposals is None:
+            return None
+        proposals = cached_proposals
+
+    return (
+        _make_user_info(identity, access_groups, proposals),
+        _load_instruments(instruments),
+    )
+
+
+def _timed(
+    name: str, func: Callable[_P, _R], /, *args: _P.args, **kwargs: _P.kwargs
+) -> _R:
+    start = time.perf_counter()
+    error = False
+    try:
+        return func(*args, **kwargs)
+    except BaseException:
+        error = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        get_stats().record_call(f"scicat:{name}", seconds, error=error)
+        get_logger().info("SciCat operation '%s' took %.3fs", name, seconds)
+
+
+def get_user_info(client: Client, *, cache: ScicatCache | None = None) -> UserInfo:
+    url = client.profile.url
+    identity = (
+        cache.get("identity", url=url, user=_cache_user(client))
+        if cache is not None
+        else None
+    )
+    if identity is None:
+        identity = _strip_identity(
+            _timed(
+                "get_identity",
+                client.scicat.call_endpoint,
+                cmd="GET",
+                url="users/my/identity",
+                operation="get_user_info",
+            )
+        )
+        if cache is not None:
+            cache.put("identity", identity, url=url, user=_cache_user(client))
+
+    access_groups = _access_groups(identity)
+    proposals = (
+        _timed("get_proposals", get_proposals, client, access_groups, cache=cache)
+        if access_groups
+        else []
+    )
+    return _make_user_info(identity, access_groups, proposals)
 
-    access_groups = sorted(profile.get("accessGroups", []))
-    proposals = get_proposals(client, access_groups) if access_groups else []
 
+def _make_user_info(
+    identity: dict[str, Any],
+    access_groups: list[str],
+    proposals: list[ProposalOverview],
+) -> UserInfo:
+    profile = identity["profile"]
     return UserInfo(
         user_id=identity["userId"],
         display_name=profile.get("displayName", None),
@@ -37,28 +145,232 @@ def get_user_info(client: Client) -> UserInfo:
     )
 
 
-def get_proposals(client: Client, access_groups: list[str]) -> list[ProposalOverview]:
-    proposals = client.scicat.call_endpoint(
-        cmd="GET", url="proposals", operation="get_proposals"
+def _access_groups(identity: dict[str, Any]) -> list[str]:
+    return sorted(identity["profile"].get("accessGroups", []))
+
+
+def _strip_identity(identity: dict[str, Any]) -> dict[str, Any]:
+    # Only keep what we need to avoid storing unrelated or sensitive data in caches.
+    profile = identity["profile"]
+    return {
+        "userId": identity["userId"],
+        "profile": {
+            "displayName": profile.get("displayName", None),
+            "email": profile.get("email", None),
+            "accessGroups": profile.get("accessGroups", []),
+            "oidcClaims": {
+                "orcid": profile.get("oidcClaims", {}).get("orcid", None),
+            },
+        },
+    }
+
+
+def get_proposals(
+    client: Client,
+    access_groups: list[str],
+    *,
+    filter_on_server: bool = True,
+    batch_size: int = 100,
+    page_size: int = 500,
+    cache: ScicatCache | None = None,
+) -> list[ProposalOverview]:
+    """Download the proposals that match the given access groups.
+
+    This assumes that access groups match proposal IDs (the case at ESS).
+
+    If ``filter_on_server`` is true, only the matching proposals are requested
+    from SciCat, see :func:`iter_proposals`.
+    If this fails, e.g., because SciCat does not support the filter,
+    all proposals are downloaded and filtered locally.
+    """
+    if cache is not None:
+        url = client.profile.url
+        cached = _get_cached_proposals(
+            cache, url, _cache_user(client), access_groups, allow_stale=False
+        )
+        if cached is not None:
+            return cached
+        proposals = get_proposals(
+            client,
+            access_groups,
+            filter_on_server=filter_on_server,
+            batch_size=batch_size,
+            page_size=page_size,
+        )
+        cache.put(
+            "proposals",
+            {
+                "accessGroups": sorted(access_groups),
+                "proposals": [p.model_dump(mode="json") for p in proposals],
+            },
+            url=url,
+            user=_cache_user(client),
+        )
+        return proposals
+
+    wanted = set(access_groups)
+    if filter_on_server:
+        try:
+            return [
+                _make_proposal_overview(p)
+                for p in iter_proposals(
+                    client, access_groups, batch_size=batch_size, page_size=page_size
+                )
+                # SciCat may ignore the filter, so check again:
+                if p["proposalId"] in wanted
+            ]
+        except ScicatCommError as error:
+            get_logger().warning(
+                "Failed to download filtered proposals, "
+                "falling back to downloading all proposals: %s",
+                error,
+            )
+
+    all_proposals = _timed(
+        "get_all_proposals",
+        client.scicat.call_endpoint,
+        cmd="GET",
+        url="proposals",
+        operation="get_proposals",
     )
     # the API call returns all proposals, select only the ones the user has access to:
-    # assuming the access groups match proposals (the case at ESS)
     return [
-        ProposalOverview(
-            id_=p["proposalId"],
-            title=p["title"],
-            start_time=p["startTime"],
-            instrument_ids=p["instrumentIds"],
-            pi_name=_combine_pi_name(p),
-            pi_email=p.get("pi_email", None),
-            type=p.get("type", None),
-        )
-        for p in proposals
-        if p["proposalId"] in access_groups
+        _make_proposal_overview(p) for p in all_proposals if p["proposalId"] in wanted
     ]
 
 
-def _combine_pi_name(proposal: dict[str, str]) -> str | None:
+def iter_proposals(
+    client: Client,
+    proposal_ids: Sequence[str],
+    *,
+    batch_size: int = 100,
+    page_size: int = 500,
+) -> Iterator[dict[str, Any]]:
+    """Download proposals with the given IDs from SciCat.
+
+    The IDs are split into batches of at most ``batch_size`` to keep URLs short.
+    Results for each batch are requested in pages of ``page_size`` proposals.
+
+    Yields
+    ------
+    :
+        Raw JSON of one proposal at a time.
+    """
+    return _iter_matching(
+        client,
+        url="proposals",
+        operation="get_proposals",
+        field="proposalId",
+        values=proposal_ids,
+        batch_size=batch_size,
+        page_size=page_size,
+    )
+
+
+def iter_orig_datablocks(
+    client: Client,
+    checksums: Sequence[str],
+    *,
+    batch_size: int = 100,
+    page_size: int = 500,
+) -> Iterator[dict[str, Any]]:
+    """Download orig datablocks that contain files with the given checksums.
+
+    Only datablocks that the user has access to are returned.
+    Checksums are split into batches and results are paged
+    like in :func:`iter_proposals`.
+
+    Yields
+    ------
+    :
+        Raw JSON of one orig datablock at a time.
+    """
+    return _iter_matching(
+        client,
+        url="origdatablocks",
+        operation="get_orig_datablocks",
+        field="dataFileList.chk",
+        values=checksums,
+        batch_size=batch_size,
+        page_size=page_size,
+    )
+
+
+def get_source_folder(client: Client, pid: PID) -> RemotePath | None:
+    """Download the source folder of a dataset."""
+    dataset = _timed("get_dataset", client.scicat.get_dataset_model, pid)
+    return dataset.sourceFolder
+
+
+def _iter_matching(
+    client: Client,
+    *,
+    url: str,
+    operation: str,
+    field: str,
+    values: Sequence[str],
+    batch_size: int,
+    page_size: int,
+) -> Iterator[dict[str, Any]]:
+    for start in range(0, len(values), batch_size):
+        batch = list(values[start : start + batch_size])
+        skip = 0
+        previous: list[dict[str, Any]] = []
+        while True:
+            page = _timed(
+                f"{operation}_page",
+                client.scicat.call_endpoint,
+                cmd="GET",
+                url=url,
+                operation=operation,
+                params={
+                    "filter": json.dumps(
+                        {
+                            "where": {field: {"$in": batch}},
+                            "limits": {"skip": skip, "limit": page_size},
+                        }
+                    )
+                },
+            )
+            # Servers that ignore the filter would make this loop forever.
+            if len(page) > page_size or (skip > 0 and page == previous):
+                raise ScicatCommError(
+                    f"SciCat ignored the filter or limits when requesting {url}"
+                )
+            yield from page
+            if len(page) < page_size:
+                break
+            skip += page_size
+            previous = page
+
+
+def _get_cached_proposals(
+    cache: ScicatCache,
+    url: str,
+    user: str,
+    access_groups: list[str],
+    *,
+    allow_stale: bool,
+) -> list[ProposalOverview] | None:
+    cached = cache.get("proposals", url=url, user=user, allow_stale=allow_stale)
+    if cached is None or cached["accessGroups"] != sorted(access_groups):
+        return None
+    return [ProposalOverview.model_validate(p) for p in cached["proposals"]]
+
+
+def _make_proposal_overview(proposal: dict[str, Any]) -> ProposalOverview:
+    return ProposalOverview(
+        id_=proposal["proposalId"],
+        title=proposal["title"],
+        start_time=proposal["startTime"],
+        instrument_ids=proposal["instrumentIds"],
+        pi_name=_combine_pi_name(proposal),
+        pi_email=proposal.get("pi_email", None),
+        type=proposal.get("type", None),
+    )
+
+
+def _combine_pi_name(proposal: dict[str, Any]) -> str | None:
     if (pi_firstname := proposal.get("pi_firstname")) is None:
         return None
     if (pi_lastname := proposal.get("pi_lastname")) is None:
@@ -66,13 +378,37 @@ def _combine_pi_name(proposal: dict[str, str]) -> str | None:
     return f"{pi_firstname} {pi_lastname}"
 
 
-def get_instruments(client: Client) -> list[Instrument]:
+def get_instruments(
+    client: Client, *, cache: ScicatCache | None = None
+) -> list[Instrument]:
+    if cache is not None:
+        url = client.profile.url
+        if (cached := cache.get("instruments", url=url)) is not None:
+            return _load_instruments(cached)
+        models = client.scicat.get_all_instrument_models()
+        cache.put("instruments", [m.model_dump(mode="json") for m in models], url=url)
+    else:
+        models = client.scicat.get_all_instrument_models()
+    return [Instrument.from_download_model(instrument) for instrument in models]
+
+
+def _load_instruments(cached: list[dict[str, Any]]) -> list[Instrument]:
     return [
-        Instrument.from_download_model(instrument)
-        for instrument in client.scicat.get_all_instrument_models()
+        Instrument.from_download_model(model.DownloadInstrument.model_validate(i))
+        for i in cached
     ]
 
 
+def _cache_user(client: Client) -> str:
+    # Cached user data is keyed by the token because the SciCat user is only
+    # known after downloading the identity.
+    # Only a hash is used as the key is stored in the cache.
+    token = getattr(client.scicat, "_token", None)
+    if token is None:
+        return ""
+    return hashlib.sha256(token.get_str().encode()).hexdigest()
+
+
 def _maybe_parse_orcid_id(orcid_id: str | None) -> str | None:
     if orcid_id is None:
         return None
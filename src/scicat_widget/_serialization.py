@@ -5,14 +5,16 @@
 
 import os
 import warnings
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import Any, cast
 
 from scitacean import Attachment, Dataset, File
-from scitacean.ontology import expands_techniques
 
-from ._filesystem import inspect_file
+from ._filesystem import inspect_files
 from ._model import Instrument, ProposalOverview
+from ._techniques import get_technique_index
 
 
 def serialize_instrument(instrument: Instrument) -> dict[str, Any]:
@@ -37,20 +39,30 @@ def serialize_proposal(proposal: ProposalOverview) -> dict[str, Any]:
     }
 
 
-def load_and_serialize_techniques() -> dict[str, Any]:
-    """Load the ExPaNDS techniques and serialize them for the JavaScript widget."""
-    prefix = next(iter(expands_techniques().keys())).rsplit("/", 1)[0]
+def load_and_serialize_techniques(ids: Iterable[str] | None = None) -> dict[str, Any]:
+    """Load the ExPaNDS techniques and serialize them for the JavaScript widget.
+
+    If ``ids`` is given, only the techniques with those IDs are included.
+    The widget can find other techniques with a ``req:search-techniques`` message.
+    """
+    index = get_technique_index()
     return {
-        "prefix": prefix,
-        "techniques": [
-            {"id": id_.rsplit("/", 1)[-1], "name": names[0]}
-            for (id_, names) in expands_techniques().items()
-        ],
+        "prefix": index.prefix,
+        "techniques": (
+            index.search("", limit=len(index)) if ids is None else index.lookup(ids)
+        ),
     }
 
 
-def serialize_dataset(dataset: Dataset) -> dict[str, Any]:
-    """Serialize a Scitacean dataset to a dict for the JavaScript widget."""
+def serialize_dataset(
+    dataset: Dataset, *, include_files: bool = True
+) -> dict[str, Any]:
+    """Serialize a Scitacean dataset to a dict for the JavaScript widget.
+
+    If ``include_files`` is false, the files are not serialized.
+    Use :func:`local_files` and :func:`iter_serialized_files` to serialize
+    them separately, e.g., to send them to the widget in chunks.
+    """
     set = {
         key: val for key, val in dataset.make_upload_fields().items() if val is not None
     }
@@ -67,11 +79,8 @@ def serialize_dataset(dataset: Dataset) -> dict[str, Any]:
 
     set = _listify_owners(set)
 
-    set["files"] = [
-        set_file
-        for file in dataset.files
-        if (set_file := _serialize_file(file)) is not None
-    ]
+    if include_files:
+        set["files"] = list(iter_serialized_files(local_files(dataset.files)))
 
     set["attachments"] = [
         set_att
@@ -81,25 +90,49 @@ def serialize_dataset(dataset: Dataset) -> dict[str, Any]:
     return set
 
 
-def _serialize_file(file: File) -> dict[str, str | int | datetime] | None:
-    if file.local_path is None:
-        return None
-    for name in ("remote_gid", "remote_perm", "remote_uid"):
-        if value := getattr(file, name):
-            warnings.warn(
-                f"file.{name} will be dropped in upload; input has value '{value}'",
-                UserWarning,
-                stacklevel=2,
-            )
-    result = inspect_file(file.local_path)
-    if not result:
-        return None
-    result.pop("success", None)
-    return {
-        **result,
-        "localPath": os.fspath(file.local_path),
-        "remotePath": file.remote_path.posix,
-    }
+def local_files(files: Iterable[File]) -> list[File]:
+    """Return the files that have a local path.
+
+    Emits a single warning for all files with remote ownership or permissions
+    because those are dropped by the widget.
+    """
+    local = [file for file in files if file.local_path is not None]
+    dropped: dict[str, int] = {}
+    example = None
+    for file in local:
+        for name in ("remote_gid", "remote_perm", "remote_uid"):
+            if getattr(file, name):
+                dropped[name] = dropped.get(name, 0) + 1
+                example = example or file
+    if example is not None:
+        counts = ", ".join(f"file.{name} of {n} file(s)" for name, n in dropped.items())
+        warnings.warn(
+            f"The widget drops {counts} in upload, e.g., of '{example.local_path}'",
+            UserWarning,
+            stacklevel=3,
+        )
+    return local
+
+
+def iter_serialized_files(
+    files: Sequence[File], *, max_workers: int = 16
+) -> Iterator[dict[str, str | int | bool | datetime]]:
+    """Serialize local files for the JavaScript widget.
+
+    Files are inspected concurrently, those that cannot be inspected are skipped.
+    Results are yielded in the order of ``files``.
+    """
+    # Local paths are already `Path` objects, avoid parsing them again.
+    paths = (cast(Path, file.local_path) for file in files)
+    results = inspect_files(paths, max_workers=max_workers)
+    for file, result in zip(files, results, strict=True):
+        if not result.pop("success", False):
+            continue
+        yield {
+            **result,
+            "localPath": os.fspath(file.local_path),  # type: ignore[arg-type]
+            "remotePath": file.remote_path.posix,
+        }
 
 
 def _serialize_attachment(attachment: Attachment) -> dict[str, str] | None:
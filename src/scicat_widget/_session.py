@@ -0,0 +1,287 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""State that is shared by all widgets of a client."""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from scitacean import Client, ScicatCommError
+
+# Not great but this keeps error messages consistent with Scitacean.
+from scitacean.client import ScicatClient, _strip_token
+
+from ._cache import ScicatCache
+from ._field_factories import FieldFactories
+from ._logging import get_logger
+from ._model import Config, Instrument, ProposalOverview, UserInfo
+from ._scicat_api import get_cached_user_and_scicat_info, get_user_and_scicat_info
+from ._serialization import serialize_instrument, serialize_proposal
+
+if TYPE_CHECKING:
+    import pydantic
+
+ScicatData = tuple[dict[str, Any], dict[str, Any]]
+"""Initial data and static data for widgets."""
+
+# Sessions are kept alive by their widgets.
+_SESSIONS: weakref.WeakValueDictionary[
+    tuple[Client, ScicatCache | None], ScicatSession
+] = weakref.WeakValueDictionary()
+_SESSIONS_LOCK = threading.Lock()
+
+DOWNLOAD_ERRORS = (ScicatCommError, ValueError, TypeError, RuntimeError)
+"""Errors that indicate a failure to download data from SciCat."""
+
+
+class ScicatSession:
+    """Data and connections that are shared by all widgets of a client.
+
+    The widget config and the data downloaded from SciCat are computed once
+    and reused by every widget that is created with the same client.
+    All SciCat requests of the session use one pool of HTTP connections.
+
+    Use :meth:`for_client` to get the shared session of a client.
+
+    Parameters
+    ----------
+    client:
+        Client for SciCat and the file server.
+    cache:
+        Cache for data downloaded from SciCat.
+    """
+
+    def __init__(self, client: Client, *, cache: ScicatCache | None = None) -> None:
+        self._close_http: Callable[[], None] | None = None
+        # Only real clients are wrapped, fakes for testing don't send requests.
+        if type(client.scicat) is ScicatClient:
+            scicat = _PooledScicatClient(client.scicat)
+            client = Client(
+                client=scicat,
+                file_transfer=client.file_transfer,
+                profile=client.profile,
+            )
+            self._close_http = weakref.finalize(self, scicat.http.close)
+        self.client = client
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._data: Future[ScicatData] | None = None
+        self._listeners: list[weakref.WeakMethod[Callable[[], None]]] = []
+
+    @classmethod
+    def for_client(
+        cls, client: Client, *, cache: ScicatCache | bool = True
+    ) -> ScicatSession:
+        """Return the session that is shared by all widgets of ``client``.
+
+        Each cache gets a separate session.
+        ``cache=True`` uses the default cache and ``cache=False`` disables caching
+        like in :class:`DatasetUploadWidget`.
+        A new session is created when no widget uses the session anymore.
+        """
+        resolved = _resolve_cache(cache)
+        with _SESSIONS_LOCK:
+            if (session := _SESSIONS.get((client, resolved))) is None:
+                session = _SESSIONS[client, resolved] = cls(client, cache=resolved)
+            return session
+
+    @cached_property
+    def field_factories(self) -> FieldFactories:
+        """The field factories of the client's profile."""
+        return FieldFactories(self.client.profile.field_factories)
+
+    def config(self, *, locked: Iterable[str], skip_confirm: bool) -> dict[str, Any]:
+        """Return the config of a widget."""
+        return {
+            **self._profile_config,
+            "lockedFields": list(locked),
+            "skipConfirmation": skip_confirm,
+        }
+
+    @cached_property
+    def _profile_config(self) -> dict[str, Any]:
+        profile = self.client.profile
+        return Config(
+            frontendUrl=profile.frontend_url,
+            scientificMetadataSchema=profile.scientific_metadata_schema,
+            fieldDependencies=self.field_factories.dependencies(),
+            lockedFields=[],
+            skipConfirmation=False,
+        ).model_dump()
+
+    @property
+    def scicat_data_loaded(self) -> bool:
+        """Whether data from SciCat has been downloaded."""
+        with self._lock:
+            return self._data is not None and self._data.done()
+
+    def scicat_data(self) -> ScicatData:
+        """Return data from SciCat for widgets.
+
+        The data is downloaded on first use, concurrent callers wait for
+        the same download.
+        Failed downloads are not stored and are retried on the next call.
+
+        Raises
+        ------
+        ScicatCommError | ValueError | TypeError | RuntimeError
+            If the data cannot be downloaded, see :data:`DOWNLOAD_ERRORS`.
+        """
+        with self._lock:
+            download = self._data is None
+            if self._data is None:
+                self._data = Future()
+            future = self._data
+        if download:
+            try:
+                future.set_result(_collect_scicat_data(self.client, self.cache))
+            except Exception as error:
+                with self._lock:
+                    # Try again the next time the data is requested.
+                    if self._data is future:
+                        self._data = None
+                future.set_exception(error)
+        return future.result()
+
+    def cached_scicat_data(self) -> ScicatData | None:
+        """Return data from the cache, regardless of its age."""
+        if self.cache is None:
+            return None
+        try:
+            cached = get_cached_user_and_scicat_info(self.client, self.cache)
+        except (KeyError, ValueError, TypeError) as error:
+            get_logger().warning("Failed to load cached data: %s", error)
+            return None
+        if cached is None:
+            return None
+        user_info, instruments = cached
+        return make_initial_data(user_info), make_static_data(
+            instruments, user_info.proposals, user_info.access_groups
+        )
+
+    def refresh(self) -> None:
+        """Download data from SciCat again and update all widgets of this session.
+
+        This bypasses and updates the cache.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(url=self.client.profile.url)
+        with self._lock:
+            self._data = None
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            listeners = [ref() for ref in self._listeners]
+        for listener in listeners:
+            if listener is not None:
+                listener()
+
+    def on_refresh(self, callback: Callable[[], None]) -> None:
+        """Call a bound method when the session is refreshed.
+
+        Only a weak reference to the method's object is kept.
+        """
+        with self._lock:
+            self._listeners.append(weakref.WeakMethod(callback))
+
+    def close(self) -> None:
+        """Close the HTTP connections of the session."""
+        if self._close_http is not None:
+            self._close_http()
+
+
+class _PooledScicatClient(ScicatClient):
+    """Scitacean client that sends all requests through one HTTP client.
+
+    Scitacean opens a new connection for every request otherwise.
+    """
+
+    def __init__(self, client: ScicatClient) -> None:
+        # Share the token storage so that both clients use the same token.
+        super().__init__(
+            url=client._base_url, token=client._token, timeout=client._timeout
+        )
+        self.http = httpx.Client()
+
+    def _send_to_scicat(
+        self,
+        *,
+        cmd: str,
+        url: str,
+        data: pydantic.BaseModel | None = None,
+        params: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        # Same as in Scitacean except for the HTTP client.
+        if self._token is not None:
+            token = self._token.get_str()
+            headers = {"Authorization": f"Bearer {token}"}
+        else:
+            token = ""
+            headers = {}
+
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+            serialized_data = data.model_dump_json(exclude_none=True)
+        else:
+            serialized_data = None
+
+        try:
+            return self.http.request(
+                method=cmd,
+                url=url,
+                content=serialized_data,
+                params=params,
+                headers=headers,
+                timeout=self._timeout.seconds,
+            )
+        except Exception as exc:
+            # Hide the token, see Scitacean.
+            raise type(exc)(
+                *tuple(_strip_token(arg, token) for arg in exc.args)
+            ) from None
+
+
+def _resolve_cache(cache: ScicatCache | bool) -> ScicatCache | None:
+    match cache:
+        case ScicatCache():
+            return cache
+        case True:
+            return ScicatCache.default()
+        case _:
+            return None
+
+
+def _collect_scicat_data(client: Client, cache: ScicatCache | None) -> ScicatData:
+    user_info, instruments = get_user_and_scicat_info(client, cache=cache)
+    return make_initial_data(user_info), make_static_data(
+        instruments, user_info.proposals, user_info.access_groups
+    )
+
+
+def make_static_data(
+    instruments: list[Instrument],
+    proposals: list[ProposalOverview],
+    access_groups: list[str],
+) -> dict[str, Any]:
+    return {
+        "instruments": [serialize_instrument(instrument) for instrument in instruments],
+        "proposals": [serialize_proposal(proposal) for proposal in proposals],
+        "accessGroups": access_groups,
+    }
+
+
+def make_initial_data(user_info: UserInfo) -> dict[str, Any]:
+    return {
+        "owners": [
+            {
+                "name": user_info.display_name,
+                "email": user_info.email,
+                "orcid": user_info.orcid_id,
+            },
+        ],
+    }
@@ -0,0 +1,187 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Statistics on message handling and SciCat calls."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cache, wraps
+from typing import Any, ParamSpec, TypeVar
+
+from ._logging import get_stats_logger
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+# Upper bounds of latency histogram buckets in seconds.
+# The last bucket holds everything above the last bound.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+
+@dataclass(slots=True)
+class OperationStats:
+    """Statistics of one kind of operation, e.g., one message type."""
+
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.count if self.count else 0.0,
+            "max_seconds": self.max_seconds,
+            "histogram": {
+                _bucket_label(i): n for i, n in enumerate(self.histogram) if n
+            },
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+class StatsRecorder:
+    """Thread-safe collection of :class:`OperationStats` by name.
+
+    Callers only record payload sizes if :attr:`measure_bytes` is true
+    because measuring messages is as expensive as serializing them.
+    """
+
+    def __init__(self) -> None:
+        self._operations: dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+        self._log_timer: threading.Timer | None = None
+        self.measure_bytes = False
+
+    def record_call(self, name: str, seconds: float, *, error: bool = False) -> None:
+        """Record one call of an operation that took ``seconds``."""
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._get(name)
+            stats.count += 1
+            stats.errors += error
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.histogram[bucket] += 1
+
+    def record_bytes(self, name: str, *, bytes_in: int = 0, bytes_out: int = 0) -> None:
+        """Record the size of payloads received or sent by an operation."""
+        with self._lock:
+            stats = self._get(name)
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Record the duration of the body of the ``with`` statement."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record_call(name, time.perf_counter() - start, error=error)
+
+    def snapshot(self, *, reset: bool = False) -> dict[str, dict[str, Any]]:
+        """Return the current statistics by operation name."""
+        with self._lock:
+            result = {
+                name: stats.serialize()
+                for name, stats in sorted(self._operations.items())
+            }
+            if reset:
+                self._operations.clear()
+        return result
+
+    def format_line(self) -> str:
+        """Return a one-line summary of the statistics."""
+        parts = [
+            f"{name}: n={s['count']} mean={s['mean_seconds'] * 1000:.1f}ms "
+            f"max={s['max_seconds'] * 1000:.1f}ms"
+            + (f" in={s['bytes_in']}B" if s["bytes_in"] else "")
+            + (f" out={s['bytes_out']}B" if s["bytes_out"] else "")
+            for name, s in self.snapshot().items()
+            if s["count"] or s["bytes_in"] or s["bytes_out"]
+        ]
+        return "; ".join(parts) if parts else "no calls"
+
+    def log_every(self, seconds: float | None) -> None:
+        """Log a summary every ``seconds`` and measure payload sizes meanwhile.
+
+        Pass ``None`` to stop logging.
+        """
+        with self._lock:
+            if self._log_timer is not None:
+                self._log_timer.cancel()
+                self._log_timer = None
+            self.measure_bytes = seconds is not None
+            if seconds is not None:
+                self._schedule_log(seconds)
+
+    def _schedule_log(self, seconds: float) -> None:
+        # Requires self._lock
+        self._log_timer = threading.Timer(seconds, self._log_and_reschedule, (seconds,))
+        self._log_timer.daemon = True
+        self._log_timer.start()
+
+    def _log_and_reschedule(self, seconds: float) -> None:
+        get_stats_logger().info("Widget stats: %s", self.format_line())
+        with self._lock:
+            if self._log_timer is not None:
+                self._schedule_log(seconds)
+
+    def _get(self, name: str) -> OperationStats:
+        # Requires self._lock
+        if (stats := self._operations.get(name)) is None:
+            stats = self._operations[name] = OperationStats()
+        return stats
+
+
+@cache
+def get_stats() -> StatsRecorder:
+    """Return the process-wide statistics recorder."""
+    return StatsRecorder()
+
+
+def timed(name: str) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
+    """Record the duration of each call of the decorated function."""
+
+    def decorator(func: Callable[_P, _R]) -> Callable[_P, _R]:
+        @wraps(func)
+        def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            with get_stats().timed(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def payload_size(content: Any, buffers: Any = None) -> int:
+    """Estimate the size in bytes of a message with optional binary buffers."""
+    size = len(json.dumps(content, default=str))
+    for buffer in buffers or ():
+        size += memoryview(buffer).nbytes
+    return size
+
+
+def _bucket_label(index: int) -> str:
+    if index == len(LATENCY_BUCKETS):
+        return f">{LATENCY_BUCKETS[-1]:g}s"
+    return f"<={LATENCY_BUCKETS[index]:g}s"
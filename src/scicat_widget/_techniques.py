@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Search in the ExPaNDS techniques ontology."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    id_: str
+    name: str
+    # Lowercase ID and all labels of the technique.
+    search_terms: tuple[str, ...]
+
+
+class TechniqueIndex:
+    """Index of techniques for searching by ID or label.
+
+    Parameters
+    ----------
+    techniques:
+        Mapping from technique IRIs to labels where the first label is the
+        primary one, as returned by :func:`scitacean.ontology.expands_techniques`.
+    """
+
+    def __init__(self, techniques: dict[str, list[str]]) -> None:
+        self.prefix = next(iter(techniques.keys())).rsplit("/", 1)[0]
+        self._entries = sorted(
+            (
+                _Entry(
+                    id_=(id_ := iri.rsplit("/", 1)[-1]),
+                    name=names[0],
+                    search_terms=(id_.lower(), *(name.lower() for name in names)),
+                )
+                for iri, names in techniques.items()
+            ),
+            key=lambda entry: entry.id_,
+        )
+        self._by_id = {entry.id_: entry for entry in self._entries}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, query: str, *, limit: int = 20) -> list[dict[str, str]]:
+        """Return up to ``limit`` techniques that match a query.
+
+        Exact matches of an ID or label come first, followed by prefix matches
+        of an ID, label, or word in a label, followed by substring matches.
+        Within each group, techniques are sorted by name.
+        An empty query matches all techniques.
+        """
+        query = query.strip().lower()
+        if not query:
+            return [_serialize(entry) for entry in self._entries[:limit]]
+
+        ranked = [
+            (rank, entry.name, entry)
+            for entry in self._entries
+            if (rank := _rank(entry, query)) is not None
+        ]
+        ranked.sort(key=lambda item: item[:2])
+        return [_serialize(entry) for _, _, entry in ranked[:limit]]
+
+    def lookup(self, ids: Iterable[str]) -> list[dict[str, str]]:
+        """Return the techniques with the given IDs, ignoring unknown IDs."""
+        return [_serialize(entry) for id_ in ids if (entry := self._by_id.get(id_))]
+
+
+@cache
+def get_technique_index() -> TechniqueIndex:
+    """Return the process-wide index of ExPaNDS techniques.
+
+    The index is built on first use.
+    """
+    from scitacean.ontology import expands_techniques
+
+    return TechniqueIndex(expands_techniques())
+
+
+def _rank(entry: _Entry, query: str) -> int | None:
+    if query in entry.search_terms:
+        return 0
+    if any(_has_word_prefix(term, query) for term in entry.search_terms):
+        return 1
+    if any(query in term for term in entry.search_terms):
+        return 2
+    return None
+
+
+def _has_word_prefix(term: str, query: str) -> bool:
+    return term.startswith(query) or f" {query}" in term
+
+
+def _serialize(entry: _Entry) -> dict[str, str]:
+    return {"id": entry.id_, "name": entry.name}
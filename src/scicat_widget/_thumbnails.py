@@ -0,0 +1,181 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""Create size-limited thumbnails from image files."""
+
+from __future__ import annotations
+
+import io
+import mimetypes
+import os
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, cast
+
+from scitacean import Thumbnail
+
+from ._logging import get_logger
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+@dataclass(frozen=True, slots=True)
+class ThumbnailConfig:
+    """Limits for thumbnails of attachments.
+
+    Images that exceed these limits are downscaled and recompressed.
+    This requires `Pillow <https://python-pillow.org/>`_, install it with
+    ``pip install scicat_widget[thumbnails]``.
+    Without Pillow, images are used as they are.
+
+    Parameters
+    ----------
+    max_dimension:
+        Maximum width and height in pixels.
+    max_bytes:
+        Maximum size of the encoded image in bytes (before base64 encoding).
+        This is a best effort, the quality and dimensions are only reduced
+        down to a point.
+    """
+
+    max_dimension: int = 1024
+    max_bytes: int = 512 * 1024
+
+
+def load_thumbnail(path: Path, config: ThumbnailConfig | None = None) -> Thumbnail:
+    """Load an image file as a thumbnail within the limits of ``config``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    mime, data = load_image(path, config)
+    return Thumbnail(mime=mime, data=data)
+
+
+def load_image(
+    path: Path, config: ThumbnailConfig | None = None
+) -> tuple[str | None, bytes]:
+    """Load an image file within the limits of ``config``.
+
+    Downscaled images are cached by path, modification time, and limits.
+
+    Returns
+    -------
+    :
+        The MIME type and raw bytes of the image.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    config = config if config is not None else ThumbnailConfig()
+    st = path.stat()
+    shrunk = _shrink_cached(os.fspath(path), st.st_mtime_ns, st.st_size, config)
+    # Unchanged images are read again instead of being cached because
+    # they can be arbitrarily large if Pillow is missing or cannot read them.
+    return shrunk if shrunk is not None else _read_unchanged(os.fspath(path))
+
+
+@lru_cache(maxsize=64)
+def _shrink_cached(
+    path: str, _mtime_ns: int, size: int, config: ThumbnailConfig
+) -> tuple[str, bytes] | None:
+    # The modification time is only part of the cache key.
+    # Returns None if the image should be used unchanged.
+    if (pil_image := _import_pillow()) is None:
+        _warn_no_pillow()
+        return None
+
+    try:
+        with pil_image.open(path) as image:
+            if size <= config.max_bytes and max(image.size) <= config.max_dimension:
+                return None
+            return _shrink(image, config)
+    except FileNotFoundError:
+        raise
+    except (OSError, ValueError) as error:
+        # OSError includes unsupported image formats,
+        # ValueError is raised for image modes that Pillow cannot resize.
+        get_logger().warning("Cannot downscale image %s: %s", path, error)
+        return None
+
+
+@cache
+def _import_pillow() -> ModuleType | None:
+    # Pillow is slow to import and only needed once an image is downscaled.
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def _read_unchanged(path: str) -> tuple[str | None, bytes]:
+    return mimetypes.guess_type(path)[0], Path(path).read_bytes()
+
+
+def _shrink(image: Image.Image, config: ThumbnailConfig) -> tuple[str, bytes]:
+    image = _to_8bit(image)
+    image.thumbnail((config.max_dimension, config.max_dimension))
+    # JPEG is much smaller for photos and detector images,
+    # but cannot store transparency.
+    if image.mode in ("RGBA", "LA", "P") and _has_alpha(image):
+        return "image/png", _encode_png(image, config)
+    return "image/jpeg", _encode_jpeg(image.convert("RGB"), config)
+
+
+def _to_8bit(image: Image.Image) -> Image.Image:
+    # Detector images are often 16-bit or floating point greyscale.
+    # Pillow cannot resize those, so stretch their range to 8 bits.
+    if image.mode not in ("I;16", "I;16B", "I;16L", "I", "F"):
+        return image
+    image = image.convert("F")
+    # Single band images have a single pair of extrema.
+    low, high = cast("tuple[float, float]", image.getextrema())
+    scale = 255 / (high - low) if high > low else 0
+    return image.point(lambda v: v * scale - low * scale).convert("L")
+
+
+def _encode_png(image: Image.Image, config: ThumbnailConfig) -> bytes:
+    data = _save(image, format="PNG", optimize=True)
+    while len(data) > config.max_bytes and max(image.size) > 64:
+        image = image.resize((image.width // 2, image.height // 2))
+        data = _save(image, format="PNG", optimize=True)
+    return data
+
+
+def _encode_jpeg(image: Image.Image, config: ThumbnailConfig) -> bytes:
+    for quality in (85, 70, 50):
+        data = _save(image, format="JPEG", quality=quality, optimize=True)
+        if len(data) <= config.max_bytes:
+            return data
+    while len(data) > config.max_bytes and max(image.size) > 64:
+        image = image.resize((image.width // 2, image.height // 2))
+        data = _save(image, format="JPEG", quality=50, optimize=True)
+    return data
+
+
+def _save(image: Image.Image, **kwargs: object) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, **kwargs)  # type: ignore[arg-type]
+    return buffer.getvalue()
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    if image.mode == "P":
+        return "transparency" in image.info
+    return True
+
+
+@lru_cache(maxsize=1)
+def _warn_no_pillow() -> None:
+    get_logger().warning(
+        "Pillow is not installed, images are attached without downscaling. "
+        "Install it with `pip install scicat_widget[thumbnails]`."
+    )
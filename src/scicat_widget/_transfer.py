@@ -0,0 +1,456 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
+
+"""File transfer wrapper that reports progress and supports cancellation."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from scitacean import Dataset, File, RemotePath
+from scitacean.typing import FileTransfer, UploadConnection
+
+from ._logging import get_logger
+
+if TYPE_CHECKING:
+    from ._journal import UploadJournal
+
+
+class UploadCancelledError(Exception):
+    """Raised when an upload was cancelled by the user."""
+
+
+@dataclass(frozen=True, slots=True)
+class TransferConfig:
+    """Configuration of file uploads.
+
+    Parameters
+    ----------
+    workers:
+        Number of files or batches of files to upload concurrently.
+        Each worker opens its own connection to the file server.
+        With a single worker, files are uploaded sequentially.
+    max_in_flight_bytes:
+        Maximum number of bytes that are being uploaded at the same time.
+        A file that is larger than this is uploaded on its own.
+    small_file_size:
+        Files smaller than this many bytes are uploaded in batches
+        of up to ``small_file_size`` bytes in total.
+    max_batch_files:
+        Maximum number of files in a batch.
+    reuse_existing_files:
+        If true, SciCat is searched for files with the same checksum and size
+        as the files to upload.
+        Those files are not transferred again, instead, the new dataset refers
+        to the existing copies in the source folders of the other datasets.
+        Disabled by default because the orig datablock of the new dataset then
+        contains absolute paths outside of its own source folder.
+        The reused files are only available as long as the other datasets keep
+        them, and readers need access to those datasets' folders.
+    """
+
+    workers: int = 1
+    max_in_flight_bytes: int = 1024**3
+    small_file_size: int = 4 * 1024**2
+    max_batch_files: int = 64
+    reuse_existing_files: bool = False
+
+    def __post_init__(self) -> None:
+        if self.workers < 1:
+            raise ValueError(f"workers must be at least 1, got {self.workers}")
+        if self.max_in_flight_bytes < 1:
+            raise ValueError(
+                f"max_in_flight_bytes must be positive, got {self.max_in_flight_bytes}"
+            )
+        if self.max_batch_files < 1:
+            raise ValueError(
+                f"max_batch_files must be at least 1, got {self.max_batch_files}"
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class UploadProgress:
+    """Progress of a file upload."""
+
+    bytes_done: int
+    bytes_total: int
+    files_done: int
+    files_total: int
+    current_file: str | None
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            "bytesDone": self.bytes_done,
+            "bytesTotal": self.bytes_total,
+            "filesDone": self.files_done,
+            "filesTotal": self.files_total,
+            "currentFile": self.current_file,
+        }
+
+
+class ProgressFileTransfer:
+    """Wrap a file transfer to report progress and support cancellation.
+
+    Depending on ``config``, files are uploaded one at a time or in batches
+    by multiple workers.
+    ``on_progress`` is called before the first file is uploaded and after
+    each uploaded file or batch.
+    ``cancel`` is checked before each file or batch.
+    When it is set, all files uploaded so far are reverted and
+    :class:`UploadCancelledError` is raised.
+
+    If a ``journal`` is given, every uploaded file is recorded in it and files
+    that the journal records as uploaded are not uploaded again.
+    Uploaded files are kept when the upload fails so that it can be resumed.
+    Without a journal, they are reverted instead.
+
+    Downloads are forwarded to the wrapped transfer unchanged.
+    """
+
+    def __init__(
+        self,
+        transfer: FileTransfer,
+        *,
+        on_progress: Callable[[UploadProgress], None],
+        cancel: threading.Event,
+        config: TransferConfig | None = None,
+        journal: UploadJournal | None = None,
+    ) -> None:
+        self._transfer = transfer
+        self._on_progress = on_progress
+        self._cancel = cancel
+        self._config = config if config is not None else TransferConfig()
+        self._journal = journal
+
+    def source_folder_for(self, dataset: Dataset) -> RemotePath:
+        return self._transfer.source_folder_for(dataset)
+
+    def connect_for_download(
+        self, dataset: Dataset, representative_file_path: RemotePath
+    ) -> AbstractContextManager[Any]:
+        return self._transfer.connect_for_download(dataset, representative_file_path)
+
+    @contextmanager
+    def connect_for_upload(
+        self, dataset: Dataset, representative_file_path: RemotePath
+    ) -> Iterator[UploadConnection]:
+        with self._transfer.connect_for_upload(
+            dataset, representative_file_path
+        ) as connection:
+            yield _ProgressUploadConnection(
+                connection,
+                connect=lambda: self._transfer.connect_for_upload(
+                    dataset, representative_file_path
+                ),
+                on_progress=self._on_progress,
+                cancel=self._cancel,
+                config=self._config,
+                journal=self._journal,
+            )
+
+
+class _ProgressUploadConnection:
+    def __init__(
+        self,
+        connection: UploadConnection,
+        *,
+        connect: Callable[[], AbstractContextManager[UploadConnection]],
+        on_progress: Callable[[UploadProgress], None],
+        cancel: threading.Event,
+        config: TransferConfig,
+        journal: UploadJournal | None,
+    ) -> None:
+        self._connection = connection
+        self._connect = connect
+        self._on_progress = on_progress
+        self._cancel = cancel
+        self._config = config
+        self._journal = journal
+
+    def upload_files(self, *files: File) -> list[File]:
+        if self._journal is None:
+            return self._upload(files)
+
+        unchanged, changed = self._journal.split_uploaded(files)
+        if changed:
+            # Transfers refuse to overwrite files, so remove outdated ones first.
+            self._connection.revert_upload(*changed)
+            self._journal.record_reverted(changed)
+        skipped = {file.remote_path for file in unchanged}
+        try:
+            uploaded = self._upload(
+                [file for file in files if file.remote_path not in skipped]
+            )
+        except UploadCancelledError:
+            self._connection.revert_upload(*unchanged)
+            raise
+        by_path = {file.remote_path: file for file in (*unchanged, *uploaded)}
+        return [by_path[file.remote_path] for file in files]
+
+    def revert_upload(self, *files: File) -> None:
+        # Transfers revert files by their remote path,
+        # so this also works for files uploaded by worker connections.
+        self._connection.revert_upload(*files)
+        if self._journal is not None:
+            self._journal.record_reverted(files)
+
+    def _upload(self, files: Sequence[File]) -> list[File]:
+        if not files:
+            return []
+        sizes = [file.size for file in files]
+        start = time.perf_counter()
+        if self._config.workers == 1 or len(files) <= 1:
+            uploaded = self._upload_sequential(files, sizes)
+        else:
+            uploaded = self._upload_parallel(files, sizes)
+        _log_throughput(
+            n_files=len(files),
+            n_bytes=sum(sizes),
+            seconds=time.perf_counter() - start,
+            workers=self._config.workers,
+        )
+        return uploaded
+
+    def _record(self, files: Sequence[File]) -> None:
+        if self._journal is not None:
+            self._journal.record_uploaded(files)
+
+    def _upload_sequential(
+        self, files: Sequence[File], sizes: Sequence[int]
+    ) -> list[File]:
+        bytes_total = sum(sizes)
+        bytes_done = 0
+        uploaded: list[File] = []
+        try:
+            for file, size in zip(files, sizes, strict=True):
+                self._on_progress(
+                    UploadProgress(
+                        bytes_done=bytes_done,
+                        bytes_total=bytes_total,
+                        files_done=len(uploaded),
+                        files_total=len(files),
+                        current_file=_display_path(file),
+                    )
+                )
+                if self._cancel.is_set():
+                    raise UploadCancelledError("The upload was cancelled")
+                uploaded.extend(self._connection.upload_files(file))
+                self._record([file])
+                bytes_done += size
+        except Exception:
+            # Keep journaled files after failures to resume the upload later.
+            if self._cancel.is_set() or self._journal is None:
+                self._connection.revert_upload(*uploaded)
+            raise
+
+        self._on_progress(
+            UploadProgress(
+                bytes_done=bytes_done,
+                bytes_total=bytes_total,
+                files_done=len(uploaded),
+                files_total=len(files),
+                current_file=None,
+            )
+        )
+        return uploaded
+
+    def _upload_parallel(
+        self, files: Sequence[File], sizes: Sequence[int]
+    ) -> list[File]:
+        batches = _make_batches(files, sizes, self._config)
+        state = _ParallelState(
+            bytes_total=sum(sizes),
+            files_total=len(files),
+            max_in_flight_bytes=self._config.max_in_flight_bytes,
+        )
+        self._on_progress(state.progress(current_file=None))
+
+        work: queue.Queue[_Batch | None] = queue.Queue()
+        n_workers = min(self._config.workers, len(batches))
+        workers = [
+            threading.Thread(
+                target=self._run_worker,
+                args=(work, state),
+                name=f"scicat-widget-upload-{i}",
+                daemon=True,
+            )
+            for i in range(n_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for batch in batches:
+                if not state.reserve(batch.n_bytes, self._cancel):
+                    break
+                work.put(batch)
+        finally:
+            for _ in workers:
+                work.put(None)
+            for worker in workers:
+                worker.join()
+
+        if state.error is not None:
+            raise state.error
+        if self._cancel.is_set():
+            raise UploadCancelledError("The upload was cancelled")
+        self._on_progress(state.progress(current_file=None))
+        # Keep the input order to make the result independent of scheduling.
+        by_path = {file.remote_path: file for file in state.uploaded}
+        return [by_path[file.remote_path] for file in files]
+
+    def _run_worker(
+        self, work: queue.Queue[_Batch | None], state: _ParallelState
+    ) -> None:
+        uploaded: list[File] = []
+        received_all = False
+        try:
+            with self._connect() as connection:
+                try:
+                    while (batch := work.get()) is not None:
+                        if self._cancel.is_set() or state.error is not None:
+                            state.release(batch.n_bytes)
+                            continue
+                        self._on_progress(
+                            state.progress(current_file=_display_path(batch.files[0]))
+                        )
+                        uploaded.extend(connection.upload_files(*batch.files))
+                        self._record(batch.files)
+                        self._on_progress(state.finish(batch, uploaded[-len(batch) :]))
+                    received_all = True
+                except Exception as error:
+                    state.fail(error)
+                # Keep journaled files after failures to resume the upload later.
+                if self._cancel.is_set() or (
+                    state.error is not None and self._journal is None
+                ):
+                    connection.revert_upload(*uploaded)
+        except Exception as error:
+            state.fail(error)
+        if not received_all:
+            # Drain remaining work so that the producer does not block.
+            while (batch := work.get()) is not None:
+                state.release(batch.n_bytes)
+
+
+@dataclass(slots=True)
+class _Batch:
+    files: list[File]
+    n_bytes: int
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+
+class _ParallelState:
+    def __init__(
+        self, *, bytes_total: int, files_total: int, max_in_flight_bytes: int
+    ) -> None:
+        self.bytes_total = bytes_total
+        self.files_total = files_total
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.bytes_done = 0
+        self.bytes_in_flight = 0
+        self.uploaded: list[File] = []
+        self.error: Exception | None = None
+        self._condition = threading.Condition()
+
+    def reserve(self, n_bytes: int, cancel: threading.Event) -> bool:
+        """Wait until ``n_bytes`` fit into the budget.
+
+        Returns false if the upload was cancelled or failed in the meantime.
+        """
+        with self._condition:
+            while (
+                self.bytes_in_flight > 0
+                and self.bytes_in_flight + n_bytes > self.max_in_flight_bytes
+                and self.error is None
+                and not cancel.is_set()
+            ):
+                # Time out regularly to react to cancellation.
+                self._condition.wait(timeout=0.5)
+            if self.error is not None or cancel.is_set():
+                return False
+            self.bytes_in_flight += n_bytes
+            return True
+
+    def release(self, n_bytes: int) -> None:
+        with self._condition:
+            self.bytes_in_flight -= n_bytes
+            self._condition.notify_all()
+
+    def finish(self, batch: _Batch, uploaded: list[File]) -> UploadProgress:
+        with self._condition:
+            self.bytes_in_flight -= batch.n_bytes
+            self.bytes_done += batch.n_bytes
+            self.uploaded.extend(uploaded)
+            self._condition.notify_all()
+            return self._progress(current_file=None)
+
+    def fail(self, error: Exception) -> None:
+        with self._condition:
+            if self.error is None:
+                self.error = error
+            self._condition.notify_all()
+
+    def progress(self, *, current_file: str | None) -> UploadProgress:
+        with self._condition:
+            return self._progress(current_file=current_file)
+
+    def _progress(self, *, current_file: str | None) -> UploadProgress:
+        return UploadProgress(
+            bytes_done=self.bytes_done,
+            bytes_total=self.bytes_total,
+            files_done=len(self.uploaded),
+            files_total=self.files_total,
+            current_file=current_file,
+        )
+
+
+def _make_batches(
+    files: Sequence[File], sizes: Sequence[int], config: TransferConfig
+) -> list[_Batch]:
+    """Group small files into batches and put large files into their own."""
+    batches: list[_Batch] = []
+    current = _Batch(files=[], n_bytes=0)
+    for file, size in zip(files, sizes, strict=True):
+        if size >= config.small_file_size:
+            batches.append(_Batch(files=[file], n_bytes=size))
+            continue
+        current.files.append(file)
+        current.n_bytes += size
+        if (
+            current.n_bytes >= config.small_file_size
+            or len(current) >= config.max_batch_files
+        ):
+            batches.append(current)
+            current = _Batch(files=[], n_bytes=0)
+    if current.files:
+        batches.append(current)
+    return batches
+
+
+def _log_throughput(
+    *, n_files: int, n_bytes: int, seconds: float, workers: int
+) -> None:
+    get_logger().info(
+        "Uploaded %d files (%d bytes) in %.3fs (%.2f MiB/s) with %d worker(s)",
+        n_files,
+        n_bytes,
+        seconds,
+        n_bytes / 1024**2 / seconds if seconds > 0 else float("inf"),
+        workers,
+    )
+
+
+def _display_path(file: File) -> str:
+    if file.local_path is not None:
+        return str(Path(file.local_path))
+    return file.remote_path.posix
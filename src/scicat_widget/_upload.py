@@ -1,18 +1,109 @@
 from __future__ import annotations
 
-from typing import Any
+import dataclasses
+import os
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from functools import cache
+from pathlib import Path
+from typing import Any, TypeVar
 
 from pydantic import BaseModel, ValidationError
-from scitacean import PID, Client, Dataset, File, Thumbnail, model
+from scitacean import (
+    PID,
+    Client,
+    Dataset,
+    File,
+    RemotePath,
+    ScicatCommError,
+    Thumbnail,
+    model,
+)
+from scitacean.client import _files_to_upload
+from scitacean.typing import FileTransfer
+
+from ._checksum import get_checksum_pipeline
+from ._dedup import ReusedFiles, reuse_existing_files
+from ._filesystem import get_file_metadata_cache
+from ._journal import UploadJournal
+from ._logging import get_logger
+from ._transfer import (
+    ProgressFileTransfer,
+    TransferConfig,
+    UploadCancelledError,
+    UploadProgress,
+)
+
+_M = TypeVar("_M")
+_R = TypeVar("_R")
 
 
 def upload_dataset(
-    client: Client, widget_data: dict[str, object]
+    client: Client,
+    widget_data: dict[str, object],
+    *,
+    on_progress: Callable[[UploadProgress], None] | None = None,
+    cancel: threading.Event | None = None,
+    transfer: TransferConfig | None = None,
+    validator: DatasetValidator | None = None,
+    journal: UploadJournal | None = None,
+    on_reuse: Callable[[ReusedFiles], None] | None = None,
 ) -> Dataset | UploadError:
+    """Upload a dataset constructed from widget data.
+
+    The data is validated locally with a :class:`DatasetValidator` first,
+    and nothing is uploaded if that fails.
+    Pass the ``validator`` of a widget to reuse its converted fields.
+
+    If ``on_progress``, ``cancel``, or ``transfer`` are given, files are uploaded
+    one at a time or in batches as configured by ``transfer``
+    to report progress and check for cancellation in between.
+
+    If a ``journal`` is given, the progress of the upload is recorded in it
+    and steps that the journal records as finished are skipped.
+    The journal is removed when the upload finishes or is cancelled.
+
+    If ``transfer.reuse_existing_files`` is true, ``on_reuse`` is called with
+    the files that SciCat already has and that are not transferred.
+    """
     # TODO check instrument, seem to be NOne
-    dataset = make_dataset_from_widget_data(widget_data)
+    if validator is None:
+        validator = DatasetValidator(client)
+    dataset = validator.validate(widget_data)
+    if isinstance(dataset, UploadError):
+        return dataset
+    if transfer is not None and transfer.reuse_existing_files:
+        dataset, reused = reuse_existing_files(client, dataset)
+        if on_reuse is not None:
+            on_reuse(reused)
+    if (
+        on_progress is not None
+        or cancel is not None
+        or transfer is not None
+        or journal is not None
+    ):
+        client = _with_progress(
+            client,
+            on_progress=on_progress or (lambda _: None),
+            cancel=cancel or threading.Event(),
+            transfer=transfer,
+            journal=journal,
+        )
     try:
-        return client.upload_new_dataset_now(dataset)
+        if journal is None:
+            return client.upload_new_dataset_now(dataset)
+        journal.record_payload(widget_data)
+        result = _upload_with_journal(client, dataset, journal)
+        if isinstance(result, Dataset):
+            journal.remove()
+        return result
+    except UploadCancelledError:
+        if journal is not None:
+            journal.remove()
+        return UploadError(
+            errors=[FieldError(field="upload", error="The upload was cancelled")],
+            cancelled=True,
+        )
     except ValidationError as error:
         return UploadError(
             errors=[
@@ -28,6 +119,152 @@ def upload_dataset(
         raise
 
 
+def resume_upload(
+    client: Client,
+    journal: UploadJournal | str | os.PathLike[str],
+    *,
+    transfer: TransferConfig | None = None,
+) -> Dataset | UploadError:
+    """Continue an interrupted upload.
+
+    Only files that have not been transferred or that have changed locally
+    since are transferred.
+    If the dataset was already created in SciCat, it is not created again.
+
+    Parameters
+    ----------
+    client:
+        Client for SciCat and the file server.
+        Must use the same SciCat server as the interrupted upload.
+    journal:
+        The journal of the upload or its path, see
+        :meth:`UploadJournal.unfinished`.
+    transfer:
+        Configuration of file uploads.
+
+    Returns
+    -------
+    :
+        The uploaded dataset or the reason why the upload failed.
+        The journal is kept if the upload fails again.
+    """
+    if not isinstance(journal, UploadJournal):
+        journal = UploadJournal.load(journal)
+    if journal.url != client.profile.url:
+        raise ValueError(
+            f"The upload journal is for SciCat at {journal.url}, "
+            f"but the client uses {client.profile.url}"
+        )
+    return upload_dataset(client, journal.payload, transfer=transfer, journal=journal)
+
+
+def _upload_with_journal(
+    client: Client, dataset: Dataset, journal: UploadJournal
+) -> Dataset | UploadError:
+    # The same steps as `Client.upload_new_dataset_now`, but steps that
+    # the journal records as finished are skipped.
+    # Scitacean's helpers are used for the checks to keep them in sync.
+    source_folder = _source_folder_for(client.file_transfer, dataset)
+    if source_folder is None:
+        return UploadError(
+            errors=[FieldError(field="sourceFolder", error="Field required")]
+        )
+    if journal.source_folder is None:
+        journal.record_source_folder(source_folder)
+    elif journal.source_folder != source_folder:
+        return UploadError(
+            errors=[
+                FieldError(
+                    field="sourceFolder",
+                    error="The source folder has changed since the upload started, "
+                    f"was {journal.source_folder.posix}, now {source_folder.posix}",
+                )
+            ]
+        )
+    dataset = dataset.replace(source_folder=source_folder)
+    scicat = client.scicat
+
+    finalized_model = None
+    if journal.pid is None:
+        files_to_upload = _files_to_upload(dataset, client.file_transfer)
+        scicat.validate_dataset_model(dataset.make_upload_model())
+        with client._connect_for_file_upload(dataset, files_to_upload) as con:
+            uploaded_files = con.upload_files(*files_to_upload)
+            dataset = dataset.replace_files(*uploaded_files)
+            try:
+                finalized_model = scicat.create_dataset_model(
+                    dataset.make_upload_model()
+                )
+            except ScicatCommError:
+                con.revert_upload(*uploaded_files)
+                raise
+        journal.record_pid(finalized_model.pid)  # type: ignore[arg-type]
+    pid: PID = journal.pid  # type: ignore[assignment]
+    dataset = dataset.replace(_read_only={"pid": pid})
+
+    orig_datablocks = _upload_journaled(
+        journal,
+        "origdatablocks",
+        dataset.make_datablock_upload_models().orig_datablocks or [],
+        scicat.create_orig_datablock,
+        error="Failed to upload original datablocks",
+        consequence="The dataset and data files were successfully uploaded "
+        "but are not linked with each other",
+    )
+    attachments = _upload_journaled(
+        journal,
+        "attachments",
+        dataset.make_attachment_upload_models(),
+        scicat.create_attachment,
+        error=f"Failed to upload attachments for SciCat dataset {pid}",
+        consequence="The dataset and data files were successfully uploaded "
+        "and will not be reverted",
+    )
+
+    if finalized_model is None or orig_datablocks is None or attachments is None:
+        # Some parts were uploaded before resuming.
+        return client.get_dataset(pid, attachments=True)
+    return Dataset.from_download_model(
+        dataset_model=finalized_model.model_copy(
+            update={"origdatablocks": orig_datablocks, "attachments": attachments}
+        )
+    )
+
+
+def _upload_journaled(
+    journal: UploadJournal,
+    step: str,
+    models: Sequence[_M],
+    create: Callable[[_M], _R],
+    *,
+    error: str,
+    consequence: str,
+) -> list[_R] | None:
+    # Record every model as soon as it is created so that resuming does not
+    # create duplicates in SciCat.
+    # Returns None if some models were created before resuming.
+    if journal.is_done(step):
+        return None
+    created: list[_R] | None = []
+    for i, upload_model in enumerate(models):
+        item = f"{step}[{i}]"
+        if journal.is_done(item):
+            created = None
+            continue
+        try:
+            result = create(upload_model)
+        except ScicatCommError as exc:
+            raise RuntimeError(
+                f"{error}:\n{exc.args}\n{consequence}. "
+                "Resume the upload to retry or fix the dataset manually!"
+            ) from exc
+        journal.record_done(item)
+        if created is not None:
+            created.append(result)
+    journal.record_done(step)
+    return created
+
+
 class FieldError(BaseModel, extra="forbid"):
     field: str
     error: str
@@ -35,27 +272,251 @@ class FieldError(BaseModel, extra="forbid"):
 
 class UploadError(BaseModel, extra="forbid"):
     errors: list[FieldError]
+    cancelled: bool = False
+
+
+class DatasetValidator:
+    """Validate widget data locally before uploading.
+
+    This runs the same conversions and checks as an upload but without
+    contacting SciCat or the file server.
+    Converted fields are cached, so only fields that have changed since the last
+    validation are converted again.
+
+    Parameters
+    ----------
+    client:
+        Client that the dataset will be uploaded with.
+        Only its file transfer is used to determine the source folder.
+    """
+
+    def __init__(self, client: Client) -> None:
+        self._file_transfer = client.file_transfer
+        self._lock = threading.Lock()
+        self._values: dict[str, Any] = {}
+        self._converted: dict[str, dict[str, Any] | FieldError] = {}
+        # Files that may be outside of the source folder, by converted file list.
+        self._escaping_files: tuple[list[File] | None, list[File]] = (None, [])
+        # Changes are recorded separately so that `update` does not wait
+        # for a running validation.
+        self._pending_lock = threading.Lock()
+        self._pending: dict[str, Any] = {}
+        self._pending_replace = False
+        self._version = 0
+
+    def update(
+        self,
+        changes: Mapping[str, Any],
+        *,
+        replace: bool = False,
+        version: int | None = None,
+    ) -> None:
+        """Record changed fields of the widget data.
+
+        Fields with a value of ``None`` are removed.
+        If ``replace`` is true, all fields that are not in ``changes`` are removed.
+        The fields are converted and checked in :meth:`check`.
+        Values are stored by reference and must not be modified afterwards.
+        ``version`` is returned by :meth:`check` to identify the validated data.
+        """
+        with self._pending_lock:
+            if replace:
+                self._pending = dict(changes)
+                self._pending_replace = True
+            else:
+                self._pending.update(changes)
+            if version is not None:
+                self._version = version
+
+    def check(self) -> tuple[int, list[FieldError]]:
+        """Validate the data and return its version and all errors."""
+        with self._lock:
+            version = self._apply_pending()
+            try:
+                return version, self._validate()[1]
+            except Exception as error:
+                get_logger().exception("Failed to validate dataset")
+                return version, [
+                    FieldError(field="dataset", error=f"Validation failed: {error}")
+                ]
+
+    def validate(self, data: Mapping[str, Any]) -> Dataset | UploadError:
+        """Validate complete widget data and return the dataset to upload."""
+        self.update(data, replace=True)
+        with self._lock:
+            self._apply_pending()
+            converted, errors = self._validate()
+            if errors:
+                return UploadError(errors=errors)
+            return assemble_dataset(converted)
+
+    def _apply_pending(self) -> int:
+        # Requires self._lock
+        with self._pending_lock:
+            changes, self._pending = self._pending, {}
+            replace, self._pending_replace = self._pending_replace, False
+            version = self._version
+        if replace:
+            for name in self._values.keys() - changes.keys():
+                self._remove(name)
+        for name, value in changes.items():
+            if value is None:
+                self._remove(name)
+            elif name not in self._values or self._values[name] != value:
+                self._values[name] = value
+                self._converted.pop(name, None)
+        return version
+
+    def _remove(self, name: str) -> None:
+        self._values.pop(name, None)
+        self._converted.pop(name, None)
+
+    def _validate(self) -> tuple[dict[str, Any], list[FieldError]]:
+        # Requires self._lock
+        converted: dict[str, Any] = {}
+        errors: list[FieldError] = []
+        for name, value in self._values.items():
+            if (result := self._converted.get(name)) is None:
+                result = self._converted[name] = _convert_checked(name, value)
+            if isinstance(result, FieldError):
+                errors.append(result)
+            else:
+                converted.update(result)
+
+        fields = {
+            key: value
+            for key, value in converted.items()
+            if key not in ("files", "attachments")
+        }
+        try:
+            dataset = Dataset(**fields)
+        except (TypeError, ValueError) as error:
+            errors.append(FieldError(field="dataset", error=str(error)))
+            return converted, errors
+
+        try:
+            source_folder = _source_folder_for(self._file_transfer, dataset)
+        except (KeyError, ValueError) as error:
+            errors.append(FieldError(field="sourceFolder", error=str(error)))
+        else:
+            if source_folder is not None:
+                dataset = dataset.replace(source_folder=source_folder)
+                errors.extend(
+                    self._check_source_folder(source_folder, converted.get("files"))
+                )
+
+        try:
+            dataset.make_upload_model()
+        except ValidationError as error:
+            errors.extend(
+                FieldError(field=str(err["loc"][0]), error=err["msg"])
+                for err in error.errors()
+            )
+        return converted, errors
+
+    def _check_source_folder(
+        self, source_folder: RemotePath, files: list[File] | None
+    ) -> list[FieldError]:
+        if not files:
+            return []
+        # Checking all files is slow for large datasets, so only check files
+        # with paths that can leave the source folder.
+        if self._escaping_files[0] is not files:
+            self._escaping_files = (
+                files,
+                [
+                    file
+                    for file in files
+                    if file.remote_path.is_absolute()
+                    or ".." in file.remote_path.posix.split("/")
+                ],
+            )
+        outside = [
+            file.remote_path.posix
+            for file in self._escaping_files[1]
+            if not (source_folder / file.remote_path)
+            .resolve()
+            .is_relative_to(source_folder)
+        ]
+        if not outside:
+            return []
+        return [
+            FieldError(
+                field="files",
+                error=f"Remote path is outside of the source folder: {outside[0]}"
+                + _and_more(len(outside)),
+            )
+        ]
+
+
+def _source_folder_for(
+    file_transfer: FileTransfer | None, dataset: Dataset
+) -> RemotePath | None:
+    # Same as in `Client.upload_new_dataset_now`.
+    if file_transfer is not None:
+        return file_transfer.source_folder_for(dataset)
+    return dataset.source_folder
+
+
+def _with_progress(
+    client: Client,
+    *,
+    on_progress: Callable[[UploadProgress], None],
+    cancel: threading.Event,
+    transfer: TransferConfig | None,
+    journal: UploadJournal | None = None,
+) -> Client:
+    if client.file_transfer is None:
+        return client
+    return Client(
+        client=client.scicat,
+        file_transfer=ProgressFileTransfer(
+            client.file_transfer,
+            on_progress=on_progress,
+            cancel=cancel,
+            config=transfer,
+            journal=journal,
+        ),
+        profile=client.profile,
+    )
 
 
 def make_dataset_from_widget_data(data: dict[str, Any]) -> Dataset:
     """Construct a Scitacean dataset from widget data."""
-    converted = _convert_field_names(data)
+    converted: dict[str, Any] = {}
+    for name, value in data.items():
+        converted.update(convert_widget_field(name, value))
+    return assemble_dataset(converted)
+
 
-    converted["contact_email"] = _concat_list(data.get("contactEmails", None))
-    converted.update(_convert_owners(data.get("owners", [])))
-    converted.update(_convert_relationships(converted.pop("relationships", None)))
-    converted.update(_convert_scientific_metadata(data.get("scientificMetadata", [])))
+def convert_widget_field(name: str, value: Any) -> dict[str, Any]:
+    """Convert one field of the widget data.
 
-    files = _convert_files(data.get("files", {}))
+    Returns
+    -------
+    :
+        Arguments for :class:`scitacean.Dataset` and the converted
+        ``"files"`` and ``"attachments"``, see :func:`assemble_dataset`.
+        Empty for unknown fields and ``None``.
+    """
+    if value is None:
+        return {}
+    if (converter := _FIELD_CONVERTERS.get(name)) is not None:
+        return converter(value)
+    if (field_name := _dataset_field_names().get(name)) is not None:
+        return {field_name: value}
+    return {}
 
-    attachments = _convert_attachments(data.get("attachments", {}))
 
+def assemble_dataset(converted: dict[str, Any]) -> Dataset:
+    """Construct a dataset from the output of :func:`convert_widget_field`."""
+    converted = dict(converted)
+    files = converted.pop("files", [])
+    attachments = converted.pop("attachments", [])
     dataset = Dataset(**converted)
     dataset.add_files(*files)
     for attachment in attachments:
-        dataset.add_attachment(
-            Thumbnail.parse(attachment["data"]), caption=attachment["caption"]
-        )
+        dataset.add_attachment(attachment["thumbnail"], caption=attachment["caption"])
     return dataset
 
 
@@ -118,25 +579,79 @@ def _convert_scientific_metadata(
 
 
 def _convert_files(files: list[dict[str, str]]) -> list[File]:
-    converted_files = [
-        File.from_local(spec["localPath"], remote_path=spec.get("remotePath", None))
-        for spec in files
+    return [
+        _convert_file(spec["localPath"], spec.get("remotePath", None)) for spec in files
     ]
-    return converted_files
+
+
+def _convert_file(local_path: str, remote_path: str | None) -> File:
+    try:
+        # Reuse the file object from inspecting the file in the widget.
+        file = get_file_metadata_cache().get(Path(local_path)).file
+    except OSError:
+        # Let Scitacean report the error during the upload.
+        return File.from_local(local_path, remote_path=remote_path)
+    return dataclasses.replace(
+        file,
+        remote_path=RemotePath(remote_path) if remote_path else file.remote_path,
+        # Use checksums that were computed in the background
+        # while the user was filling in the form.
+        _checksum_cache=get_checksum_pipeline().checksum_cache(),  # type: ignore[arg-type]
+    )
 
 
 def _convert_attachments(
-    attachments: list[dict[str, str]],
+    attachments: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
     return [
-        {"data": attachment["data"], "caption": attachment.get("caption", "")}
+        {
+            "thumbnail": _convert_thumbnail(attachment["data"], attachment.get("mime")),
+            "caption": attachment.get("caption", ""),
+        }
         for attachment in attachments
     ]
 
 
-def _convert_field_names(widget_data: dict[str, Any]) -> dict[str, Any]:
-    return {
-        field.name: value
-        for field in Dataset.fields()
-        if (value := widget_data.get(field.scicat_name)) is not None
-    }
+def _convert_thumbnail(data: str | bytes | memoryview, mime: str | None) -> Thumbnail:
+    if isinstance(data, str):
+        # Encoded attachments from the initial dataset.
+        return Thumbnail.parse(data)
+    # Raw bytes from a binary comm buffer.
+    return Thumbnail(mime=mime, data=bytes(data))
+
+
+def _convert_checked(name: str, value: Any) -> dict[str, Any] | FieldError:
+    try:
+        converted = convert_widget_field(name, value)
+    except (KeyError, TypeError, ValueError) as error:
+        return FieldError(field=name, error=f"Invalid value: {error}")
+    missing = [
+        file.local_path
+        for file in converted.get("files", ())
+        if file.local_path is not None and not file.local_path.is_file()
+    ]
+    if missing:
+        return FieldError(
+            field=name, error=f"File not found: {missing[0]}" + _and_more(len(missing))
+        )
+    return converted
+
+
+def _and_more(n: int) -> str:
+    return f" and {n - 1} more" if n > 1 else ""
+
+
+@cache
+def _dataset_field_names() -> dict[str, str]:
+    # Maps SciCat names to Scitacean names.
+    return {field.scicat_name: field.name for field in Dataset.fields()}
+
+
+_FIELD_CONVERTERS: dict[str, Callable[[Any], dict[str, Any]]] = {
+    "contactEmails": lambda value: {"contact_email": _concat_list(value)},
+    "owners": _convert_owners,
+    "relationships": _convert_relationships,
+    "scientificMetadata": _convert_scientific_metadata,
+    "files": lambda value: {"files": _convert_files(value)},
+    "attachments": lambda value: {"attachments": _convert_attachments(value)},
+}
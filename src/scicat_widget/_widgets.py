@@ -1,29 +1,44 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2026 SciCat Project (https://github.com/SciCatProject/scitacean)
 
-import inspect
+import asyncio
+import copy
+import os
 import pathlib
-from collections.abc import Callable, Iterable
+import threading
+from collections.abc import Iterable
 from typing import Any
 
 import anywidget
 import ipywidgets
 import traitlets
-from scitacean import Client, Dataset, ScicatCommError
+from scitacean import Client, Dataset, File
 
+from ._cache import ScicatCache
 from ._comm import handle_event
+from ._dispatch import DispatchConfig, Dispatcher
+from ._executor import get_executor
+from ._field_factories import FieldRequests
+from ._journal import UploadJournal
 from ._logging import get_logger
-from ._model import Config, Instrument, ProposalOverview
-from ._scicat_api import get_user_and_scicat_info
+from ._patch import PatchOp, apply_patch, diff_top_level, make_set_op, to_pointer
 from ._serialization import (
+    iter_serialized_files,
     load_and_serialize_techniques,
+    local_files,
     serialize_dataset,
-    serialize_instrument,
-    serialize_proposal,
 )
+from ._session import DOWNLOAD_ERRORS, ScicatSession, make_static_data
+from ._stats import get_stats, payload_size
+from ._thumbnails import ThumbnailConfig
+from ._transfer import TransferConfig
+from ._upload import DatasetValidator, make_dataset_from_widget_data
 
 _STATIC_PATH = pathlib.Path(__file__).parent / "_static"
 
+# Maximum number of patch operations per message.
+_PATCH_CHUNK_SIZE = 1000
+
 
 class DatasetUploadWidget(anywidget.AnyWidget):
     _esm = _STATIC_PATH / "datasetUploadWidget.js"
@@ -32,6 +47,7 @@ class DatasetUploadWidget(anywidget.AnyWidget):
     config = traitlets.Dict().tag(sync=True)
     initial = traitlets.Dict().tag(sync=True)
     staticData = traitlets.Dict().tag(sync=True)
+    loading = traitlets.Bool(default_value=True).tag(sync=True)
 
     def __init__(
         self,
@@ -41,15 +57,50 @@ class DatasetUploadWidget(anywidget.AnyWidget):
         initial: Dataset | None = None,
         locked: Iterable[str] = (),
         skip_confirm: bool = False,
+        cache: ScicatCache | bool = True,
+        transfer: TransferConfig | None = None,
+        thumbnails: ThumbnailConfig | None = None,
+        dispatch: DispatchConfig | None = None,
+        resume: UploadJournal | None = None,
     ) -> None:
-        config = _build_config(client, locked=locked, skip_confirm=skip_confirm)
-        initial_data, static = _collect_initial_data(client, initial)
+        # Widgets of the same client share config and data from SciCat.
+        session = ScicatSession.for_client(client, cache=cache)
+        if resume is not None:
+            if initial is not None:
+                raise ValueError("Cannot use both `initial` and `resume`")
+            initial = make_dataset_from_widget_data(resume.payload)
+            if resume.pid is not None:
+                # The dataset exists in SciCat, so only the upload can be finished.
+                locked = [*locked, *resume.payload]
+        initial_data: dict[str, Any] = {}
+        initial_files: list[File] = []
+        if initial is not None:
+            # Large file lists are sent in chunks when the widget requests them.
+            initial_data = serialize_dataset(initial, include_files=False)
+            initial_files = local_files(initial.files)
+            if initial_files:
+                initial_data["pendingFiles"] = len(initial_files)
         super().__init__(
-            config=config.model_dump(),
+            config=session.config(locked=locked, skip_confirm=skip_confirm),
             initial=initial_data,
-            staticData=static,
+            staticData={},
+            loading=True,
         )
         self.client = client  # TODO create client here if not given
+        self._initial_from_dataset = initial_data
+        self._initial_files = initial_files
+        self._session = session
+        self._transfer_config = transfer
+        self._thumbnail_config = thumbnails
+        self._field_factories = session.field_factories
+        self._field_requests = FieldRequests()
+        self._validator = DatasetValidator(session.client)
+        self._dispatcher = Dispatcher(dispatch)
+        # Messages are sent from worker threads, but the kernel's sockets
+        # are not thread-safe.
+        self._send_lock = threading.Lock()
+        # Serializes in-place updates of `initial` and `staticData`.
+        self._patch_lock = threading.RLock()
 
         # This `Output` is displayed alongside `self` so that sub widgets,
         # e.g., a file picker can be attached to it and displayed.
@@ -59,8 +110,206 @@ class DatasetUploadWidget(anywidget.AnyWidget):
         self._aux_output_widget.add_class("cean-output-anchor")
         self._is_displaying = False
 
+        # Cancellation events of running background tasks by request key.
+        self._active_uploads: dict[str, threading.Event] = {}
+        # Journal of an upload that failed and is resumed by the next upload.
+        self._journal = resume
+        self._active_folder_scans: dict[str, threading.Event] = {}
+
         self.on_msg(handle_event)
 
+        # Downloading data from SciCat can take a long time.
+        # Do it in the background so the widget can be displayed right away.
+        self._start_loading_scicat_data()
+        session.on_refresh(self._start_loading_scicat_data)
+
+    def send(self, content: Any, buffers: Any = None) -> None:
+        """Send a custom message to the frontend, safe to call from any thread."""
+        stats = get_stats()
+        if stats.measure_bytes and isinstance(content, dict) and "type" in content:
+            stats.record_bytes(
+                content["type"], bytes_out=payload_size(content, buffers)
+            )
+        with self._send_lock:
+            super().send(content, buffers=buffers)
+
+    def stats(self, *, reset: bool = False) -> dict[str, dict[str, Any]]:
+        """Return statistics on message handling and SciCat calls.
+
+        Entries are keyed by message type (``req:*`` for handlers of requests,
+        ``res:*`` for sent responses), ``task:*`` for background work started
+        by handlers, and ``scicat:*`` for calls to SciCat.
+        Each entry contains the number of calls, latencies in seconds,
+        a latency histogram, and the number of bytes received and sent.
+        Bytes are only counted while :meth:`log_stats` is active
+        because measuring messages slows down the widget.
+
+        The statistics are collected for all widgets in the process.
+
+        Parameters
+        ----------
+        reset:
+            If true, clear the statistics after returning them.
+        """
+        return get_stats().snapshot(reset=reset)
+
+    def log_stats(self, every: float | None) -> None:
+        """Log a summary of :meth:`stats` every ``every`` seconds.
+
+        The summary is logged at level INFO with the ``scicat-widget.stats``
+        logger, which writes to stderr unless logging has been configured.
+        Pass ``None`` to stop logging.
+        """
+        get_stats().log_every(every)
+
+    def update_initial(self, path: str, value: Any) -> None:
+        """Set a value of the initial data and show it in the widget.
+
+        Only the changed value is sent to the widget, not all initial data.
+        This replaces what the user has entered in the affected field.
+
+        Parameters
+        ----------
+        path:
+            Slash-separated path of the value, e.g., ``"datasetName"`` or
+            ``"scientificMetadata/0/value"``.
+            Names are the SciCat field names used by the widget.
+        value:
+            The new value. Must be serializable to JSON.
+        """
+        pointer = to_pointer(path)
+        with self._patch_lock:
+            self._send_patch("initial", [make_set_op(self.initial, pointer, value)])
+            self._keep_initial_field(pointer)
+
+    def append_files(self, files: Iterable[str | os.PathLike[str] | File]) -> None:
+        """Add files to the file list of the widget.
+
+        Only the new files are sent to the widget.
+        Files that do not exist are skipped.
+        """
+        local = local_files(
+            file if isinstance(file, File) else File.from_local(file) for file in files
+        )
+        serialized = list(iter_serialized_files(local))
+        with self._patch_lock:
+            ops: list[PatchOp] = []
+            if "files" not in self.initial:
+                ops.append({"op": "add", "path": "/files", "value": []})
+            ops.extend(
+                {"op": "add", "path": "/files/-", "value": file} for file in serialized
+            )
+            self._send_patch("initial", ops)
+            self._keep_initial_field("/files")
+
+    def _send_patch(
+        self,
+        trait: str,
+        ops: list[PatchOp],
+        *,
+        update_inputs: bool = True,
+    ) -> None:
+        # Requires self._patch_lock
+        # Modify the trait in place so that traitlets does not send all of it.
+        apply_patch(getattr(self, trait), ops)
+        for start in range(0, len(ops), _PATCH_CHUNK_SIZE):
+            self.send(
+                {
+                    "type": "res:patch",
+                    "key": "widget",
+                    "payload": {
+                        "trait": trait,
+                        "ops": ops[start : start + _PATCH_CHUNK_SIZE],
+                        "updateInputs": update_inputs,
+                    },
+                }
+            )
+
+    def _keep_initial_field(self, pointer: str) -> None:
+        # Values set by the user take precedence over data loaded from SciCat,
+        # see `_set_scicat_data`.
+        key = pointer[1:].split("/", 1)[0]
+        if key in self.initial:
+            self._initial_from_dataset[key] = self.initial[key]
+        else:
+            self._initial_from_dataset.pop(key, None)
+
+    def refresh(self) -> None:
+        """Download data from SciCat again.
+
+        This bypasses and updates the cache.
+        All widgets of the same client are updated in the background,
+        use :meth:`ready` to wait for it.
+        """
+        self._session.refresh()
+
+    async def ready(self) -> None:
+        """Wait until the data from SciCat has been loaded into the widget.
+
+        Raises
+        ------
+        Exception
+            Any unexpected exception that occurred while loading the data.
+            Failures to communicate with SciCat are only logged.
+        """
+        await asyncio.wrap_future(self._scicat_data_loaded)
+
+    def _start_loading_scicat_data(self) -> None:
+        self._scicat_data_loaded = get_executor().submit(self._load_scicat_data)
+
+    def _load_scicat_data(self) -> None:
+        # Show cached data first, even if it is stale.
+        # It gets replaced below if the fresh data differs.
+        if not self._session.scicat_data_loaded and (
+            cached := self._session.cached_scicat_data()
+        ):
+            self._set_scicat_data(*cached)
+
+        try:
+            initial_data, static_data = self._session.scicat_data()
+        except DOWNLOAD_ERRORS as error:
+            get_logger().warning("Failed to download data from SciCat: %s", error)
+            # Keep showing cached or previously loaded data if there is any.
+            if self.loading:
+                self._set_scicat_data({}, make_static_data([], [], []))
+            return
+        except Exception:
+            get_logger().exception("Failed to load data from SciCat")
+            if self.loading:
+                self._set_scicat_data({}, make_static_data([], [], []))
+            raise
+        self._set_scicat_data(initial_data, static_data)
+
+    def _set_scicat_data(
+        self, initial_data: dict[str, Any], static_data: dict[str, Any]
+    ) -> None:
+        # Values from the user-provided dataset take precedence.
+        # The data is shared with other widgets but `initial` is modified in place.
+        initial = {**copy.deepcopy(initial_data), **self._initial_from_dataset}
+        static = {
+            **static_data,
+            # Only send the techniques that are in use,
+            # the widget requests others when needed.
+            "techniques": load_and_serialize_techniques(
+                self._initial_from_dataset.get("techniques", ())
+            ),
+        }
+        with self._patch_lock:
+            if self.loading:
+                with self.hold_sync():
+                    self.initial = initial
+                    self.staticData = static
+                    self.loading = False
+            else:
+                # Cached data is already shown, only send what has changed.
+                # The form keeps what the user has entered.
+                self._send_patch(
+                    "initial",
+                    diff_top_level(self.initial, initial),
+                    update_inputs=False,
+                )
+                self._send_patch("staticData", diff_top_level(self.staticData, static))
+
     def _repr_mimebundle_(
         self, **kwargs: Any
     ) -> tuple[dict[Any, Any], dict[Any, Any]] | None:
@@ -75,73 +324,3 @@ class DatasetUploadWidget(anywidget.AnyWidget):
             )
         finally:
             self._is_displaying = False
-
-
-def _build_config(
-    client: Client,
-    *,
-    locked: Iterable[str],
-    skip_confirm: bool,
-) -> Config:
-    profile = client.profile
-    return Config(
-        frontendUrl=profile.frontend_url,
-        scientificMetadataSchema=profile.scientific_metadata_schema,
-        fieldDependencies={
-            name: _extract_factory_dependencies(fn)
-            for name, fn in profile.field_factories.items()
-        },
-        lockedFields=list(locked),
-        skipConfirmation=skip_confirm,
-    )
-
-
-def _extract_factory_dependencies(factory: Callable[..., object]) -> list[str]:
-    spec = inspect.getfullargspec(factory)
-    if spec.varargs is not None or spec.varkw is not None:
-        raise TypeError("Variable arguments are not supported")
-    return [*spec.args, *spec.kwonlyargs]
-
-
-def _collect_initial_data(
-    client: Client | None = None, initial: Dataset | None = None
-) -> tuple[dict[str, Any], dict[str, Any]]:
-    if client is None:
-        return {}, {}
-    initial_data, instruments, proposals, access_groups = _download_scicat_data(client)
-
-    static_data = {
-        "instruments": [serialize_instrument(instrument) for instrument in instruments],
-        "proposals": [serialize_proposal(proposal) for proposal in proposals],
-        "accessGroups": access_groups,
-        "techniques": load_and_serialize_techniques(),
-    }
-
-    if initial is not None:
-        initial_data.update(serialize_dataset(initial))
-
-    return initial_data, static_data
-
-
-def _download_scicat_data(
-    client: Client,
-) -> tuple[dict[str, Any], list[Instrument], list[ProposalOverview], list[str]]:
-    try:
-        user_info, instruments = get_user_and_scicat_info(client)
-    except (ScicatCommError, ValueError, TypeError, RuntimeError) as error:
-        get_logger().warning("Failed to download initial data for user: %s", error)
-        return {}, [], [], []
-
-    proposals = user_info.proposals
-    access_groups = user_info.access_groups
-
-    initial_data = {
-        "owners": [
-            {
-                "name": user_info.display_name,
-                "email": user_info.email,
-                "orcid": user_info.orcid_id,
-            },
-        ],
-    }
-    return initial_data, instruments, proposals, access_groups
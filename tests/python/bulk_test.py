@@ -0,0 +1,71 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from scitacean import Dataset
+from scitacean.testing.client import FakeClient
+
+from scicat_widget import UploadError, read_payloads, upload_datasets
+
+
+def test_upload_datasets_uploads_all_payloads(
+    client: FakeClient, make_widget_data: Callable[..., dict[str, Any]]
+) -> None:
+    payloads = [make_widget_data(f"ds{i}", 1) for i in range(5)]
+
+    results = list(upload_datasets(client, payloads, max_concurrent=2))
+
+    assert sorted(r.index for r in results) == list(range(5))
+    assert all(r.ok for r in results)
+    names = {r.result.name for r in results if isinstance(r.result, Dataset)}
+    assert names == {f"ds{i}" for i in range(5)}
+    assert len(client.datasets) == 5
+
+
+def test_upload_datasets_reports_errors_per_dataset(
+    client: FakeClient, make_widget_data: Callable[..., dict[str, Any]]
+) -> None:
+    invalid = make_widget_data("invalid", 1)
+    del invalid["sourceFolder"], invalid["ownerGroup"]
+    payloads = [make_widget_data("valid", 1), invalid]
+
+    results = sorted(upload_datasets(client, payloads), key=lambda r: r.index)
+
+    assert results[0].ok
+    assert isinstance(results[1].result, UploadError)
+    assert len(client.datasets) == 1
+
+
+def test_read_payloads_jsonl(
+    make_widget_data: Callable[..., dict[str, Any]], tmp_path: Path
+) -> None:
+    payloads = [make_widget_data("a", 1), make_widget_data("b", 1)]
+    path = tmp_path / "payloads.jsonl"
+    path.write_text("\n".join(json.dumps(p) for p in payloads) + "\n\n")
+    assert list(read_payloads(path)) == payloads
+
+
+def test_read_payloads_csv_decodes_json_cells(tmp_path: Path) -> None:
+    path = tmp_path / "payloads.csv"
+    path.write_text(
+        'datasetName,description,files\na,,"[{""localPath"": ""a.dat""}]"\nb,Second,\n'
+    )
+    assert list(read_payloads(path)) == [
+        {"datasetName": "a", "files": [{"localPath": "a.dat"}]},
+        {"datasetName": "b", "description": "Second"},
+    ]
+
+
+def test_read_payloads_csv_keeps_cells_that_are_not_json(tmp_path: Path) -> None:
+    path = tmp_path / "payloads.csv"
+    path.write_text("datasetName,description\na,[draft] Not JSON\n")
+    assert list(read_payloads(path)) == [
+        {"datasetName": "a", "description": "[draft] Not JSON"},
+    ]
+
+
+def test_read_payloads_rejects_unknown_file_type(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unsupported"):
+        read_payloads(tmp_path / "payloads.txt")
@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from scicat_widget import ScicatCache
+
+
+def test_cache_returns_stored_value(tmp_path: Path) -> None:
+    cache = ScicatCache(tmp_path)
+    cache.put("instruments", [{"pid": "abc"}], url="https://scicat", user="ponder")
+
+    assert cache.get("instruments", url="https://scicat", user="ponder") == [
+        {"pid": "abc"}
+    ]
+    assert cache.get("instruments", url="https://scicat", user="rincewind") is None
+    assert cache.get("instruments", url="https://other", user="ponder") is None
+    assert cache.get("proposals", url="https://scicat", user="ponder") is None
+
+
+def test_cache_entries_expire(tmp_path: Path) -> None:
+    cache = ScicatCache(tmp_path, ttl=timedelta(seconds=0))
+    cache.put("identity", {"userId": "u"}, url="https://scicat")
+    time.sleep(0.01)
+
+    assert cache.get("identity", url="https://scicat") is None
+    assert cache.get("identity", url="https://scicat", allow_stale=True) == {
+        "userId": "u"
+    }
+
+
+def test_cache_invalidate_by_url(tmp_path: Path) -> None:
+    cache = ScicatCache(tmp_path)
+    cache.put("identity", 1, url="https://a")
+    cache.put("identity", 2, url="https://b")
+
+    cache.invalidate(url="https://a")
+    assert cache.get("identity", url="https://a") is None
+    assert cache.get("identity", url="https://b") == 2
+
+    cache.invalidate()
+    assert cache.get("identity", url="https://b") is None
+
+
+def test_cache_evicts_oldest_entries(tmp_path: Path) -> None:
+    cache = ScicatCache(tmp_path, max_size=1000)
+    for i in range(10):
+        cache.put("proposals", "x" * 200, url=f"https://{i}")
+        time.sleep(0.01)  # make sure modification times differ
+
+    assert cache.get("proposals", url="https://0") is None
+    assert cache.get("proposals", url="https://9") == "x" * 200
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 1000
@@ -0,0 +1,60 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+from scitacean.filesystem import checksum_of_file
+
+from scicat_widget._checksum import ChecksumPipeline, PipelineChecksum
+from scicat_widget._upload import make_dataset_from_widget_data
+
+
+def test_checksum_pipeline_matches_scitacean(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(5 * 1024 * 1024 + 17))
+
+    pipeline = ChecksumPipeline()
+    checksum = pipeline.checksum(path, algorithm="blake2b")
+    assert checksum == checksum_of_file(path, algorithm="blake2b")
+    assert pipeline.checksum(path, algorithm="md5") == (
+        hashlib.md5(path.read_bytes(), usedforsecurity=False).hexdigest()
+    )
+
+
+def test_checksum_pipeline_reuses_results(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc")
+
+    pipeline = ChecksumPipeline()
+    first = pipeline.submit(path)
+    assert pipeline.submit(path) is first
+
+
+def test_checksum_pipeline_recomputes_modified_files(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc")
+
+    pipeline = ChecksumPipeline()
+    before = pipeline.checksum(path, algorithm="blake2b")
+    path.write_bytes(b"abcd")
+    assert pipeline.checksum(path, algorithm="blake2b") != before
+
+
+def test_checksum_pipeline_prefetch_ignores_missing_files(tmp_path: Path) -> None:
+    pipeline = ChecksumPipeline()
+    pipeline.prefetch(tmp_path / "missing")
+    with pytest.raises(FileNotFoundError):
+        pipeline.checksum(tmp_path / "missing", algorithm="blake2b")
+
+
+def test_dataset_files_use_checksum_pipeline(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"some data")
+
+    dataset = make_dataset_from_widget_data(
+        {"type": "raw", "files": [{"localPath": str(path)}]}
+    )
+    [file] = dataset.files
+    checksum_cache: object = file._checksum_cache
+    assert isinstance(checksum_cache, PipelineChecksum)
+    assert file.checksum() == hashlib.blake2b(b"some data").hexdigest()
@@ -0,0 +1,70 @@
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+from scitacean.testing.client import FakeClient
+from scitacean.testing.transfer import FakeFileTransfer
+
+
+@pytest.fixture
+def transfer() -> FakeFileTransfer:
+    return FakeFileTransfer(source_folder="/remote/{name}")
+
+
+@pytest.fixture
+def client(transfer: FakeFileTransfer) -> FakeClient:
+    return FakeClient.without_login(
+        url="https://fake.scicat/api/v3", file_transfer=transfer
+    )
+
+
+@pytest.fixture
+def make_widget_data(tmp_path: Path) -> Callable[..., dict[str, Any]]:
+    """Return a function that writes files and returns widget data for them.
+
+    The function takes the name of the dataset and either the number of files,
+    optionally with their sizes, or a dict of file names and contents.
+    Files are written to ``tmp_path / name``.
+    By default, the file ``file{i}.dat`` has ``i + 1`` bytes.
+    """
+
+    def make(
+        name: str,
+        n_files: int = 0,
+        *,
+        sizes: Sequence[int] | None = None,
+        files: dict[str, bytes] | None = None,
+        derived: bool = False,
+    ) -> dict[str, Any]:
+        if files is None:
+            sizes = sizes if sizes is not None else range(1, n_files + 1)
+            files = {f"file{i}.dat": b"x" * size for i, size in enumerate(sizes)}
+        folder = tmp_path / name
+        folder.mkdir(parents=True, exist_ok=True)
+        for file_name, content in files.items():
+            (folder / file_name).write_bytes(content)
+
+        data: dict[str, Any] = {
+            "type": "derived" if derived else "raw",
+            "datasetName": name,
+            "description": "A dataset",
+            "owner": "Ponder Stibbons",
+            "ownerGroup": "uu",
+            "contactEmails": ["p.stibbons@uu.am"],
+            "files": [
+                {"localPath": str(folder / file_name), "remotePath": file_name}
+                for file_name in files
+            ],
+        }
+        if derived:
+            data["investigator"] = "Mustrum Ridcully"
+            data["inputDatasets"] = ["some-input"]
+            data["usedSoftware"] = ["scicat-widget"]
+        else:
+            data["creationLocation"] = "/test"
+            data["principalInvestigator"] = "Mustrum Ridcully"
+            data["sourceFolder"] = f"/remote/{name}"
+        return data
+
+    return make
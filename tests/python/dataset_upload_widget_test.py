@@ -1,8 +1,30 @@
-from scitacean import Client
+import asyncio
+
+from scitacean import Dataset
+from scitacean.testing.client import FakeClient
 
 from scicat_widget import DatasetUploadWidget
 
 
-def test_can_create_dataset_upload_widget() -> None:
-    client = Client.without_login("staging.ess")
-    _ = DatasetUploadWidget(client)
+def test_can_create_dataset_upload_widget(client: FakeClient) -> None:
+    _ = DatasetUploadWidget(client, cache=False)
+
+
+def test_dataset_upload_widget_loads_scicat_data_in_background() -> None:
+    client = FakeClient.without_login(url="https://fake.scicat/api/v3")
+    widget = DatasetUploadWidget(client, cache=False)
+    asyncio.run(widget.ready())
+
+    assert not widget.loading
+    assert widget.staticData["proposals"] == []
+    assert widget.staticData["instruments"] == []
+    assert "techniques" in widget.staticData
+
+
+def test_dataset_upload_widget_keeps_initial_data_after_loading() -> None:
+    client = FakeClient.without_login(url="https://fake.scicat/api/v3")
+    initial = Dataset(type="raw", name="My dataset")
+    widget = DatasetUploadWidget(client, initial=initial, cache=False)
+    asyncio.run(widget.ready())
+
+    assert widget.initial["datasetName"] == "My dataset"
@@ -0,0 +1,140 @@
+import hashlib
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from scitacean import Dataset, RemotePath, ScicatCommError
+from scitacean.testing.client import FakeClient
+from scitacean.testing.transfer import FakeFileTransfer
+
+from scicat_widget import TransferConfig
+from scicat_widget._dedup import ReusedFiles
+from scicat_widget._upload import upload_dataset
+
+REUSE = TransferConfig(reuse_existing_files=True)
+
+
+def serve_orig_datablocks(
+    client: FakeClient, monkeypatch: pytest.MonkeyPatch
+) -> list[dict[str, Any]]:
+    """Answer queries for orig datablocks from the datablocks in the fake client."""
+    requests: list[dict[str, Any]] = []
+
+    def call_endpoint(
+        *, cmd: str, url: str, params: dict[str, str], **_: Any
+    ) -> list[dict[str, Any]]:
+        assert url == "origdatablocks"
+        filter_ = json.loads(params["filter"])
+        requests.append(filter_)
+        wanted = set(filter_["where"]["dataFileList.chk"]["$in"])
+        matching = [
+            datablock.model_dump(mode="json")
+            for datablocks in client.orig_datablocks.values()
+            for datablock in datablocks
+            if any(f.chk in wanted for f in datablock.dataFileList or ())
+        ]
+        skip = filter_["limits"]["skip"]
+        return matching[skip : skip + filter_["limits"]["limit"]]
+
+    monkeypatch.setattr(client.scicat, "call_endpoint", call_endpoint)
+    return requests
+
+
+def test_upload_reuses_files_that_scicat_has(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    requests = serve_orig_datablocks(client, monkeypatch)
+    raw = {"a.dat": b"raw data a", "b.dat": b"raw data b!", "c.dat": b"c"}
+    first = upload_dataset(client, make_widget_data("raw", files=raw, derived=True))
+    assert isinstance(first, Dataset)
+
+    derived = {"a.dat": b"raw data a", "copy-of-b.dat": b"raw data b!", "d": b"new"}
+    reused: list[ReusedFiles] = []
+    result = upload_dataset(
+        client,
+        make_widget_data("derived", files=derived, derived=True),
+        transfer=REUSE,
+        on_reuse=reused.append,
+    )
+
+    assert isinstance(result, Dataset)
+    assert reused == [ReusedFiles(n_files=2, n_bytes=21)]
+    assert len(requests) == 1
+    assert sorted(p.posix for p in transfer.files) == [
+        "/remote/derived/d",
+        "/remote/raw/a.dat",
+        "/remote/raw/b.dat",
+        "/remote/raw/c.dat",
+    ]
+    [datablock] = client.orig_datablocks[result.pid]  # type: ignore[index]
+    assert [f.path for f in datablock.dataFileList or ()] == [
+        "/remote/raw/a.dat",
+        "/remote/raw/b.dat",
+        "d",
+    ]
+    assert datablock.size == len(b"raw data a") + len(b"raw data b!") + len(b"new")
+
+
+def test_upload_transfers_all_files_if_scicat_cannot_be_queried(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+
+    def call_endpoint(**_: Any) -> None:
+        raise ScicatCommError("Forbidden")
+
+    monkeypatch.setattr(client.scicat, "call_endpoint", call_endpoint)
+    reused: list[ReusedFiles] = []
+    result = upload_dataset(
+        client,
+        make_widget_data("derived", files={"a.dat": b"a", "b.dat": b"b"}, derived=True),
+        transfer=REUSE,
+        on_reuse=reused.append,
+    )
+
+    assert isinstance(result, Dataset)
+    assert reused == [ReusedFiles()]
+    assert set(transfer.files) == {
+        RemotePath("/remote/derived/a.dat"),
+        RemotePath("/remote/derived/b.dat"),
+    }
+
+
+def test_upload_skips_incomplete_records_in_scicat(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    contents = {"a.dat": b"a", "b.dat": b"bb"}
+    data = make_widget_data("derived", files=contents, derived=True)
+
+    def data_file(name: str, **fields: Any) -> dict[str, Any]:
+        checksum = hashlib.blake2b(contents[name]).hexdigest()
+        return {"chk": checksum, "size": len(contents[name]), **fields}
+
+    datablocks = [
+        {"chkAlg": "blake2b", "dataFileList": [data_file("a.dat", path="a.dat")]},
+        {
+            "datasetId": "other",
+            "chkAlg": "blake2b",
+            "dataFileList": [
+                data_file("a.dat", time="2026-01-01T00:00:00Z"),
+                data_file("b.dat", path="b.dat", time="not a time"),
+            ],
+        },
+        {"datasetId": "other", "chkAlg": "blake2b", "dataFileList": None},
+    ]
+    monkeypatch.setattr(client.scicat, "call_endpoint", lambda **_: datablocks[:])
+    reused: list[ReusedFiles] = []
+    result = upload_dataset(client, data, transfer=REUSE, on_reuse=reused.append)
+
+    assert isinstance(result, Dataset)
+    assert reused == [ReusedFiles()]
+    assert len(transfer.files) == 2
@@ -0,0 +1,113 @@
+import functools
+import threading
+import time
+
+import pytest
+
+from scicat_widget import DispatchConfig
+from scicat_widget._dispatch import Dispatcher
+
+
+def test_synchronous_dispatcher_runs_jobs_immediately() -> None:
+    dispatcher = Dispatcher(DispatchConfig(synchronous=True))
+    calls = []
+    dispatcher.dispatch(
+        "req:a", "key", lambda: calls.append(threading.current_thread())
+    )
+    assert calls == [threading.current_thread()]
+
+
+def test_dispatcher_limits_concurrency_per_type() -> None:
+    dispatcher = Dispatcher(DispatchConfig(max_concurrent={"req:a": 1}))
+    release = threading.Event()
+    started = []
+
+    def job(i: int) -> None:
+        started.append(i)
+        release.wait(timeout=5)
+
+    for i in range(3):
+        dispatcher.dispatch("req:a", i, functools.partial(job, i))
+    other = threading.Event()
+    dispatcher.dispatch("req:b", 0, other.set)
+
+    # Other types are not blocked by a busy type.
+    assert other.wait(timeout=5)
+    assert started == [0]
+    release.set()
+    for _ in range(100):
+        if len(started) == 3:
+            break
+        time.sleep(0.01)
+    assert started == [0, 1, 2]
+
+
+def test_dispatcher_limits_total_concurrency() -> None:
+    dispatcher = Dispatcher(DispatchConfig(workers=1))
+    release = threading.Event()
+    started = []
+
+    def job(type_: str) -> None:
+        started.append(type_)
+        release.wait(timeout=5)
+
+    dispatcher.dispatch("req:a", 0, lambda: job("a"))
+    dispatcher.dispatch("req:b", 0, lambda: job("b"))
+    time.sleep(0.05)
+    assert started == ["a"]
+    release.set()
+    for _ in range(100):
+        if len(started) == 2:
+            break
+        time.sleep(0.01)
+    assert started == ["a", "b"]
+
+
+def test_dispatchers_share_the_thread_pool() -> None:
+    threads = []
+    for _ in range(2):
+        done = threading.Event()
+
+        def job(done: threading.Event = done) -> None:
+            threads.append(threading.current_thread().name)
+            done.set()
+
+        Dispatcher().dispatch("req:a", 0, job)
+        assert done.wait(timeout=5)
+    assert all(name.startswith("scicat-widget_") for name in threads)
+
+
+def test_dispatcher_replaces_queued_job_with_same_id() -> None:
+    dispatcher = Dispatcher(DispatchConfig(max_concurrent={"req:a": 1}))
+    release = threading.Event()
+    calls = []
+
+    def blocker() -> None:
+        release.wait(timeout=5)
+
+    dispatcher.dispatch("req:a", "blocker", blocker)
+    dispatcher.dispatch("req:a", "key", lambda: calls.append("old"))
+    dispatcher.dispatch("req:a", "key", lambda: calls.append("new"))
+    release.set()
+
+    done = threading.Event()
+    dispatcher.dispatch("req:a", "done", done.set)
+    assert done.wait(timeout=5)
+    assert calls == ["new"]
+
+
+def test_dispatcher_keeps_running_after_failing_job() -> None:
+    dispatcher = Dispatcher(DispatchConfig(max_concurrent={"req:a": 1}))
+
+    def fail() -> None:
+        raise RuntimeError("bad job")
+
+    dispatcher.dispatch("req:a", 0, fail)
+    done = threading.Event()
+    dispatcher.dispatch("req:a", 1, done.set)
+    assert done.wait(timeout=5)
+
+
+def test_dispatch_config_rejects_invalid_limits() -> None:
+    with pytest.raises(ValueError, match="max_concurrent"):
+        DispatchConfig(max_concurrent={"req:a": 0})
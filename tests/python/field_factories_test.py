@@ -0,0 +1,51 @@
+import pytest
+
+from scicat_widget._field_factories import FieldFactories, FieldRequests
+
+
+def test_dependencies_include_positional_and_keyword_arguments() -> None:
+    factories = FieldFactories({"ownerGroup": lambda proposalId, *, owner: ""})
+    assert factories.dependencies() == {"ownerGroup": ["proposalId", "owner"]}
+
+
+def test_variable_arguments_are_not_supported() -> None:
+    with pytest.raises(TypeError):
+        FieldFactories({"ownerGroup": lambda *args: ""})
+
+
+def test_build_memoizes_results() -> None:
+    calls = []
+
+    def owner_group(proposalId: str) -> str:
+        calls.append(proposalId)
+        return f"group-{proposalId}"
+
+    factories = FieldFactories({"ownerGroup": owner_group})
+    assert factories.build("ownerGroup", {"proposalId": "1"}) == "group-1"
+    assert factories.build("ownerGroup", {"proposalId": "1"}) == "group-1"
+    assert factories.build("ownerGroup", {"proposalId": "2"}) == "group-2"
+    assert calls == ["1", "2"]
+
+
+def test_build_evicts_least_recently_used_results() -> None:
+    calls = []
+
+    def ident(x: int) -> int:
+        calls.append(x)
+        return x
+
+    factories = FieldFactories({"f": ident}, max_entries=2)
+    for x in (1, 2, 1, 3, 1, 2):
+        factories.build("f", {"x": x})
+    assert calls == [1, 2, 3, 2]
+
+
+def test_newer_request_makes_older_ones_stale() -> None:
+    requests = FieldRequests()
+    first = requests.start("key", "f")
+    second = requests.start("key", "f")
+    other = requests.start("other-key", "f")
+
+    assert not requests.is_current("key", "f", first)
+    assert requests.is_current("key", "f", second)
+    assert requests.is_current("other-key", "f", other)
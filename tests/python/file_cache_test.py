@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from scicat_widget._file_cache import FileMetadataCache
+from scicat_widget._upload import _convert_files
+
+
+def deduce_type(path: Path) -> str:
+    return path.suffix
+
+
+def test_file_metadata_cache_reuses_entries(tmp_path: Path) -> None:
+    path = tmp_path / "a.h5"
+    path.write_bytes(b"123")
+    cache = FileMetadataCache(deduce_type)
+
+    first = cache.get(path)
+    second = cache.get(path)
+    assert second is first
+    assert first.size == 3
+    assert first.type == ".h5"
+    assert first.file.remote_path.posix == "a.h5"
+
+
+def test_file_metadata_cache_detects_changes(tmp_path: Path) -> None:
+    path = tmp_path / "a.h5"
+    path.write_bytes(b"123")
+    cache = FileMetadataCache(deduce_type)
+
+    first = cache.get(path)
+    path.write_bytes(b"12345")
+    second = cache.get(path)
+    assert second is not first
+    assert second.size == 5
+
+
+def test_file_metadata_cache_raises_for_missing_file(tmp_path: Path) -> None:
+    cache = FileMetadataCache(deduce_type)
+    with pytest.raises(FileNotFoundError):
+        cache.get(tmp_path / "missing")
+
+
+def test_file_metadata_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    paths = [tmp_path / f"{i}.txt" for i in range(3)]
+    for path in paths:
+        path.write_text("x")
+    cache = FileMetadataCache(deduce_type, max_entries=2)
+
+    first = cache.get(paths[0])
+    cache.get(paths[1])
+    assert cache.get(paths[0]) is first  # now most recently used
+    cache.get(paths[2])
+    assert len(cache) == 2
+    assert cache.get(paths[0]) is first
+
+
+def test_convert_files_shares_checksum_cache(tmp_path: Path) -> None:
+    path = tmp_path / "data.dat"
+    path.write_bytes(b"data")
+
+    [a] = _convert_files([{"localPath": str(path)}])
+    [b] = _convert_files([{"localPath": str(path), "remotePath": "sub/data.dat"}])
+    assert a.remote_path.posix == "data.dat"
+    assert b.remote_path.posix == "sub/data.dat"
+    assert a._checksum_cache is b._checksum_cache
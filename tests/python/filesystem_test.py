@@ -0,0 +1,124 @@
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from scitacean import File
+from scitacean.testing.client import FakeClient
+
+from scicat_widget import DatasetUploadWidget
+from scicat_widget._comm import _send_folder_summaries
+from scicat_widget._filesystem import inspect_file, inspect_files, walk_folder
+
+
+def test_inspect_file_matches_scitacean(tmp_path: Path) -> None:
+    path = tmp_path / "data.h5"
+    path.write_bytes(b"12345")
+    file = File.from_local(path)
+
+    result = inspect_file(path)
+    assert result == {
+        "success": True,
+        "size": file.size,
+        "creationTime": file.creation_time,
+        "remotePath": "data.h5",
+        "type": "hdf",
+    }
+    assert isinstance(result["creationTime"], datetime)
+    assert result["creationTime"].tzinfo == UTC
+
+
+def test_inspect_file_detects_folders(tmp_path: Path) -> None:
+    result = inspect_file(tmp_path)
+    assert result is not None
+    assert result["type"] == "folder"
+
+
+def test_inspect_file_returns_none_for_missing_file(tmp_path: Path) -> None:
+    assert inspect_file(tmp_path / "missing") is None
+
+
+def test_inspect_files_keeps_order_and_reports_errors(tmp_path: Path) -> None:
+    paths = []
+    for i in range(50):
+        path = tmp_path / f"file{i}.txt"
+        path.write_text("x" * i)
+        paths.append(path)
+    paths.insert(10, tmp_path / "missing.txt")
+
+    results = list(inspect_files(paths, max_workers=4))
+    assert len(results) == 51
+    assert results[10] == {"success": False, "error": "File not found"}
+    sizes = [r["size"] for r in results[:10] + results[11:]]
+    assert sizes == list(range(50))
+
+
+def make_tree(root: Path) -> None:
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "x.h5").write_bytes(b"1234")
+    (root / "a" / "y.json").write_text("{}")
+    (root / "a" / "b" / "z.h5").write_bytes(b"123")
+    (root / "a" / "b" / "w.dat").write_bytes(b"1")
+
+
+def test_walk_folder_summarizes_tree(tmp_path: Path) -> None:
+    make_tree(tmp_path)
+    summaries = list(walk_folder(tmp_path))
+
+    assert len(summaries) == 1
+    summary = summaries[0]
+    assert summary.done
+    assert not summary.truncated
+    assert summary.n_files == 4
+    assert summary.n_folders == 2
+    assert summary.total_bytes == 10
+    assert summary.types == {"hdf": 2, "json": 1, "file": 1}
+
+
+def test_walk_folder_reports_partial_results(tmp_path: Path) -> None:
+    for i in range(10):
+        (tmp_path / f"{i}.txt").write_text("x")
+    summaries = list(walk_folder(tmp_path, report_every=3))
+
+    assert [s.n_files for s in summaries] == [3, 6, 9, 10]
+    assert [s.done for s in summaries] == [False, False, False, True]
+
+
+def test_walk_folder_stops_at_max_entries(tmp_path: Path) -> None:
+    make_tree(tmp_path)
+    summary = list(walk_folder(tmp_path, max_entries=3))[-1]
+
+    assert summary.done
+    assert summary.truncated
+    assert summary.n_files + summary.n_folders == 3
+
+
+def test_walk_folder_can_be_cancelled(tmp_path: Path) -> None:
+    make_tree(tmp_path)
+    cancel = threading.Event()
+    cancel.set()
+    summary = list(walk_folder(tmp_path, cancel=cancel))[-1]
+
+    assert summary.done
+    assert summary.cancelled
+    assert summary.n_files == 0
+
+
+@pytest.mark.parametrize("report_every", [0, -1, "0"])
+def test_inspect_folder_clamps_report_interval(
+    client: FakeClient, tmp_path: Path, report_every: object
+) -> None:
+    make_tree(tmp_path)
+    widget = DatasetUploadWidget(client, cache=False)
+    sent: list[dict[str, Any]] = []
+    widget.send = lambda content, buffers=None: sent.append(content)  # type: ignore[method-assign]
+
+    _send_folder_summaries(
+        widget,
+        "k",
+        {"path": str(tmp_path), "reportEvery": report_every},
+        threading.Event(),
+    )
+
+    assert sent[-1]["payload"]["done"]
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import scicat_widget
+
+# Generous budget for `import scicat_widget` to catch heavy imports sneaking
+# back in without failing on slow machines. Locally, this takes ~30ms.
+IMPORT_BUDGET_SECONDS = 0.3
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    src = os.fspath(Path(scicat_widget.__file__).parent.parent)
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, (src, os.environ.get("PYTHONPATH")))
+        ),
+    }
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+
+def loaded_modules(code: str, modules: tuple[str, ...]) -> list[str]:
+    result = run_python(
+        f"import sys\n{code}\nprint(*(m for m in {modules!r} if m in sys.modules))"
+    )
+    return result.stdout.split()
+
+
+def test_import_package_does_not_import_dependencies() -> None:
+    assert (
+        loaded_modules(
+            "import scicat_widget",
+            ("anywidget", "IPython", "PIL", "jupyter_host_file_picker", "scitacean"),
+        )
+        == []
+    )
+
+
+def test_import_widget_defers_optional_dependencies() -> None:
+    assert (
+        loaded_modules(
+            "from scicat_widget import DatasetUploadWidget",
+            ("PIL", "jupyter_host_file_picker"),
+        )
+        == []
+    )
+
+
+def test_import_package_is_within_budget() -> None:
+    result = run_python("import scicat_widget", "-X", "importtime")
+    # Lines look like "import time: self [us] | cumulative | package".
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "scicat_widget"
+    )
+    assert cumulative_us / 1e6 < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_attributes_are_importable() -> None:
+    for name in scicat_widget.__all__:
+        assert getattr(scicat_widget, name) is not None
+    assert set(scicat_widget.__all__) <= set(dir(scicat_widget))
+
+
+def test_unknown_attribute_raises_attribute_error() -> None:
+    with pytest.raises(AttributeError, match="does_not_exist"):
+        _ = scicat_widget.does_not_exist
@@ -0,0 +1,273 @@
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import pytest
+from scitacean import PID, Dataset, File, RemotePath, ScicatCommError
+from scitacean.testing.client import FakeClient
+from scitacean.testing.transfer import FakeFileTransfer, FakeUploadConnection
+
+from scicat_widget import (
+    DatasetUploadWidget,
+    TransferConfig,
+    UploadJournal,
+    resume_upload,
+)
+from scicat_widget._upload import UploadError, upload_dataset
+
+
+class FlakyFileTransfer(FakeFileTransfer):
+    """Fake transfer that fails after uploading a number of files."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.fail_after: int | None = None
+        self.uploaded: list[str] = []
+
+    @contextmanager
+    def connect_for_upload(
+        self, dataset: Dataset, representative_file_path: RemotePath
+    ) -> Iterator[FakeUploadConnection]:
+        with super().connect_for_upload(dataset, representative_file_path) as con:
+            upload_files = con.upload_files
+
+            def flaky_upload_files(*files: File) -> list[File]:
+                for file in files:
+                    if self.fail_after is not None and self.fail_after <= 0:
+                        raise ConnectionError("Connection lost")
+                    if self.fail_after is not None:
+                        self.fail_after -= 1
+                    self.uploaded.append(file.remote_path.posix)
+                return upload_files(*files)
+
+            con.upload_files = flaky_upload_files  # type: ignore[method-assign]
+            yield con
+
+
+@pytest.fixture
+def transfer() -> FlakyFileTransfer:
+    return FlakyFileTransfer(source_folder="/remote/{name}")
+
+
+@pytest.fixture
+def journal_dir(tmp_path: Path) -> Path:
+    return tmp_path / "journals"
+
+
+@pytest.mark.parametrize(
+    "config", [None, TransferConfig(workers=2, small_file_size=1)], ids=["seq", "par"]
+)
+def test_interrupted_transfer_resumes_with_missing_files(
+    client: FakeClient,
+    transfer: FlakyFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+    config: TransferConfig | None,
+) -> None:
+    data = make_widget_data("journal-test", 5)
+    journal = UploadJournal.create(client, data, directory=journal_dir)
+    transfer.fail_after = 3
+
+    with pytest.raises(ConnectionError):
+        upload_dataset(client, data, transfer=config, journal=journal)
+    assert len(transfer.files) == 3
+    assert client.datasets == {}
+
+    # Resume from disk as if the kernel had been restarted.
+    [loaded] = UploadJournal.unfinished(journal_dir)
+    assert loaded.n_uploaded_files == 3
+    missing = {f"file{i}.dat" for i in range(5)} - {p.name for p in transfer.files}
+    transfer.fail_after = None
+    transfer.uploaded.clear()
+    result = resume_upload(client, loaded.path, transfer=config)
+
+    assert isinstance(result, Dataset)
+    assert sorted(transfer.uploaded) == sorted(missing)
+    assert len(transfer.files) == 5
+    assert len(client.datasets) == 1
+    assert [f.remote_path.posix for f in result.files] == [
+        f"file{i}.dat" for i in range(5)
+    ]
+    assert UploadJournal.unfinished(journal_dir) == []
+
+
+def test_resume_does_not_create_the_dataset_again(
+    client: FakeClient,
+    transfer: FlakyFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    data = make_widget_data("journal-test", 2)
+    journal = UploadJournal.create(client, data, directory=journal_dir)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise ScicatCommError("Connection lost")
+
+    with monkeypatch.context() as m:
+        m.setattr(client.scicat, "create_orig_datablock", fail)
+        with pytest.raises(RuntimeError, match="original datablocks"):
+            upload_dataset(client, data, journal=journal)
+    assert journal.pid is not None
+    assert len(client.datasets) == 1
+    assert len(transfer.files) == 2
+
+    transfer.uploaded.clear()
+    result = resume_upload(client, UploadJournal.load(journal.path))
+
+    assert isinstance(result, Dataset)
+    assert result.pid == journal.pid
+    assert transfer.uploaded == []
+    assert len(client.datasets) == 1
+    assert len(client.orig_datablocks[journal.pid]) == 1
+    assert not journal.path.exists()
+
+
+def test_resume_does_not_create_attachments_again(
+    client: FakeClient,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    data = make_widget_data("journal-test", 1)
+    data["attachments"] = [
+        {"data": "data:image/png;base64,AAAA", "caption": caption}
+        for caption in ("A", "B", "C")
+    ]
+    journal = UploadJournal.create(client, data, directory=journal_dir)
+
+    create_attachment = client.scicat.create_attachment
+
+    def fail_on_second(attachment: Any) -> Any:
+        if attachment.caption == "B":
+            raise ScicatCommError("Connection lost")
+        return create_attachment(attachment)
+
+    with monkeypatch.context() as m:
+        m.setattr(client.scicat, "create_attachment", fail_on_second)
+        with pytest.raises(RuntimeError, match="attachments"):
+            upload_dataset(client, data, journal=journal)
+    assert journal.pid is not None
+    assert [a.caption for a in client.attachments[journal.pid]] == ["A"]
+
+    result = resume_upload(client, UploadJournal.load(journal.path))
+
+    assert isinstance(result, Dataset)
+    assert [a.caption for a in client.attachments[journal.pid]] == ["A", "B", "C"]
+
+
+def test_failed_dataset_creation_reverts_files(
+    client: FakeClient,
+    transfer: FlakyFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    data = make_widget_data("journal-test", 2)
+    journal = UploadJournal.create(client, data, directory=journal_dir)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise ScicatCommError("Connection lost")
+
+    with monkeypatch.context() as m:
+        m.setattr(client.scicat, "create_dataset_model", fail)
+        with pytest.raises(ScicatCommError):
+            upload_dataset(client, data, journal=journal)
+    assert transfer.files == {}
+    assert journal.pid is None
+    assert UploadJournal.load(journal.path).n_uploaded_files == 0
+
+
+def test_resume_uploads_changed_files_again(
+    client: FakeClient,
+    transfer: FlakyFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    tmp_path: Path,
+    journal_dir: Path,
+) -> None:
+    data = make_widget_data("journal-test", 3)
+    journal = UploadJournal.create(client, data, directory=journal_dir)
+    transfer.fail_after = 2
+    with pytest.raises(ConnectionError):
+        upload_dataset(client, data, journal=journal)
+
+    (tmp_path / "journal-test" / "file0.dat").write_bytes(b"changed")
+    transfer.fail_after = None
+    transfer.uploaded.clear()
+    result = resume_upload(client, UploadJournal.load(journal.path))
+
+    assert isinstance(result, Dataset)
+    assert transfer.uploaded == ["file0.dat", "file2.dat"]
+    assert transfer.files[RemotePath("/remote/journal-test/file0.dat")] == b"changed"
+
+
+def test_cancelled_upload_removes_the_journal(
+    client: FakeClient,
+    transfer: FlakyFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+) -> None:
+    data = make_widget_data("journal-test", 3)
+    journal = UploadJournal.create(client, data, directory=journal_dir)
+    transfer.fail_after = 2
+    with pytest.raises(ConnectionError):
+        upload_dataset(client, data, journal=journal)
+
+    cancel = threading.Event()
+    cancel.set()
+    result = upload_dataset(client, data, cancel=cancel, journal=journal)
+
+    assert isinstance(result, UploadError)
+    assert result.cancelled
+    assert transfer.files == {}
+    assert not journal.path.exists()
+
+
+def test_load_ignores_incomplete_last_record(
+    client: FakeClient,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+) -> None:
+    journal = UploadJournal.create(
+        client, make_widget_data("journal-test", 1), directory=journal_dir
+    )
+    journal.record_done("origdatablocks")
+    with journal.path.open("a") as f:
+        f.write('{"pid": "trunc')
+
+    loaded = UploadJournal.load(journal.path)
+    assert loaded.is_done("origdatablocks")
+    assert loaded.pid is None
+    assert loaded.payload == journal.payload
+
+
+def test_resume_requires_the_same_scicat(
+    client: FakeClient,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+) -> None:
+    journal = UploadJournal.create(
+        client, make_widget_data("journal-test", 1), directory=journal_dir
+    )
+    other = FakeClient.without_login(url="https://other.scicat/api/v3")
+    with pytest.raises(ValueError, match=r"other\.scicat"):
+        resume_upload(other, journal)
+
+
+def test_widget_resumes_journal(
+    client: FakeClient,
+    make_widget_data: Callable[..., dict[str, Any]],
+    journal_dir: Path,
+) -> None:
+    data = make_widget_data("journal-test", 2)
+    journal = UploadJournal.create(client, data, directory=journal_dir)
+    journal.record_pid(PID(pid="some-pid"))
+
+    widget = DatasetUploadWidget(client, cache=False, resume=journal)
+
+    assert widget._journal is journal
+    assert widget.initial["datasetName"] == "journal-test"
+    assert widget.initial["pendingFiles"] == 2
+    assert "datasetName" in widget.config["lockedFields"]
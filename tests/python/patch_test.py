@@ -0,0 +1,92 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from scitacean import Dataset
+from scitacean.testing.client import FakeClient
+
+from scicat_widget import DatasetUploadWidget
+from scicat_widget._patch import apply_patch, diff_top_level, make_set_op
+
+
+def test_apply_patch_sets_values() -> None:
+    document: dict[str, Any] = {"a": 1, "b": {"c": [1, 2, 3]}}
+    apply_patch(
+        document,
+        [
+            {"op": "replace", "path": "/a", "value": 2},
+            {"op": "add", "path": "/b/c/-", "value": 4},
+            {"op": "add", "path": "/b/c/0", "value": 0},
+            {"op": "replace", "path": "/b/c/1", "value": 10},
+            {"op": "remove", "path": "/b/c/2"},
+            {"op": "add", "path": "/d~1e", "value": "x"},
+        ],
+    )
+    assert document == {"a": 2, "b": {"c": [0, 10, 3, 4]}, "d/e": "x"}
+
+
+def test_apply_patch_replace_requires_existing_key() -> None:
+    with pytest.raises(KeyError):
+        apply_patch({}, [{"op": "replace", "path": "/a", "value": 1}])
+
+
+def test_make_set_op_replaces_list_elements() -> None:
+    document = {"a": [1, 2]}
+    assert make_set_op(document, "/a/0", 3)["op"] == "replace"
+    assert make_set_op(document, "/b", 3)["op"] == "add"
+
+
+def test_diff_top_level_only_contains_changes() -> None:
+    old = {"same": [1], "changed": 1, "removed": 2}
+    new = {"same": [1], "changed": 3, "added": 4}
+    assert diff_top_level(old, new) == [
+        {"op": "remove", "path": "/removed"},
+        {"op": "add", "path": "/changed", "value": 3},
+        {"op": "add", "path": "/added", "value": 4},
+    ]
+
+
+def make_widget() -> tuple[DatasetUploadWidget, list[dict[str, Any]]]:
+    client = FakeClient.without_login(url="https://fake.scicat/api/v3")
+    widget = DatasetUploadWidget(
+        client, initial=Dataset(type="raw", name="Old name"), cache=False
+    )
+    asyncio.run(widget.ready())
+    sent: list[dict[str, Any]] = []
+    widget.send = sent.append  # type: ignore[method-assign, assignment]
+    return widget, sent
+
+
+def test_update_initial_sends_patch() -> None:
+    widget, sent = make_widget()
+    widget.update_initial("datasetName", "New name")
+
+    assert widget.initial["datasetName"] == "New name"
+    assert [msg["payload"]["ops"] for msg in sent] == [
+        [{"op": "add", "path": "/datasetName", "value": "New name"}]
+    ]
+
+
+def test_append_files_sends_only_new_files(tmp_path: Path) -> None:
+    widget, sent = make_widget()
+    paths = [tmp_path / "a.dat", tmp_path / "b.dat"]
+    for path in paths:
+        path.write_bytes(b"data")
+
+    widget.append_files([*paths, tmp_path / "missing.dat"])
+
+    assert [f["localPath"] for f in widget.initial["files"]] == [
+        str(path) for path in paths
+    ]
+    [msg] = sent
+    assert msg["type"] == "res:patch"
+    assert [op["path"] for op in msg["payload"]["ops"]] == ["/files", *["/files/-"] * 2]
+
+
+def test_patches_survive_reloading_scicat_data() -> None:
+    widget, _ = make_widget()
+    widget.update_initial("description", "From a pipeline")
+    widget.refresh()
+    asyncio.run(widget.ready())
+    assert widget.initial["description"] == "From a pipeline"
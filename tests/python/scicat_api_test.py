@@ -0,0 +1,246 @@
+import json
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from scitacean import ScicatCommError, model
+from scitacean.util.credentials import StrStorage
+
+from scicat_widget import ScicatCache
+from scicat_widget._scicat_api import (
+    get_cached_user_and_scicat_info,
+    get_proposals,
+    get_user_and_scicat_info,
+    iter_proposals,
+)
+
+
+class FakeScicat:
+    def __init__(
+        self,
+        *,
+        fail_instruments: bool = False,
+        support_filter: bool = True,
+        n_proposals: int = 3,
+        ignore_filter: bool = False,
+        ignore_skip: bool = False,
+        token: str = "token",
+        user_id: str = "user-id",
+    ) -> None:
+        self._token = StrStorage(token)
+        self.user_id = user_id
+        self.fail_instruments = fail_instruments
+        self.support_filter = support_filter
+        self.ignore_filter = ignore_filter
+        self.ignore_skip = ignore_skip
+        self.proposals = [_proposal_json(f"p-{i}") for i in range(1, n_proposals + 1)]
+        self.threads: dict[str, str] = {}
+        self.proposal_requests: list[dict[str, Any] | None] = []
+
+    def call_endpoint(
+        self,
+        *,
+        cmd: str,
+        url: str,
+        operation: str,
+        params: dict[str, Any] | None = None,
+        **_: Any,
+    ) -> Any:
+        self.threads[url] = threading.current_thread().name
+        if url == "users/my/identity":
+            return {
+                "userId": self.user_id,
+                "profile": {
+                    "displayName": "Ponder Stibbons",
+                    "email": "ponder@uu.am",
+                    "accessGroups": ["p-1", "p-3"],
+                },
+            }
+        if url == "proposals":
+            return self._get_proposals(params)
+        raise ScicatCommError(f"Unknown endpoint {url}")
+
+    def get_all_instrument_models(self) -> list[model.DownloadInstrument]:
+        self.threads["instruments"] = threading.current_thread().name
+        if self.fail_instruments:
+            raise ScicatCommError("Cannot get instruments")
+        return [
+            model.DownloadInstrument(
+                pid="instr-1", name="Tarsier", uniqueName="tarsier"
+            )
+        ]
+
+    def _get_proposals(self, params: dict[str, Any] | None) -> list[dict[str, Any]]:
+        if params is None:
+            self.proposal_requests.append(None)
+            return self.proposals
+        if not self.support_filter:
+            raise ScicatCommError("Bad filter")
+        filter_ = json.loads(params["filter"])
+        self.proposal_requests.append(filter_)
+        if self.ignore_filter:
+            return self.proposals
+        ids = filter_["where"]["proposalId"]["$in"]
+        matching = [p for p in self.proposals if p["proposalId"] in ids]
+        skip = 0 if self.ignore_skip else filter_["limits"]["skip"]
+        return matching[skip : skip + filter_["limits"]["limit"]]
+
+
+class FakeProfile:
+    url = "https://fake.scicat/api/v3"
+
+
+class FakeClient:
+    def __init__(self, scicat: FakeScicat) -> None:
+        self.scicat = scicat
+        self.profile = FakeProfile()
+
+
+def _proposal_json(proposal_id: str) -> dict[str, Any]:
+    return {
+        "proposalId": proposal_id,
+        "title": f"Proposal {proposal_id}",
+        "startTime": datetime(2025, 1, 2, tzinfo=UTC).isoformat(),
+        "instrumentIds": ["instr-1"],
+    }
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_get_user_and_scicat_info(concurrent: bool) -> None:
+    client = FakeClient(FakeScicat())
+    user_info, instruments = get_user_and_scicat_info(
+        client,  # type: ignore[arg-type]
+        concurrent=concurrent,
+    )
+
+    assert user_info.user_id == "user-id"
+    assert user_info.access_groups == ["p-1", "p-3"]
+    assert [p.id_ for p in user_info.proposals] == ["p-1", "p-3"]
+    assert [i.unique_name for i in instruments] == ["tarsier"]
+
+
+def test_get_user_and_scicat_info_concurrent_uses_separate_thread() -> None:
+    scicat = FakeScicat()
+    get_user_and_scicat_info(FakeClient(scicat))  # type: ignore[arg-type]
+    assert scicat.threads["instruments"] != scicat.threads["users/my/identity"]
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_get_user_and_scicat_info_propagates_errors(concurrent: bool) -> None:
+    client = FakeClient(FakeScicat(fail_instruments=True))
+    with pytest.raises(ScicatCommError, match="Cannot get instruments"):
+        get_user_and_scicat_info(
+            client,  # type: ignore[arg-type]
+            concurrent=concurrent,
+        )
+
+
+def test_get_proposals_filters_on_server() -> None:
+    scicat = FakeScicat(n_proposals=10)
+    proposals = get_proposals(
+        FakeClient(scicat),  # type: ignore[arg-type]
+        ["p-2", "p-5", "p-7", "not-a-proposal"],
+    )
+    assert [p.id_ for p in proposals] == ["p-2", "p-5", "p-7"]
+    assert None not in scicat.proposal_requests
+
+
+def test_iter_proposals_uses_batches_and_pages() -> None:
+    scicat = FakeScicat(n_proposals=10)
+    ids = [f"p-{i}" for i in range(1, 8)]
+    proposals = list(
+        iter_proposals(
+            FakeClient(scicat),  # type: ignore[arg-type]
+            ids,
+            batch_size=4,
+            page_size=3,
+        )
+    )
+    assert [p["proposalId"] for p in proposals] == ids
+    batches = [r["where"]["proposalId"]["$in"] for r in scicat.proposal_requests]  # type: ignore[index]
+    assert batches == [ids[:4], ids[:4], ids[4:], ids[4:]]
+
+
+def test_get_proposals_falls_back_to_full_download() -> None:
+    scicat = FakeScicat(support_filter=False)
+    proposals = get_proposals(
+        FakeClient(scicat),  # type: ignore[arg-type]
+        ["p-1", "p-3"],
+    )
+    assert [p.id_ for p in proposals] == ["p-1", "p-3"]
+    assert scicat.proposal_requests[-1] is None
+
+
+@pytest.mark.parametrize("ignore", ["filter", "skip"])
+def test_get_proposals_falls_back_if_scicat_ignores_the_filter(ignore: str) -> None:
+    scicat = FakeScicat(
+        n_proposals=5, ignore_filter=ignore == "filter", ignore_skip=ignore == "skip"
+    )
+    proposals = get_proposals(
+        FakeClient(scicat),  # type: ignore[arg-type]
+        ["p-1", "p-2", "p-3", "p-4"],
+        page_size=2,
+    )
+    assert [p.id_ for p in proposals] == ["p-1", "p-2", "p-3", "p-4"]
+    assert len(scicat.proposal_requests) <= 3
+    assert scicat.proposal_requests[-1] is None
+
+
+def test_get_user_and_scicat_info_uses_cache(tmp_path: Path) -> None:
+    cache = ScicatCache(tmp_path)
+    scicat = FakeScicat()
+    downloaded = get_user_and_scicat_info(
+        FakeClient(scicat),  # type: ignore[arg-type]
+        cache=cache,
+    )
+
+    scicat.threads.clear()
+    cached = get_user_and_scicat_info(
+        FakeClient(scicat),  # type: ignore[arg-type]
+        cache=cache,
+    )
+    assert cached == downloaded
+    assert scicat.threads == {}
+
+
+def test_cached_user_info_is_not_shared_between_tokens(tmp_path: Path) -> None:
+    cache = ScicatCache(tmp_path)
+    first = FakeClient(FakeScicat(token="secret-1", user_id="ponder"))
+    second = FakeClient(FakeScicat(token="secret-2", user_id="rincewind"))
+    first_info, _ = get_user_and_scicat_info(
+        first,  # type: ignore[arg-type]
+        cache=cache,
+    )
+    assert (
+        get_cached_user_and_scicat_info(second, cache)  # type: ignore[arg-type]
+        is None
+    )
+
+    second_info, _ = get_user_and_scicat_info(
+        second,  # type: ignore[arg-type]
+        cache=cache,
+    )
+    assert first_info.user_id == "ponder"
+    assert second_info.user_id == "rincewind"
+    # Tokens are never stored.
+    for path in tmp_path.rglob("*"):
+        if path.is_file():
+            assert b"secret" not in path.read_bytes()
+
+
+def test_get_cached_user_and_scicat_info_returns_stale_data(tmp_path: Path) -> None:
+    cache = ScicatCache(tmp_path, ttl=timedelta(seconds=0))
+    client = FakeClient(FakeScicat())
+    assert (
+        get_cached_user_and_scicat_info(client, cache)  # type: ignore[arg-type]
+        is None
+    )
+
+    downloaded = get_user_and_scicat_info(
+        client,  # type: ignore[arg-type]
+        cache=cache,
+    )
+    cached = get_cached_user_and_scicat_info(client, cache)  # type: ignore[arg-type]
+    assert cached == downloaded
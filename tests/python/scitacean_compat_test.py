@@ -0,0 +1,78 @@
+# Checks for the private parts of Scitacean that the widget relies on.
+# If any of these fail after upgrading Scitacean, update
+# _session._PooledScicatClient, _scicat_api._cache_user,
+# _upload._upload_with_journal, _upload._convert_file,
+# _dedup.reuse_existing_files, and the version bound in pyproject.toml.
+
+import dataclasses
+import inspect
+from datetime import timedelta
+from pathlib import Path
+
+from scitacean import Client, Dataset, File
+from scitacean.client import ScicatClient, _files_to_upload, _strip_token
+
+from scicat_widget._session import _PooledScicatClient
+
+
+def test_scicat_client_has_private_attributes() -> None:
+    scicat = Client.from_token(url="https://scicat.example/api/v3", token="abc").scicat
+    assert scicat._base_url == "https://scicat.example/api"
+    assert scicat._token is not None
+    assert scicat._token.get_str() == "abc"
+    assert isinstance(scicat._timeout, timedelta)
+
+
+def test_pooled_client_overrides_send_to_scicat() -> None:
+    assert inspect.signature(_PooledScicatClient._send_to_scicat) == (
+        inspect.signature(ScicatClient._send_to_scicat)
+    )
+
+
+def test_strip_token_hides_the_token() -> None:
+    assert _strip_token("Bearer abc", "abc") == "Bearer <HIDDEN>"
+
+
+def test_upload_helpers_have_expected_signatures() -> None:
+    assert list(inspect.signature(_files_to_upload).parameters) == [
+        "dataset",
+        "file_transfer",
+    ]
+    assert list(inspect.signature(Client._connect_for_file_upload).parameters) == [
+        "self",
+        "dataset",
+        "files_to_upload",
+    ]
+
+
+def test_file_computes_checksums_with_checksum_cache(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc")
+    calls = []
+
+    class RecordingChecksum:
+        def get(self, *, path: Path, algorithm: str) -> str:
+            calls.append((path, algorithm))
+            return "recorded"
+
+    file = File.from_local(path)
+    assert "_checksum_cache" in {field.name for field in dataclasses.fields(File)}
+    file = dataclasses.replace(
+        file,
+        checksum_algorithm="blake2b",
+        _checksum_cache=RecordingChecksum(),  # type: ignore[arg-type]
+    )
+    assert file.checksum() == "recorded"
+    assert calls == [(file.local_path, "blake2b")]
+
+
+def test_dataset_replace_can_drop_orig_datablocks(tmp_path: Path) -> None:
+    for name in ("a", "b"):
+        (tmp_path / name).write_bytes(b"abc")
+    dataset = Dataset(type="raw", source_folder="/remote")
+    dataset.add_local_files(tmp_path / "a")
+
+    replaced = dataset.replace(_orig_datablocks=[])
+    assert list(replaced.files) == []
+    replaced.add_local_files(tmp_path / "b")
+    assert [file.remote_path.posix for file in replaced.files] == ["b"]
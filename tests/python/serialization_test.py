@@ -0,0 +1,82 @@
+import warnings
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from scitacean import Dataset, File
+
+from scicat_widget._comm import _send_initial_files
+from scicat_widget._serialization import (
+    iter_serialized_files,
+    local_files,
+    serialize_dataset,
+)
+
+
+def make_dataset(tmp_path: Path, n_files: int) -> Dataset:
+    dataset = Dataset(type="raw", name="files", source_folder="/remote/files")
+    for i in range(n_files):
+        path = tmp_path / f"file{i}.dat"
+        path.write_bytes(b"x" * i)
+        dataset.add_files(File.from_local(path))
+    return dataset
+
+
+def test_serialize_dataset_serializes_files_in_order(tmp_path: Path) -> None:
+    dataset = make_dataset(tmp_path, 20)
+    files = serialize_dataset(dataset)["files"]
+    assert [file["localPath"] for file in files] == [
+        str(tmp_path / f"file{i}.dat") for i in range(20)
+    ]
+    assert [file["size"] for file in files] == list(range(20))
+    assert all("success" not in file for file in files)
+
+
+def test_iter_serialized_files_skips_missing_files(tmp_path: Path) -> None:
+    dataset = make_dataset(tmp_path, 3)
+    (tmp_path / "file1.dat").unlink()
+    files = list(iter_serialized_files(dataset.files))
+    assert [file["localPath"] for file in files] == [
+        str(tmp_path / "file0.dat"),
+        str(tmp_path / "file2.dat"),
+    ]
+
+
+def test_serialize_dataset_can_exclude_files(tmp_path: Path) -> None:
+    assert "files" not in serialize_dataset(
+        make_dataset(tmp_path, 3), include_files=False
+    )
+
+
+def test_local_files_warns_once_for_dropped_fields(tmp_path: Path) -> None:
+    paths = [tmp_path / f"file{i}.dat" for i in range(3)]
+    for path in paths:
+        path.touch()
+    files = [File.from_local(path, remote_perm="755") for path in paths]
+
+    with pytest.warns(UserWarning, match="remote_perm of 3 file") as record:
+        local_files(files)
+    assert len(record) == 1
+
+
+def test_local_files_does_not_warn_without_dropped_fields(tmp_path: Path) -> None:
+    path = tmp_path / "file.dat"
+    path.touch()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert len(local_files([File.from_local(path)])) == 1
+
+
+def test_send_initial_files_sends_chunks(tmp_path: Path) -> None:
+    sent: list[dict[str, Any]] = []
+    dataset = make_dataset(tmp_path, 5)
+    widget = SimpleNamespace(
+        _initial_files=local_files(dataset.files), send=sent.append
+    )
+
+    _send_initial_files(widget, "key", 2)  # type: ignore[arg-type]
+
+    assert [msg["type"] for msg in sent] == ["res:initial-files"] * 3
+    assert [len(msg["payload"]["files"]) for msg in sent] == [2, 2, 1]
+    assert [msg["payload"]["done"] for msg in sent] == [False, False, True]
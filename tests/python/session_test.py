@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+from scitacean import Client, ScicatCommError
+from scitacean.testing.client import FakeClient
+
+from scicat_widget import DatasetUploadWidget, ScicatCache, ScicatSession
+from scicat_widget._model import Instrument, UserInfo
+
+
+def fake_client() -> FakeClient:
+    return FakeClient.without_login(url="https://fake.scicat/api/v3")
+
+
+@pytest.fixture
+def downloads(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    def get_user_and_scicat_info(
+        client: Client, *, cache: ScicatCache | None = None
+    ) -> tuple[UserInfo, list[Instrument]]:
+        calls.append(f"Person {len(calls)}")
+        user_info = UserInfo(
+            user_id="user-id",
+            display_name=calls[-1],
+            email="person@uu.am",
+            access_groups=["group"],
+            orcid_id=None,
+            proposals=[],
+        )
+        return user_info, []
+
+    monkeypatch.setattr(
+        "scicat_widget._session.get_user_and_scicat_info", get_user_and_scicat_info
+    )
+    return calls
+
+
+def test_widgets_of_the_same_client_share_a_session(downloads: list[str]) -> None:
+    client = fake_client()
+    first = DatasetUploadWidget(client, cache=False)
+    second = DatasetUploadWidget(client, cache=False, locked=["datasetName"])
+    asyncio.run(first.ready())
+    asyncio.run(second.ready())
+
+    assert first._session is second._session
+    assert downloads == ["Person 0"]
+    assert second.initial["owners"][0]["name"] == "Person 0"
+    assert second.staticData["accessGroups"] == ["group"]
+    assert first.config["lockedFields"] == []
+    assert second.config["lockedFields"] == ["datasetName"]
+
+
+def test_sessions_are_separate_for_clients_and_caches(tmp_path: Any) -> None:
+    client = fake_client()
+    session = ScicatSession.for_client(client, cache=False)
+    assert ScicatSession.for_client(client, cache=False) is session
+    assert ScicatSession.for_client(fake_client(), cache=False) is not session
+    cache = ScicatCache(tmp_path)
+    assert ScicatSession.for_client(client, cache=cache) is not session
+
+
+def test_widgets_do_not_share_initial_data(downloads: list[str]) -> None:
+    client = fake_client()
+    first = DatasetUploadWidget(client, cache=False)
+    second = DatasetUploadWidget(client, cache=False)
+    asyncio.run(first.ready())
+    asyncio.run(second.ready())
+    first.send = lambda *args, **kwargs: None  # type: ignore[method-assign]
+
+    first.update_initial("owners/0/name", "Someone else")
+    assert second.initial["owners"][0]["name"] == "Person 0"
+
+
+def test_refresh_updates_all_widgets_of_the_session(downloads: list[str]) -> None:
+    client = fake_client()
+    first = DatasetUploadWidget(client, cache=False)
+    second = DatasetUploadWidget(client, cache=False)
+    asyncio.run(first.ready())
+    asyncio.run(second.ready())
+    sent: list[Any] = []
+    second.send = lambda content, buffers=None: sent.append(content)  # type: ignore[method-assign]
+
+    first.refresh()
+    asyncio.run(first.ready())
+    asyncio.run(second.ready())
+
+    assert downloads == ["Person 0", "Person 1"]
+    assert second.initial["owners"][0]["name"] == "Person 1"
+    assert sent[0]["type"] == "res:patch"
+
+
+def test_session_sends_requests_through_one_http_client() -> None:
+    client = Client.without_login(url="https://scicat.example/api/v3")
+    session = ScicatSession(client)
+    requests: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[{"proposalId": "p-1"}])
+
+    session.client.scicat.http = httpx.Client(  # type: ignore[attr-defined]
+        transport=httpx.MockTransport(handle)
+    )
+    for _ in range(2):
+        result = session.client.scicat.call_endpoint(
+            cmd="GET", url="proposals", operation="get_proposals"
+        )
+
+    assert result == [{"proposalId": "p-1"}]
+    assert [str(r.url) for r in requests] == [
+        "https://scicat.example/api/v3/proposals"
+    ] * 2
+    session.close()
+
+
+def test_widget_keeps_cached_data_if_scicat_is_unreachable(
+    tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cached_user = UserInfo(
+        user_id="user-id",
+        display_name="Cached person",
+        email="person@uu.am",
+        access_groups=["group"],
+        orcid_id=None,
+        proposals=[],
+    )
+    monkeypatch.setattr(
+        "scicat_widget._session.get_cached_user_and_scicat_info",
+        lambda client, cache: (cached_user, []),
+    )
+    calls: list[int] = []
+
+    def get_user_and_scicat_info(
+        client: Client, *, cache: ScicatCache | None = None
+    ) -> tuple[UserInfo, list[Instrument]]:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise ScicatCommError("Connection refused")
+        return cached_user.model_copy(update={"display_name": "Fresh person"}), []
+
+    monkeypatch.setattr(
+        "scicat_widget._session.get_user_and_scicat_info", get_user_and_scicat_info
+    )
+    widget = DatasetUploadWidget(fake_client(), cache=ScicatCache(tmp_path))
+    sent: list[Any] = []
+    widget.send = lambda content, buffers=None: sent.append(content)  # type: ignore[method-assign]
+    asyncio.run(widget.ready())
+
+    assert not widget.loading
+    assert widget.initial["owners"][0]["name"] == "Cached person"
+    assert widget.staticData["accessGroups"] == ["group"]
+    assert sent == []
+
+    # The failure is not remembered.
+    assert not widget._session.scicat_data_loaded
+    initial_data, _ = widget._session.scicat_data()
+    assert initial_data["owners"][0]["name"] == "Fresh person"
+    assert calls == [0, 1]
@@ -0,0 +1,58 @@
+import pytest
+
+from scicat_widget._stats import StatsRecorder, payload_size
+
+
+def test_record_call_updates_counts_and_histogram() -> None:
+    stats = StatsRecorder()
+    stats.record_call("req:a", 0.002)
+    stats.record_call("req:a", 2.0, error=True)
+
+    [(name, entry)] = stats.snapshot().items()
+    assert name == "req:a"
+    assert entry["count"] == 2
+    assert entry["errors"] == 1
+    assert entry["max_seconds"] == 2.0
+    assert entry["mean_seconds"] == pytest.approx(1.001)
+    assert entry["histogram"] == {"<=0.005s": 1, "<=5s": 1}
+
+
+def test_timed_records_errors() -> None:
+    stats = StatsRecorder()
+    with pytest.raises(RuntimeError), stats.timed("req:a"):
+        raise RuntimeError("failed")
+    assert stats.snapshot()["req:a"]["errors"] == 1
+
+
+def test_record_bytes() -> None:
+    stats = StatsRecorder()
+    stats.record_bytes("req:a", bytes_in=10)
+    stats.record_bytes("req:a", bytes_out=5)
+    entry = stats.snapshot()["req:a"]
+    assert (entry["count"], entry["bytes_in"], entry["bytes_out"]) == (0, 10, 5)
+
+
+def test_snapshot_can_reset() -> None:
+    stats = StatsRecorder()
+    stats.record_call("req:a", 0.1)
+    assert "req:a" in stats.snapshot(reset=True)
+    assert stats.snapshot() == {}
+
+
+def test_payload_size_includes_buffers() -> None:
+    content = {"type": "res:load-image", "payload": {"image": {"$buffer": 0}}}
+    assert payload_size(content, [b"1234"]) == payload_size(content) + 4
+
+
+def test_logging_measures_bytes_until_stopped() -> None:
+    stats = StatsRecorder()
+    before = stats.measure_bytes
+    stats.log_every(60)
+    try:
+        during = stats.measure_bytes
+        stats.record_bytes("res:a", bytes_out=5)
+        assert stats.format_line() == "res:a: n=0 mean=0.0ms max=0.0ms out=5B"
+    finally:
+        stats.log_every(None)
+    after = stats.measure_bytes
+    assert (before, during, after) == (False, True, False)
@@ -0,0 +1,51 @@
+from scicat_widget._serialization import load_and_serialize_techniques
+from scicat_widget._techniques import TechniqueIndex, get_technique_index
+
+TECHNIQUES = {
+    "http://purl.org/pan-science/PaNET/PaNET01": ["x-ray diffraction"],
+    "http://purl.org/pan-science/PaNET/PaNET02": ["neutron diffraction"],
+    "http://purl.org/pan-science/PaNET/PaNET03": ["diffraction", "scattering"],
+    "http://purl.org/pan-science/PaNET/PaNET04": ["small angle scattering"],
+}
+
+
+def test_technique_index_prefix() -> None:
+    index = TechniqueIndex(TECHNIQUES)
+    assert index.prefix == "http://purl.org/pan-science/PaNET"
+
+
+def test_technique_index_search_ranks_exact_prefix_and_substring_matches() -> None:
+    index = TechniqueIndex(TECHNIQUES)
+    results = index.search("diffraction")
+    assert [r["id"] for r in results] == ["PaNET03", "PaNET02", "PaNET01"]
+
+
+def test_technique_index_search_matches_ids_and_secondary_labels() -> None:
+    index = TechniqueIndex(TECHNIQUES)
+    assert index.search("panet04") == [
+        {"id": "PaNET04", "name": "small angle scattering"}
+    ]
+    assert [r["id"] for r in index.search("scatter")] == ["PaNET03", "PaNET04"]
+
+
+def test_technique_index_search_limit() -> None:
+    index = TechniqueIndex(TECHNIQUES)
+    assert len(index.search("", limit=2)) == 2
+    assert len(index.search("a", limit=3)) == 3
+
+
+def test_technique_index_lookup() -> None:
+    index = TechniqueIndex(TECHNIQUES)
+    assert index.lookup(["PaNET02", "unknown"]) == [
+        {"id": "PaNET02", "name": "neutron diffraction"}
+    ]
+
+
+def test_load_and_serialize_techniques_only_includes_requested() -> None:
+    index = get_technique_index()
+    all_techniques = load_and_serialize_techniques()
+    assert len(all_techniques["techniques"]) == len(index)
+
+    some = load_and_serialize_techniques(["PaNET01012"])
+    assert some["prefix"] == all_techniques["prefix"]
+    assert [t["id"] for t in some["techniques"]] == ["PaNET01012"]
@@ -0,0 +1,96 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from scicat_widget import ThumbnailConfig, _thumbnails
+from scicat_widget._thumbnails import load_image, load_thumbnail
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def make_noise_image(path: Path, size: tuple[int, int], mode: str = "RGB") -> None:
+    image = Image.effect_noise(size, 64).convert(mode)
+    image.save(path)
+
+
+def test_load_thumbnail_keeps_small_images(tmp_path: Path) -> None:
+    path = tmp_path / "small.png"
+    make_noise_image(path, (32, 32))
+
+    thumbnail = load_thumbnail(path)
+    assert thumbnail.mime == "image/png"
+    assert thumbnail.decoded_data() == path.read_bytes()
+
+
+def test_load_thumbnail_downscales_large_images(tmp_path: Path) -> None:
+    path = tmp_path / "large.png"
+    make_noise_image(path, (800, 600))
+    config = ThumbnailConfig(max_dimension=200, max_bytes=20_000)
+
+    thumbnail = load_thumbnail(path, config)
+    assert thumbnail.mime == "image/jpeg"
+    assert len(thumbnail.decoded_data()) <= config.max_bytes
+    with Image.open(io.BytesIO(thumbnail.decoded_data())) as image:
+        assert image.size == (200, 150)
+
+
+def test_load_thumbnail_keeps_transparency(tmp_path: Path) -> None:
+    path = tmp_path / "large.png"
+    make_noise_image(path, (800, 600), mode="RGBA")
+    config = ThumbnailConfig(max_dimension=100)
+
+    thumbnail = load_thumbnail(path, config)
+    assert thumbnail.mime == "image/png"
+    with Image.open(io.BytesIO(thumbnail.decoded_data())) as image:
+        assert image.mode == "RGBA"
+        assert max(image.size) == 100
+
+
+def test_load_thumbnail_downscales_16_bit_images(tmp_path: Path) -> None:
+    path = tmp_path / "detector.png"
+    noise = Image.effect_noise((800, 600), 64).convert("I")
+    noise.point(lambda v: v * 200).convert("I;16").save(path)
+    config = ThumbnailConfig(max_dimension=100)
+
+    thumbnail = load_thumbnail(path, config)
+    assert thumbnail.mime == "image/jpeg"
+    with Image.open(io.BytesIO(thumbnail.decoded_data())) as image:
+        assert image.size == (100, 75)
+        assert image.getextrema()[0][1] > 128
+
+
+def test_load_image_falls_back_to_original_if_downscaling_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "large.png"
+    make_noise_image(path, (800, 600))
+
+    def fail(*_: object) -> None:
+        raise ValueError("image has wrong mode")
+
+    monkeypatch.setattr(_thumbnails, "_shrink", fail)
+    config = ThumbnailConfig(max_dimension=100)
+    assert load_image(path, config) == ("image/png", path.read_bytes())
+
+
+def test_load_image_is_cached(tmp_path: Path) -> None:
+    path = tmp_path / "large.png"
+    make_noise_image(path, (800, 600))
+    config = ThumbnailConfig(max_dimension=100)
+
+    assert load_image(path, config) is load_image(path, config)
+
+
+def test_load_image_does_not_cache_unchanged_images(tmp_path: Path) -> None:
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"not an image")
+
+    first = load_image(path)
+    assert first == ("text/plain", b"not an image")
+    assert load_image(path)[1] is not first[1]
+
+
+def test_load_thumbnail_raises_for_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        load_thumbnail(tmp_path / "missing.png")
@@ -0,0 +1,302 @@
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from scitacean import PID, Dataset, File
+from scitacean.testing.client import FakeClient
+from scitacean.testing.transfer import FakeFileTransfer, FakeUploadConnection
+
+from scicat_widget import DatasetUploadWidget, DispatchConfig, TransferConfig
+from scicat_widget._comm import _resolve_buffers, _run_upload, handle_event
+from scicat_widget._transfer import UploadProgress, _make_batches
+from scicat_widget._upload import (
+    DatasetValidator,
+    UploadError,
+    convert_widget_field,
+    make_dataset_from_widget_data,
+    upload_dataset,
+)
+
+
+def test_upload_dataset_reports_progress(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+) -> None:
+    progress: list[UploadProgress] = []
+    result = upload_dataset(
+        client, make_widget_data("upload-test", 3), on_progress=progress.append
+    )
+
+    assert isinstance(result, Dataset)
+    assert len(transfer.files) == 3
+    assert [p.files_done for p in progress] == [0, 1, 2, 3]
+    assert [p.bytes_done for p in progress] == [0, 1, 3, 6]
+    assert all(p.bytes_total == 6 for p in progress)
+    assert all(p.files_total == 3 for p in progress)
+    assert progress[-1].current_file is None
+
+
+def test_upload_dataset_can_be_cancelled(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+) -> None:
+    cancel = threading.Event()
+
+    def on_progress(progress: UploadProgress) -> None:
+        if progress.files_done == 2:
+            cancel.set()
+
+    result = upload_dataset(
+        client,
+        make_widget_data("upload-test", 3),
+        on_progress=on_progress,
+        cancel=cancel,
+    )
+
+    assert isinstance(result, UploadError)
+    assert result.cancelled
+    assert transfer.files == {}
+    assert len(transfer.reverted) == 2
+    assert client.datasets == {}
+
+
+def test_failed_upload_reverts_uploaded_files(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    upload_files = FakeUploadConnection.upload_files
+
+    def flaky_upload_files(self: FakeUploadConnection, *files: File) -> list[File]:
+        if any(file.remote_path.posix == "file2.dat" for file in files):
+            raise ConnectionError("Connection lost")
+        return upload_files(self, *files)
+
+    monkeypatch.setattr(FakeUploadConnection, "upload_files", flaky_upload_files)
+    with pytest.raises(ConnectionError):
+        upload_dataset(
+            client, make_widget_data("upload-test", 3), on_progress=lambda _: None
+        )
+
+    assert transfer.files == {}
+    assert len(transfer.reverted) == 2
+    assert client.datasets == {}
+
+
+def test_make_batches_groups_small_files() -> None:
+    files = [File.from_local(f"f{i}") for i in range(6)]
+    sizes = [1, 2, 10, 3, 4, 1]
+    config = TransferConfig(workers=2, small_file_size=5, max_batch_files=2)
+    batches = _make_batches(files, sizes, config)
+    assert [[f.remote_path.posix for f in b.files] for b in batches] == [
+        ["f0", "f1"],
+        ["f2"],
+        ["f3", "f4"],
+        ["f5"],
+    ]
+    assert [b.n_bytes for b in batches] == [3, 10, 7, 1]
+
+
+def test_upload_dataset_parallel(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+) -> None:
+    n_files = 20
+    progress: list[UploadProgress] = []
+    result = upload_dataset(
+        client,
+        make_widget_data("upload-test", n_files),
+        on_progress=progress.append,
+        transfer=TransferConfig(
+            workers=4, small_file_size=30, max_batch_files=3, max_in_flight_bytes=50
+        ),
+    )
+
+    assert isinstance(result, Dataset)
+    assert [f.remote_path.posix for f in result.files] == [
+        f"file{i}.dat" for i in range(n_files)
+    ]
+    assert len(transfer.files) == n_files
+    assert progress[-1].files_done == n_files
+    assert progress[-1].bytes_done == progress[-1].bytes_total == 210
+
+
+def test_upload_dataset_parallel_can_be_cancelled(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+) -> None:
+    cancel = threading.Event()
+
+    def on_progress(progress: UploadProgress) -> None:
+        if progress.files_done >= 4:
+            cancel.set()
+
+    result = upload_dataset(
+        client,
+        make_widget_data("upload-test", 20),
+        on_progress=on_progress,
+        cancel=cancel,
+        transfer=TransferConfig(workers=3, small_file_size=1),
+    )
+
+    assert isinstance(result, UploadError)
+    assert result.cancelled
+    assert transfer.files == {}
+    assert len(transfer.reverted) >= 4
+    assert client.datasets == {}
+
+
+def test_make_dataset_from_widget_data_with_binary_attachment(
+    make_widget_data: Callable[..., dict[str, Any]],
+) -> None:
+    image = b"\x89PNG\r\n\x1a\nnot really an image"
+    content = {
+        **make_widget_data("upload-test", 0),
+        "attachments": [{"data": {"$buffer": 0}, "mime": "image/png", "caption": "A"}],
+    }
+    data = _resolve_buffers(content, [memoryview(image)])
+    dataset = make_dataset_from_widget_data(data)
+
+    [attachment] = dataset.attachments or []
+    assert attachment.caption == "A"
+    assert attachment.thumbnail is not None
+    assert attachment.thumbnail.mime == "image/png"
+    assert attachment.thumbnail.decoded_data() == image
+
+
+def test_widget_uploads_dataset_with_binary_attachment(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    widget = DatasetUploadWidget(client, cache=False)
+    sent: list[dict[str, Any]] = []
+    widget.send = lambda content, buffers=None: sent.append(content)  # type: ignore[method-assign]
+    image = b"\x89PNG\r\n\x1a\nnot really an image"
+    content = {
+        **make_widget_data("upload-test", 1),
+        "attachments": [{"data": {"$buffer": 0}, "mime": "image/png", "caption": "A"}],
+    }
+
+    _run_upload(
+        widget,
+        "k",
+        _resolve_buffers(content, [memoryview(image)]),
+        threading.Event(),
+    )
+
+    [result] = [m["payload"] for m in sent if m["type"] == "res:upload-dataset"]
+    assert "errors" not in result
+    [attachment] = client.attachments[PID.parse(result["pid"])]
+    assert attachment.caption == "A"
+    assert len(transfer.files) == 1
+    # The journal was written and removed after the upload.
+    assert widget._journal is None
+    assert list((tmp_path / "state").rglob("*.jsonl")) == []
+
+
+def test_validator_reports_errors_without_uploading(client: FakeClient) -> None:
+    validator = DatasetValidator(client)
+    validator.update({"type": "raw", "datasetName": "incomplete"}, version=3)
+
+    version, errors = validator.check()
+    assert version == 3
+    assert {"contactEmail", "owner", "ownerGroup"} <= {e.field for e in errors}
+
+
+def test_validator_only_converts_changed_fields(
+    client: FakeClient,
+    make_widget_data: Callable[..., dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    converted: list[str] = []
+
+    def convert(name: str, value: Any) -> dict[str, Any]:
+        converted.append(name)
+        return convert_widget_field(name, value)
+
+    monkeypatch.setattr("scicat_widget._upload.convert_widget_field", convert)
+    validator = DatasetValidator(client)
+    data = make_widget_data("upload-test", 3)
+    validator.update(data)
+    assert validator.check()[1] == []
+    assert sorted(converted) == sorted(data)
+
+    converted.clear()
+    validator.update({"datasetName": "renamed", "description": data["description"]})
+    validator.update({"description": None})
+    assert validator.check()[1] == []
+    assert converted == ["datasetName"]
+
+
+def test_validator_reports_invalid_files(
+    client: FakeClient, make_widget_data: Callable[..., dict[str, Any]], tmp_path: Path
+) -> None:
+    validator = DatasetValidator(client)
+    data = make_widget_data("upload-test", 2)
+    data["files"].append({"localPath": str(tmp_path / "missing.dat")})
+    data["files"][0]["remotePath"] = "../escaped.dat"
+    validator.update(data)
+
+    errors = {e.field: e.error for e in validator.check()[1]}
+    assert errors == {"files": f"File not found: {tmp_path / 'missing.dat'}"}
+
+    validator.update({"files": data["files"][:-1]})
+    errors = {e.field: e.error for e in validator.check()[1]}
+    assert errors == {
+        "files": "Remote path is outside of the source folder: ../escaped.dat"
+    }
+
+
+def test_upload_dataset_does_not_transfer_invalid_datasets(
+    client: FakeClient,
+    transfer: FakeFileTransfer,
+    make_widget_data: Callable[..., dict[str, Any]],
+) -> None:
+    data = make_widget_data("upload-test", 2)
+    del data["ownerGroup"]
+
+    result = upload_dataset(client, data)
+
+    assert isinstance(result, UploadError)
+    assert [e.field for e in result.errors] == ["ownerGroup"]
+    assert transfer.files == {}
+    assert client.datasets == {}
+
+
+def test_validate_message_sends_errors(
+    client: FakeClient, make_widget_data: Callable[..., dict[str, Any]]
+) -> None:
+    widget = DatasetUploadWidget(
+        client, cache=False, dispatch=DispatchConfig(synchronous=True)
+    )
+    sent: list[dict[str, Any]] = []
+    widget.send = lambda content, buffers=None: sent.append(content)  # type: ignore[method-assign]
+    data = make_widget_data("upload-test", 1)
+    message = {"fields": data, "replace": True, "version": 1}
+
+    handle_event(widget, {"type": "req:validate", "key": "k", "payload": message}, [])
+    handle_event(
+        widget,
+        {
+            "type": "req:validate",
+            "key": "k",
+            "payload": {"fields": {"ownerGroup": None}, "version": 2},
+        },
+        [],
+    )
+
+    assert [m["payload"] for m in sent if m["type"] == "res:validate"] == [
+        {"version": 1, "errors": []},
+        {"version": 2, "errors": [{"field": "ownerGroup", "error": "Field required"}]},
+    ]